@@ -3,8 +3,11 @@
 # Copyright (c) 2024 - 2025 Kevin G. Schlosser
 
 from micropython import const  # NOQA
+import gc
+import time
 import pointer_framework
 import lvgl as lv  # NOQA
+import profiler
 
 
 # Constants
@@ -14,23 +17,56 @@ I2C_ADDR = 0x3B
 BITS = 8
 
 
-class TouchRecord:
-    def __init__(self):
-        self.gesture = 0
-        self.num = 0
-        self.x = 0
-        self.y = 0
-        self.event = 0
+class CountingDevice:
+    """Wraps an I2C device and counts the transactions and bytes of every driver using it."""
+
+    def __init__(self, device):
+        self._device = device
+        self.transactions = 0
+        self.bytes = 0
+        self._started = time.ticks_ms()
+
+    def write(self, buf):
+        self.transactions += 1
+        self.bytes += len(buf)
+        return self._device.write(buf)
+
+    def read(self, nbytes=None, buf=None):
+        self.transactions += 1
+        self.bytes += len(buf) if buf is not None else nbytes
+        return self._device.read(nbytes=nbytes, buf=buf)
+
+    def __getattr__(self, name):
+        # Anything else goes to the device uncounted
+        return getattr(self._device, name)
+
+    def stats(self):
+        seconds = time.ticks_diff(time.ticks_ms(), self._started) / 1000 or 1
+        return {
+            "transactions_s": self.transactions / seconds,
+            "bytes_s": self.bytes / seconds,
+        }
 
 
 class AXS15231(pointer_framework.PointerDriver):
+    """AXS15231 touch controller.
+
+    The report is decoded straight from the receive buffer into gesture, num,
+    x, y and event, nothing is allocated per poll. While the panel is not
+    touched the controller is only read when its interrupt line fired (int_pin,
+    if wired) or else every idle_poll_ms. While it is touched it is read on
+    every poll from LVGL.
+    """
 
     def __init__(
         self,
         device,
         touch_cal=None,
         startup_rotation=lv.DISPLAY_ROTATION._0,  # NOQA
-        debug=False
+        debug=False,
+        int_pin=None,
+        idle_poll_ms=50,
+        read_period_ms=None,
     ):
         self._device = device
 
@@ -44,43 +80,102 @@ class AXS15231(pointer_framework.PointerDriver):
         self._rx_buf = bytearray(8)
         self._rx_mv = memoryview(self._rx_buf)
 
+        # Last decoded touch point
+        self.gesture = 0
+        self.num = 0
+        self.x = 0
+        self.y = 0
+        self.event = 0
+
         self.__last_x = -1
         self.__last_y = -1
         self.__last_state = self.RELEASED
 
+        self.idle_poll_ms = idle_poll_ms
+        self.__next_read = time.ticks_ms()
+
+        # The interrupt line goes low when the controller has a new report
+        self._int_flag = False
+        self._int_pin = None
+        if int_pin is not None:
+            import machine
+
+            self._int_pin = machine.Pin(int_pin, machine.Pin.IN, machine.Pin.PULL_UP)
+            self._int_pin.irq(trigger=machine.Pin.IRQ_FALLING, handler=self._on_int)
+
+        # Counters
+        self.polls = 0
+        self.reads = 0  # I2C transactions (one write and one read each)
+        self.alloc_bytes = 0  # heap allocated by polls while the profiler is on
+        self.alloc_polls = 0
+        self._started = time.ticks_ms()
+
+        if read_period_ms:
+            self.set_read_period(read_period_ms)
+
+    def set_read_period(self, ms):
+        """How often LVGL polls this input device (LV_DEF_REFR_PERIOD by default)."""
+        self._indev_drv.get_read_timer().set_period(ms)
+
+    def _on_int(self, pin):
+        self._int_flag = True
+
     def _read_data(self):
+        """Read a report from the controller. Returns the number of touch points decoded (0 or 1)."""
         self._device.write(self._tx_mv)
         self._device.read(buf=self._rx_mv)
+        self.reads += 1
 
-        touch_points = []
         data = self._rx_buf
-
         num_points = data[_AXS_TOUCH_POINT_NUM]
+        if not num_points or num_points > _AXS_MAX_TOUCH_NUMBER:
+            return 0
 
-        if num_points and num_points <= _AXS_MAX_TOUCH_NUMBER:
-            for i in range(num_points):
-                offset = i * 6
-                record = TouchRecord()
-                record.gesture = data[offset]
-                record.num = data[offset + 1]
-                record.x = ((data[offset + 2] & 0x0F) << 8) | data[offset + 3]
-                record.y = ((data[offset + 4] & 0x0F) << 8) | data[offset + 5]
-                record.event = (data[offset + 2] >> 6) & 0x03
-                touch_points.append(record)
-
-        return touch_points
+        self.gesture = data[0]
+        self.num = data[1]
+        self.x = ((data[2] & 0x0F) << 8) | data[3]
+        self.y = ((data[4] & 0x0F) << 8) | data[5]
+        self.event = (data[2] >> 6) & 0x03
+        return num_points
 
     def _get_coords(self):
-        touch_data = self._read_data()
-
-        if touch_data:
-            self.__last_x = touch_data[0].x
-            self.__last_y = touch_data[0].y
-
-            if touch_data[0].event == 1:
+        if profiler.enabled:
+            mem = gc.mem_alloc()
+        self.polls += 1
+
+        if self.__last_state == self.RELEASED:
+            # Nobody is touching the panel: skip the I2C transaction unless there is news
+            if self._int_pin is not None:
+                read = self._int_flag
+                self._int_flag = False
+            else:
+                now = time.ticks_ms()
+                read = time.ticks_diff(now, self.__next_read) >= 0
+                if read:
+                    self.__next_read = time.ticks_add(now, self.idle_poll_ms)
+        else:
+            read = True
+
+        if read and self._read_data():
+            self.__last_x = self.x
+            self.__last_y = self.y
+
+            if self.event == 1:
                 self.__last_state = self.RELEASED
 
             else:
                 self.__last_state = self.PRESSED
 
-        return self.__last_state, self.__last_x, self.__last_y
\ No newline at end of file
+        if profiler.enabled:
+            self.alloc_bytes += gc.mem_alloc() - mem
+            self.alloc_polls += 1
+        return self.__last_state, self.__last_x, self.__last_y
+
+    def stats(self):
+        """Poll counters, e.g. for printing from the REPL."""
+        seconds = time.ticks_diff(time.ticks_ms(), self._started) / 1000 or 1
+        return {
+            "polls_s": self.polls / seconds,
+            "reads_s": self.reads / seconds,
+            "alloc_per_poll": self.alloc_bytes / self.alloc_polls if self.alloc_polls else None,
+        }
@@ -0,0 +1,29 @@
+"""
+Boot timeline: mark() records how long after reset each startup phase finished.
+
+time.ticks_ms() starts at 0 on reset, so the marks include the firmware's own
+startup before main.py. report() prints the phases with the time each took.
+"""
+
+import time
+
+marks = []  # (phase, ms since reset)
+
+
+def mark(phase):
+    marks.append((phase, time.ticks_ms()))
+
+
+def lines():
+    out = []
+    last = 0
+    for phase, ms in marks:
+        out.append("{:>6} ms  +{:5} ms  {}".format(ms, ms - last, phase))
+        last = ms
+    return out
+
+
+def report():
+    print("Boot trace:")
+    for line in lines():
+        print(" ", line)
@@ -3,8 +3,9 @@
 from micropython import const
 
 # Display pins
-DISPLAY_WIDTH = const(320)
+DISPLAY_WIDTH = const(320)  # Panel resolution in its native portrait orientation
 DISPLAY_HEIGHT = const(480)
+DISPLAY_ROTATION = 0  # Degrees, 0 / 180 portrait, 90 / 270 landscape (480x320); lv_config.set_rotation() at runtime
 SCLK_PIN = const(47)
 DATA0_PIN = const(21)
 DATA1_PIN = const(48)
@@ -17,15 +18,62 @@ RESET_PIN = None
 
 # Display timing
 FREQ = 40000000  # 40 MHz QSPI frequency
+# Frame buffers (qspi_panel.allocate_buffers), chosen at boot:
+#   "double"  two full frames in PSRAM (2 x 300 KB)
+#   "single"  one full frame in PSRAM, LVGL waits for every flush
+#   "partial" two strips in internal DMA RAM, only the invalidated rows are flushed
+#   "auto"    partial if at least PARTIAL_MIN_ROWS fit in free internal RAM, else double (or single)
+DISPLAY_BUFFERS = "auto"
+PARTIAL_ROWS = 48  # Most rows per strip (2 buffers of 320 * 48 * 2 bytes)
+PARTIAL_MIN_ROWS = 16
+INTERNAL_RAM_RESERVE = 65536  # Internal RAM left free for Wi-Fi / ESP-NOW when sizing the strips
+# Partial flushes send only the changed rows when True. The AXS15231B is said to draw a RAMWR below the
+# top row at the top (qspi_panel._round_area_cb), so None (its driver default) sends from row 0 to the last changed row
+DISPLAY_ROW_WINDOW = None
 
 # I2C Touch Pins (AXS15231 capacitive touch)
 TOUCH_SDA_PIN = const(4)    # I2C Data
 TOUCH_SCL_PIN = const(8)    # I2C Clock
+TOUCH_INT_PIN = None  # Touch interrupt line if wired, then the controller is only read after it fired
+TOUCH_IDLE_POLL_MS = 50  # Without the interrupt line: read the controller this often while nothing is pressed
+TOUCH_READ_PERIOD_MS = None  # How often LVGL polls the touch input, None keeps LVGL's refresh period (33 ms)
+TOUCH_GESTURES = False  # Swipe left/right to change screens
 
 # GPS UART config
 GPS_UART_ID = 2
 GPS_TX_PIN = const(17)  # Example, set to your wiring
 GPS_RX_PIN = const(18)  # Example, set to your wiring
 GPS_BAUDRATE = 9600
+GPS_RXBUF = 2048  # UART RX buffer, holds the NMEA that arrives while the display initializes
+
+# ESP-NOW telemetry
+TELEMETRY_HEARTBEAT_MS = 5000  # Resend unchanged values this often
+TELEMETRY_MIN_INTERVAL_MS = 200  # Never send to the same peer more often than this
+TELEMETRY_FORMAT = "text"  # "text" for topic:value receivers, "binary" for the packed frame (telemetry.py)
+TELEMETRY_BROADCAST = False  # One broadcast frame per update instead of a unicast per peer
+TELEMETRY_GROUP = None  # 0-255: wrap broadcast frames in a group frame receivers can filter on
+TELEMETRY_KEY = None  # bytes: add an auth tag to group frames
+ESPNOW_QUEUE_SIZE = 8  # Frames waiting per peer for the non-blocking sender (newer ones replace older ones per topic), 0 sends synchronously
+ESPNOW_PUMP_FRAMES = 4  # Frames handed to the radio per telemetry task run
+
+# microSD card (SPI mode)
+SD_SCK_PIN = const(12)  # Example, set to your wiring
+SD_MISO_PIN = const(13)
+SD_MOSI_PIN = const(11)
+SD_CS_PIN = const(10)
+
+# Track log (tracklog.py)
+TRACK_LOG = False  # Record the track to the SD card
+TRACK_LOG_DIR = "/sd/track"
+TRACK_INTERVAL_MS = 1000  # At most one track point per interval
+TRACK_RAW_NMEA = False  # Also capture the raw NMEA stream
+TRACK_TASK_MS = 200
+
+# Main loop scheduler (scheduler.py)
+UART_POLL_MS = 20  # GPS UART drain interval
+UI_MAX_SLEEP_MS = 30  # Upper bound on the LVGL sleep hint, keeps touch input responsive
+TELEMETRY_TASK_MS = 20  # Telemetry publish / send queue pump interval
+STATUS_LOG_MS = 60000  # Print GPS, ESP-NOW and scheduler stats to the REPL this often, 0 = never
+PROFILE = False  # Time the hot paths (profiler.py), also switchable with profiler.enable() from the REPL
 
 BUFFER_SIZE = DISPLAY_WIDTH * DISPLAY_HEIGHT * 2  # RGB565 = 2 bytes per pixel
\ No newline at end of file
@@ -1,8 +1,21 @@
 import lvgl as lv
+from speedstats import SpeedStats, SpeedHistory, GAP
 
 
 class DisplayUI:
-    def __init__(self):
+    FIX_NAMES = {0: "No", 1: "Fix", 2: "2D", 3: "3D"}
+
+    # Chart time windows (tap the chart to switch): name, seconds per point. A point is
+    # `step` one-second samples of SpeedStats' fixed bucket grid, CHART_POINTS * step
+    # seconds per window (checked by tools/check_speedstats.py)
+    CHART_POINTS = 300
+    CHART_WINDOWS = (("5 min", 1), ("30 min", 6), ("2 h", 24))
+
+    def __init__(self, on_peers_saved=None, gestures=False):
+        # Called after the peer form rewrote /peers.txt
+        self.on_peers_saved = on_peers_saved
+        # Swipe left/right to change screens, LVGL detects the gesture in display coordinates
+        self.gestures = gestures
         self.gps_next_btn = None
         self.gps_prev_btn = None
         self.lon_label = None
@@ -13,6 +26,11 @@ class DisplayUI:
         self.scrn.set_style_text_font(lv.font_montserrat_24, 0)
         self.third_scrn = None
 
+        # Last text set on each label (by attribute name), identical updates are skipped
+        self._label_text = {}
+        self.labels_applied = 0
+        self.labels_skipped = 0
+
         # --- Add Previous and Next buttons ---
         self.prev_btn = lv.button(self.scrn)
         self.prev_btn.set_size(40, 40)
@@ -31,38 +49,37 @@ class DisplayUI:
         next_label.set_text(lv.SYMBOL.RIGHT)
 
         self.d_label = lv.label(self.scrn)
-        self.d_label.set_text("--")
+        self._set_label("d_label", "--")
         self.d_label.set_style_text_color(lv.color_hex(0xFFFFFF), 0)
         self.d_label.set_style_text_font(lv.font_montserrat_48, 0)
         self.d_label.set_style_text_align(lv.TEXT_ALIGN.CENTER, 0)
         self.d_label.set_style_transform_width(120, 0)
         self.d_label.set_style_transform_height(48, 0)
         self.d_label.set_style_transform_scale(600, 0)
-        self.d_label.align(lv.ALIGN.CENTER, -60, -180)  # Move a bit left of center
+        # Hidden debug screen: long press on the speed
+        self.d_label.add_flag(lv.obj.FLAG.CLICKABLE)
+        self.d_label.add_event_cb(self.on_debug_open, lv.EVENT.LONG_PRESSED, None)
 
         self.compass_label = lv.label(self.scrn)
-        self.compass_label.set_text("--")
+        self._set_label("compass_label", "--")
         self.compass_label.set_style_text_color(lv.color_hex(0xFFFFFF), 0)
         self.compass_label.set_style_text_font(lv.font_montserrat_48, 0)
         self.compass_label.set_style_text_align(lv.TEXT_ALIGN.CENTER, 0)
-        self.compass_label.align(lv.ALIGN.CENTER, 100, 100)  # Move a bit right of center
 
         # --- Add a simple chart for speed history ---
         self.chart = lv.chart(self.scrn)
-        self.chart.set_size(300, 80)
-        self.chart.align(lv.ALIGN.BOTTOM_MID, 0, -10)
         self.chart.set_type(lv.chart.TYPE.LINE)
-        self.speed_avg_buffer = []
-        self.ema_speed = None  # Exponential moving average
-        self.ema_alpha = 0.05  # Smoothing factor (0.05-0.2 typical)
+        # Rolling 10 s / 1 min / 10 min averages and maxima, session max, best 10 s
+        self.stats = SpeedStats()
+        # Chart history for every window, kept up to date even while another one is shown
+        self.history = SpeedHistory(self.CHART_POINTS, tuple(step for _, step in self.CHART_WINDOWS))
+        self.chart_level = 0
 
         # Small label for avg speed (top left of chart)
         self.avg_speed_label = lv.label(self.scrn)
-        self.avg_speed_label.set_text("  ")
+        self._set_label("avg_speed_label", "  ")
         self.avg_speed_label.set_style_text_color(lv.color_hex(0xFFFFFF), 0)
         self.avg_speed_label.set_style_text_font(lv.font_montserrat_28, 0)
-        # Position: left of chart
-        self.avg_speed_label.align_to(self.chart, lv.ALIGN.OUT_TOP_LEFT, 5, -155)
 
         # Set y-axis range to 0-9 if supported by your LVGL binding
         try:
@@ -70,19 +87,70 @@ class DisplayUI:
             self.chart.set_range_max(lv.chart.AXIS.PRIMARY_Y, 60) # range 0-6 knots
         except AttributeError:
             pass  # Method not available in this LVGL binding
-        self.chart.center()
-        self.chart.set_point_count(400)
+        self.chart.set_point_count(self.CHART_POINTS)
+        # Points are written in place (sweeping left to right), so LVGL only redraws around the new point
+        self.chart.set_update_mode(lv.chart.UPDATE_MODE.CIRCULAR)
         self.speed_series = self.chart.add_series(lv.palette_main(lv.PALETTE.BLUE), lv.chart.AXIS.PRIMARY_Y)
-        self.speed_history = [0] * 20  # Initialize with zeros
+        self.chart.set_all_value(self.speed_series, lv.CHART_POINT_NONE)
+        self.chart.add_flag(lv.obj.FLAG.CLICKABLE)
+        self.chart.add_event_cb(self.on_chart_clicked, lv.EVENT.CLICKED, None)
+
+        # Time window of the chart (top right of chart)
+        self.chart_window_label = lv.label(self.scrn)
+        self._set_label("chart_window_label", self.CHART_WINDOWS[0][0])
+        self.chart_window_label.set_style_text_color(lv.color_hex(0xAAAAAA), 0)
 
         # --- Add event handlers for navigation buttons ---
         self.prev_btn.add_event_cb(self.on_prev_btn, lv.EVENT.CLICKED, None)
         self.next_btn.add_event_cb(self.on_next_btn, lv.EVENT.CLICKED, None)
+        self._add_gesture_cb(self.scrn)
 
-        # Track which screen is active: 0 = main, 1 = gps, 2 = third
+        # Track which screen is active: 0 = main, 1 = gps, 2 = third, 3 = debug (not in the navigation cycle)
         self.active_screen = 0
         self.gps_scrn = None
         self.third_scrn = None
+        self.debug_scrn = None
+
+        # Screens take the display's resolution, rotating the display resizes them
+        self.layout()
+        self.scrn.add_event_cb(self.on_resize, lv.EVENT.SIZE_CHANGED, None)
+
+    def layout(self):
+        # Positions and sizes that depend on the resolution, scaled from the 320x480 portrait
+        # layout. Objects aligned to a screen edge follow a resize by themselves.
+        w = self.scrn.get_width()
+        h = self.scrn.get_height()
+        self.d_label.align(lv.ALIGN.CENTER, -w * 3 // 16, -h * 3 // 8)  # Upper left
+        self.compass_label.align(lv.ALIGN.CENTER, w * 5 // 16, h * 5 // 24)  # Lower right
+        self.chart.set_size(w - 20, 80)
+        self.chart.center()
+        # align_to() positions once, after the chart has its place
+        self.avg_speed_label.align_to(self.chart, lv.ALIGN.OUT_TOP_LEFT, 5, 35)
+        self.chart_window_label.align_to(self.chart, lv.ALIGN.OUT_TOP_RIGHT, -5, 0)
+
+        if self.third_scrn:
+            self.mac_textarea.set_size(w - 20, h // 4)
+            self.mac_textarea.align(lv.ALIGN.CENTER, 0, -h // 24)
+            self.mac_kb.set_size(w - 20, h // 4)
+            # Navigation and save buttons above the keyboard
+            btn_y = -h * 7 // 24
+            self.save_btn.align(lv.ALIGN.CENTER, 0, btn_y)
+            self.third_prev_btn.align(lv.ALIGN.BOTTOM_LEFT, 10, btn_y)
+            self.third_next_btn.align(lv.ALIGN.BOTTOM_RIGHT, -10, btn_y)
+
+    def on_resize(self, evt):
+        self.layout()
+
+    def _set_label(self, name, text):
+        # set_text() invalidates the label even if the text is the same, which costs a
+        # redraw and a flush of its area. Only pass on actual changes.
+        if self._label_text.get(name) == text:
+            self.labels_skipped += 1
+            return False
+        getattr(self, name).set_text(text)
+        self._label_text[name] = text
+        self.labels_applied += 1
+        return True
 
     def set_display_text(self, text):
         # Ensure text is a string in the form "0.0" to "99.9"
@@ -91,31 +159,62 @@ class DisplayUI:
             text = f"{text:.1f}"
         if len(text) == 3:  # e.g. "0.0" to "9.9"
             text = f"  {text}" if text[0] == "1" else f" {text}"
-        self.d_label.set_text(text)
+        self._set_label("d_label", text)
 
     def set_compass_text(self, text):
-        self.compass_label.set_text(text)
+        self._set_label("compass_label", text)
 
     def update_chart(self, speed):
         # chart requires integers, so multiplied by 10.
-        self.speed_avg_buffer.append(speed)
-
-        if len(self.speed_avg_buffer) == 10:
-            avg_speed = sum(self.speed_avg_buffer) / 10
-            self.chart.set_next_value(self.speed_series, int(avg_speed))
-            self.chart.refresh()
-
-            # Update EMA: new_ema = alpha * new_value + (1 - alpha) * old_ema
-            if self.ema_speed is None:
-                self.ema_speed = avg_speed
+        # The stats turn the GPS updates into one sample per second, the chart and
+        # the average label only change when a sample completes
+        added = self.stats.add(speed)
+        if added:
+            if added == 1:
+                if self.history.add(self.stats.latest()) & (1 << self.chart_level):
+                    # Only the new point and the gap after it are invalidated, not the whole chart
+                    slot = self.history.last_slot(self.chart_level)
+                    self.chart.set_value_by_id(self.speed_series, slot, self._chart_value(slot))
+                    self.chart.set_value_by_id(self.speed_series, (slot + 1) % self.CHART_POINTS, lv.CHART_POINT_NONE)
             else:
-                self.ema_speed = (
-                    self.ema_alpha * avg_speed + (1 - self.ema_alpha) * self.ema_speed
-                )
-            self.avg_speed_label.set_text("{:.1f}".format(self.ema_speed / 10))
-            self.speed_avg_buffer.clear()
+                # GPS updates stopped for a while: the sample and the gaps after it, then a full redraw
+                count = self.stats.count
+                for n in range(count - added, count):
+                    self.history.add(self.stats.sample(n))
+                self.set_chart_window(self.chart_level)
+            self._set_label("avg_speed_label", "{:.1f}".format(self.stats.average(1) / 10))
+
+    def _chart_value(self, slot):
+        value = self.history.levels[self.chart_level][slot]
+        return lv.CHART_POINT_NONE if value == GAP else value
+
+    def on_chart_clicked(self, evt):
+        self.set_chart_window((self.chart_level + 1) % len(self.CHART_WINDOWS))
+
+    def set_chart_window(self, level):
+        # Switch the chart to another time window, from the history that is already there
+        self.chart_level = level
+        count = self.history.counts[level]
+        none = lv.CHART_POINT_NONE
+        for slot in range(self.CHART_POINTS):
+            self.chart.set_value_by_id(self.speed_series, slot, self._chart_value(slot) if slot < count else none)
+        if count:
+            self.chart.set_value_by_id(self.speed_series, count % self.CHART_POINTS, none)
+        self._set_label("chart_window_label", self.CHART_WINDOWS[level][0])
 
     # --- Navigation button event handlers ---
+    def _add_gesture_cb(self, scrn):
+        if self.gestures:
+            scrn.add_event_cb(self.on_gesture, lv.EVENT.GESTURE, None)
+
+    def on_gesture(self, evt):
+        # Swipe left goes to the next screen, swipe right to the previous one
+        direction = lv.indev_active().get_gesture_dir()
+        if direction == lv.DIR.LEFT:
+            self.on_next_btn(evt)
+        elif direction == lv.DIR.RIGHT:
+            self.on_prev_btn(evt)
+
     def on_prev_btn(self, evt):
         # Previous: 0 <- 1 <- 2 (wrap around)
         if self.active_screen == 0:
@@ -137,7 +236,17 @@ class DisplayUI:
             self.active_screen = 0
 
     def show_gps_screen(self, latitude=None, longitude=None, satellites_in_use=None, fix_stat=None):
-        # Create and show a screen with navigation buttons, lat/lon, and Sat/Fix status
+        # Navigate to the GPS screen (built on first use). Refreshing its data while it is
+        # shown is update_gps_info()'s job, reloading the screen redraws all of it.
+        self.build_gps_screen()
+        # Plain navigation keeps the values from the last refresh
+        if latitude is not None or longitude is not None or satellites_in_use is not None or fix_stat is not None:
+            self.update_gps_info(latitude, longitude, satellites_in_use, fix_stat)
+        lv.screen_load(self.gps_scrn)
+        self.active_screen = 1
+
+    def build_gps_screen(self):
+        # Create the screen with navigation buttons, lat/lon, and Sat/Fix status
         if not self.gps_scrn:
             self.gps_scrn = lv.obj()
             self.gps_scrn.set_style_bg_color(lv.color_hex(0x000000), 0)
@@ -149,17 +258,17 @@ class DisplayUI:
 
             # Latitude label
             self.lat_label = lv.label(self.gps_scrn)
-            self.lat_label.set_text("Lat: --")
+            self._set_label("lat_label", "Lat: --")
             self.lat_label.align(lv.ALIGN.CENTER, 0, -30)
 
             # Longitude label
             self.lon_label = lv.label(self.gps_scrn)
-            self.lon_label.set_text("Lon: --")
+            self._set_label("lon_label", "Lon: --")
             self.lon_label.align(lv.ALIGN.CENTER, 0, 30)
 
             # Satellite & Fix Status label (only on GPS screen)
             self.gps_status_label_gps = lv.label(self.gps_scrn)
-            self.gps_status_label_gps.set_text("Sat: --  Fix: --")
+            self._set_label("gps_status_label_gps", "Sat: --  Fix: --")
             self.gps_status_label_gps.set_style_text_color(lv.color_hex(0xAAAAAA), 0)
             self.gps_status_label_gps.set_style_text_font(lv.font_montserrat_24, 0)
             self.gps_status_label_gps.align(lv.ALIGN.TOP_MID, 0, 60)
@@ -183,27 +292,27 @@ class DisplayUI:
             gps_next_label = lv.label(self.gps_next_btn)
             gps_next_label.set_text(lv.SYMBOL.RIGHT)
             self.gps_next_btn.add_event_cb(self.on_next_btn, lv.EVENT.CLICKED, None)
+            self._add_gesture_cb(self.gps_scrn)
 
-        # Update latitude and longitude if provided
+    def update_gps_info(self, latitude=None, longitude=None, satellites_in_use=None, fix_stat=None):
+        # Refresh the GPS screen labels, only labels whose text changed are invalidated
+        if not self.gps_scrn:
+            return
         if latitude is not None:
-            self.lat_label.set_text("Lat: {:.6f}".format(latitude))
+            self._set_label("lat_label", "Lat: {:.6f}".format(latitude))
         else:
-            self.lat_label.set_text("Lat: --")
+            self._set_label("lat_label", "Lat: --")
         if longitude is not None:
-            self.lon_label.set_text("Lon: {:.6f}".format(longitude))
+            self._set_label("lon_label", "Lon: {:.6f}".format(longitude))
         else:
-            self.lon_label.set_text("Lon: --")
+            self._set_label("lon_label", "Lon: --")
 
         # Update Sat/Fix status if provided
         if satellites_in_use is not None and fix_stat is not None:
-            fix_map = {0: "No", 1: "Fix", 2: "2D", 3: "3D"}
-            fix_str = fix_map.get(fix_stat, str(fix_stat))
-            self.gps_status_label_gps.set_text(f"Sat: {satellites_in_use}  Fix: {fix_str}")
+            fix_str = self.FIX_NAMES.get(fix_stat, str(fix_stat))
+            self._set_label("gps_status_label_gps", f"Sat: {satellites_in_use}  Fix: {fix_str}")
         else:
-            self.gps_status_label_gps.set_text("Sat: --  Fix: --")
-
-        lv.screen_load(self.gps_scrn)
-        self.active_screen = 1
+            self._set_label("gps_status_label_gps", "Sat: --  Fix: --")
 
     def show_third_screen(self):
         # Create and show a third screen with navigation buttons and MAC address form
@@ -218,24 +327,17 @@ class DisplayUI:
 
             # MAC address text area
             self.mac_textarea = lv.textarea(self.third_scrn)
-            self.mac_textarea.set_size(300, 120)
-            self.mac_textarea.align(lv.ALIGN.CENTER, 0, -20)
             self.mac_textarea.set_text("")  # Will be filled with current peers
             self.mac_textarea.set_placeholder_text("Enter MACs, one per line")
 
             # Add a touchscreen keyboard for the textarea
             self.mac_kb = lv.keyboard(self.third_scrn)
-            self.mac_kb.set_size(300, 120)
             self.mac_kb.align(lv.ALIGN.BOTTOM_MID, 0, 0)
             self.mac_kb.set_textarea(self.mac_textarea)
 
-            # Move navigation and save buttons above the keyboard
-            btn_y = -140  # Adjust this value as needed to be above the keyboard
-
             # Save button
             self.save_btn = lv.button(self.third_scrn)
             self.save_btn.set_size(80, 40)
-            self.save_btn.align(lv.ALIGN.CENTER, 0, btn_y)
             self.save_btn.set_style_bg_color(lv.color_hex(0x222222), 0)
             self.save_btn.set_style_bg_opa(lv.OPA.COVER, 0)
             save_label = lv.label(self.save_btn)
@@ -245,7 +347,6 @@ class DisplayUI:
             # Add Previous button to third screen
             self.third_prev_btn = lv.button(self.third_scrn)
             self.third_prev_btn.set_size(40, 40)
-            self.third_prev_btn.align(lv.ALIGN.BOTTOM_LEFT, 10, btn_y)
             self.third_prev_btn.set_style_bg_color(lv.color_hex(0x111111), 0)
             self.third_prev_btn.set_style_bg_opa(lv.OPA.COVER, 0)
             third_prev_label = lv.label(self.third_prev_btn)
@@ -255,12 +356,14 @@ class DisplayUI:
             # Add Next button to third screen
             self.third_next_btn = lv.button(self.third_scrn)
             self.third_next_btn.set_size(40, 40)
-            self.third_next_btn.align(lv.ALIGN.BOTTOM_RIGHT, -10, btn_y)
             self.third_next_btn.set_style_bg_color(lv.color_hex(0x111111), 0)
             self.third_next_btn.set_style_bg_opa(lv.OPA.COVER, 0)
             third_next_label = lv.label(self.third_next_btn)
             third_next_label.set_text(lv.SYMBOL.RIGHT)
             self.third_next_btn.add_event_cb(self.on_next_btn, lv.EVENT.CLICKED, None)
+            self._add_gesture_cb(self.third_scrn)
+            # Textarea, keyboard and button positions
+            self.layout()
 
             # Load current peers into textarea
             self.load_peers_to_textarea()
@@ -268,6 +371,30 @@ class DisplayUI:
         lv.screen_load(self.third_scrn)
         self.active_screen = 2
 
+    def on_debug_open(self, evt):
+        # Create and show the debug screen, a tap anywhere goes back to the main screen
+        if not self.debug_scrn:
+            self.debug_scrn = lv.obj()
+            self.debug_scrn.set_style_bg_color(lv.color_hex(0x000000), 0)
+            self.debug_scrn.add_event_cb(self.on_debug_close, lv.EVENT.CLICKED, None)
+
+            self.debug_label = lv.label(self.debug_scrn)
+            self.debug_label.set_style_text_color(lv.color_hex(0x00FF00), 0)
+            self.debug_label.set_style_text_font(lv.font_montserrat_14, 0)
+            self.debug_label.align(lv.ALIGN.TOP_LEFT, 4, 4)
+            self._set_label("debug_label", "Profiler disabled (config.PROFILE)")
+
+        lv.screen_load(self.debug_scrn)
+        self.active_screen = 3
+
+    def on_debug_close(self, evt):
+        lv.screen_load(self.scrn)
+        self.active_screen = 0
+
+    def update_debug_text(self, text):
+        if self.debug_scrn:
+            self._set_label("debug_label", text)
+
     def load_peers_to_textarea(self):
         try:
             with open("/peers.txt") as f:
@@ -282,6 +409,8 @@ class DisplayUI:
         with open("/peers.txt", "w") as f:
             for mac in macs:
                 f.write(mac + "\n")
+        if self.on_peers_saved:
+            self.on_peers_saved()
         # Optionally, show a confirmation
         self.save_btn.set_style_bg_color(lv.color_hex(0x00AA00), 0)
         lv.task_handler()
@@ -1,7 +1,39 @@
+import os
+import re
+from array import array
+import time
+import hashlib
 import network
 import espnow
+import profiler
 
 PEERS_FILE = "/peers.txt"
+PEERS_CHECK_MS = 2000  # How often refresh_peers() looks at the peers file for outside changes
+
+BROADCAST_MAC = b"\xff" * 6
+
+# Group frame (broadcast mode): magic u8, group u8, payload, optional auth tag.
+# The tag is the first TAG_SIZE bytes of sha256(key + magic + group + payload).
+# It lets receivers drop frames from other boats or groups, it is not encryption.
+GROUP_MAGIC = 0x47
+TAG_SIZE = 4
+
+MAX_FRAME = 250  # ESP-NOW payload limit
+
+# Per-peer backoff after failed sends, doubled for each consecutive failure
+BACKOFF_MS = 250
+BACKOFF_MAX_MS = 8000
+
+_SEND_SPAN = profiler.span("espnow")
+
+# MAC address should be 6 pairs of hex digits separated by ':'
+# Example: AA:BB:CC:DD:EE:FF
+_MAC_RE = re.compile(r"^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$")
+
+
+def is_valid_mac(mac):
+    return bool(_MAC_RE.match(mac))
+
 
 def load_peers():
     try:
@@ -10,42 +42,354 @@ def load_peers():
     except OSError:
         return []
 
+
+def peers_file_stamp():
+    """Return (mtime, size) of the peers file, or None if it does not exist."""
+    try:
+        st = os.stat(PEERS_FILE)
+    except OSError:
+        return None
+    return st[8], st[6]
+
+
+def auth_tag(key, data):
+    return hashlib.sha256(key + data).digest()[:TAG_SIZE]
+
+
+def seal_group_frame(payload, group, key=None):
+    """Wrap a payload in a group frame, with an auth tag when a key is given."""
+    frame = bytes((GROUP_MAGIC, group)) + bytes(payload)
+    if key:
+        frame += auth_tag(key, frame)
+    return frame
+
+
+def open_group_frame(frame, group, key=None):
+    """Return the payload of a group frame, or None if it belongs to another group or fails the tag check."""
+    frame = bytes(frame)
+    tag_size = TAG_SIZE if key else 0
+    if len(frame) < 2 + tag_size or frame[0] != GROUP_MAGIC or frame[1] != group:
+        return None
+    if key:
+        body = frame[:-TAG_SIZE]
+        if auth_tag(key, body) != frame[-TAG_SIZE:]:
+            return None
+        return body[2:]
+    return frame[2:]
+
+
+class _SendRing:
+    """Fixed-size frame queue of one destination: size slots of MAX_FRAME bytes
+    in a single buffer, made when the peer is added, used as a ring."""
+
+    def __init__(self, mac, size):
+        self.mac = mac
+        self.size = size
+        self.buf = bytearray(size * MAX_FRAME)
+        self.mv = memoryview(self.buf)
+        self.lengths = array("H", bytes(2 * size))
+        self.keys = [None] * size
+        self.head = 0  # slot of the oldest waiting frame
+        self.count = 0
+
+    def find(self, key):
+        """Slot of the waiting frame with this key, or -1."""
+        slot = self.head
+        for _ in range(self.count):
+            if self.keys[slot] == key:
+                return slot
+            slot = slot + 1 if slot + 1 < self.size else 0
+        return -1
+
+    def push(self, key):
+        """Slot for a new frame at the end of the ring, the oldest one must have been dropped when full."""
+        slot = self.head + self.count
+        if slot >= self.size:
+            slot -= self.size
+        self.keys[slot] = key
+        self.count += 1
+        return slot
+
+    def pop(self):
+        """Take the oldest frame off the ring, returns its slot (valid until the next push)."""
+        slot = self.head
+        self.head = slot + 1 if slot + 1 < self.size else 0
+        self.count -= 1
+        return slot
+
+    def frame(self, slot):
+        start = slot * MAX_FRAME
+        return self.mv[start:start + self.lengths[slot]]
+
+
 class ESPNowMessenger:
-    def __init__(self):
+    """ESP-NOW sender for the peers in the peers file.
+
+    With broadcast=True telemetry goes out as one frame to the broadcast address
+    instead of one acknowledged unicast per peer. When group is set (0-255) those
+    frames are wrapped in a group frame, signed with key (bytes) if given, so
+    receivers can filter them with open_group_frame(). send_to() and send_raw()
+    still unicast to a single peer for anything that needs an ACK.
+
+    With queue_size > 0 sends never touch the radio directly: every destination
+    has a ring of queue_size preallocated frame slots, made in add_peer(), so
+    queueing a frame only copies it. A newer frame with the same key (the topic
+    in text format) replaces the one still waiting, keeping its place; a full
+    ring drops its oldest frame. Rings are per destination, so a burst for many
+    peers never pushes out another peer's frame. pump() takes the destinations
+    in turn, hands a few waiting frames per call to ESP-NOW without waiting for
+    ACKs and calls on_sent(mac) for each.
+
+    A peer whose sends keep failing is backed off, its frames are dropped until
+    the backoff has passed. Without waiting for ACKs that only reacts to local
+    send errors (ESP_ERR_ESPNOW_NO_MEM, ESP_ERR_ESPNOW_NOT_FOUND, ETIMEDOUT while
+    the driver's transmit buffers are full), not to a peer that misses frames.
+    queue_stats() reports missed ACKs over all peers from ESPNow.stats().
+    """
+
+    def __init__(self, broadcast=False, group=None, key=None, queue_size=0):
         wlan = network.WLAN(network.STA_IF)
         wlan.active(True)
         self.e = espnow.ESPNow()
         self.e.active(True)
+        self.broadcast = broadcast
+        self.group = group
+        self.key = key
         self.peers = set()
+        # Peer registry: MACs from the peers file, already converted to bytes, in file order
+        self.peer_macs = ()
+        self._peers_stamp = None
+        self._peers_checked = time.ticks_ms()
+
+        # Send queue: mac -> _SendRing, plus the rings in the order pump() serves them
+        self.queue_size = queue_size
+        self._rings = {}
+        self._ring_order = ()
+        self._ring_next = 0
+        self.queue_depth = 0
+        self.on_sent = None  # called with the mac when pump() sent a queued frame
+
+        # Per-peer backoff state: mac -> consecutive failures / ticks_ms when sending may resume
+        self._peer_fails = {}
+        self._peer_resume = {}
+
+        # Counters
+        self.frames_sent = 0
+        self.queue_drops = 0  # oldest frame of a destination dropped, queue_size frames waiting for it
+        self.queue_replaced = 0  # waiting frame replaced by a newer one with the same key
+        self.backoff_drops = 0  # frame for a peer that is backing off
+        self.peer_failures = {}  # mac -> failed sends in total
+
+        if broadcast:
+            try:
+                self.e.add_peer(BROADCAST_MAC)
+            except OSError as e:
+                print("Could not add broadcast peer:", e)
+            else:
+                self._add_ring(BROADCAST_MAC)
         self.load_peers_from_file()
 
     def load_peers_from_file(self):
-        macs = load_peers()
-        for mac_str in macs:
+        """(Re)build the peer registry from the peers file and sync the ESP-NOW peer table with it."""
+        self._peers_stamp = peers_file_stamp()
+        macs = []
+        for mac_str in load_peers():
+            if not is_valid_mac(mac_str):
+                print("Invalid MAC in peers.txt:", mac_str)
+                continue
+            mac = self.mac_str_to_bytes(mac_str)
+            if mac not in macs:
+                macs.append(mac)
+
+        for mac in self.peers - set(macs):
+            self.remove_peer(mac)
+        for mac in macs:
             try:
-                mac = self.mac_str_to_bytes(mac_str)
                 self.add_peer(mac)
-            except Exception as e:
-                print("Invalid MAC in peers.txt:", mac_str, e)
+            except OSError as e:
+                print("Could not add peer:", mac, e)
+        self.peer_macs = tuple(mac for mac in macs if mac in self.peers)
+
+    @property
+    def destinations(self):
+        """Addresses telemetry is sent to: the broadcast address in broadcast mode, else every peer."""
+        return (BROADCAST_MAC,) if self.broadcast else self.peer_macs
+
+    def refresh_peers(self):
+        """Reload the registry if the peers file changed on flash. Only stats the file every PEERS_CHECK_MS."""
+        now = time.ticks_ms()
+        if time.ticks_diff(now, self._peers_checked) < PEERS_CHECK_MS:
+            return False
+        self._peers_checked = now
+        if peers_file_stamp() == self._peers_stamp:
+            return False
+        self.load_peers_from_file()
+        return True
 
     def add_peer(self, mac):
         """Add a peer MAC address (as bytes)."""
         if mac not in self.peers:
             self.e.add_peer(mac)
             self.peers.add(mac)
+            self._add_ring(mac)
+
+    def remove_peer(self, mac):
+        """Remove a peer MAC address (as bytes)."""
+        if mac in self.peers:
+            try:
+                self.e.del_peer(mac)
+            except OSError:
+                pass
+            self.peers.discard(mac)
+            ring = self._rings.pop(mac, None)
+            if ring is not None:
+                # Its waiting frames go with it
+                self.queue_depth -= ring.count
+                self._ring_order = tuple(self._rings.values())
+                self._ring_next = 0
+
+    def _add_ring(self, mac):
+        if self.queue_size and mac not in self._rings:
+            self._rings[mac] = _SendRing(mac, self.queue_size)
+            self._ring_order = tuple(self._rings.values())
 
     def send(self, topic, value):
-        """Send a message to all peers with a topic and value."""
+        """Send a message to all peers with a topic and value (one broadcast frame in broadcast mode)."""
         msg = f"{topic}:{value}".encode()
-        for mac in self.peers:
-            self.e.send(mac, msg)
+        for mac in self.destinations:
+            self.send_raw(mac, msg, topic)
 
     def send_to(self, mac, topic, value):
-        """Send a message to a specific peer."""
+        """Send a message to a specific peer. Returns True if it was sent, False if it was queued."""
         msg = f"{topic}:{value}".encode()
-        self.e.send(mac, msg)
+        return self.send_raw(mac, msg, topic)
+
+    def send_raw(self, mac, data, key=None):
+        """Send an already encoded frame (bytes/bytearray) to a specific peer or BROADCAST_MAC.
+        Queued instead when the messenger has a send queue, replacing a waiting frame with the
+        same key. Returns True if it was sent, False if it was queued (or dropped)."""
+        if mac == BROADCAST_MAC and self.group is not None:
+            data = seal_group_frame(data, self.group, self.key)
+        if self.queue_size:
+            self._enqueue(mac, data, key)
+            return False
+        if profiler.enabled:
+            t0 = time.ticks_us()
+        self.e.send(mac, data)
+        if profiler.enabled:
+            _SEND_SPAN.add(time.ticks_diff(time.ticks_us(), t0))
+        return True
+
+    def pending(self, mac):
+        """Frames waiting in the send queue for a destination."""
+        ring = self._rings.get(mac)
+        return ring.count if ring is not None else 0
+
+    def _backing_off(self, mac, now):
+        resume = self._peer_resume.get(mac)
+        if resume is None:
+            return False
+        if time.ticks_diff(resume, now) > 0:
+            return True
+        del self._peer_resume[mac]
+        return False
+
+    def _enqueue(self, mac, data, key):
+        if self._backing_off(mac, time.ticks_ms()):
+            self.backoff_drops += 1
+            return
+        size = len(data)
+        if size > MAX_FRAME:
+            raise ValueError("ESP-NOW frame too long")
+        ring = self._rings.get(mac)
+        if ring is None:
+            raise ValueError("ESP-NOW peer not added")
+        slot = ring.find(key)
+        if slot >= 0:
+            # Newer telemetry supersedes the frame still waiting, it keeps its place in the queue
+            self.queue_replaced += 1
+        else:
+            if ring.count == ring.size:
+                ring.pop()
+                self.queue_drops += 1
+                self.queue_depth -= 1
+            slot = ring.push(key)
+            self.queue_depth += 1
+        start = slot * MAX_FRAME
+        ring.buf[start:start + size] = data
+        ring.lengths[slot] = size
+
+    def pump(self, max_frames=4):
+        """Hand up to max_frames queued frames to ESP-NOW without waiting for ACKs, one destination
+        after the other. Returns frames sent."""
+        sent = 0
+        now = time.ticks_ms()
+        rings = self._ring_order
+        i = self._ring_next
+        while self.queue_depth and sent < max_frames:
+            if i >= len(rings):
+                i = 0
+            ring = rings[i]
+            i += 1
+            if not ring.count:
+                continue
+            slot = ring.pop()
+            self.queue_depth -= 1
+            mac = ring.mac
+
+            if self._backing_off(mac, now):
+                self.backoff_drops += 1
+                continue
+            if profiler.enabled:
+                t0 = time.ticks_us()
+            try:
+                self.e.send(mac, ring.frame(slot), False)
+            except OSError as e:
+                self._send_failed(mac, now, e)
+                continue
+            finally:
+                if profiler.enabled:
+                    _SEND_SPAN.add(time.ticks_diff(time.ticks_us(), t0))
+            if mac in self._peer_fails:
+                del self._peer_fails[mac]
+            self.frames_sent += 1
+            sent += 1
+            if self.on_sent:
+                self.on_sent(mac)
+        self._ring_next = i
+        return sent
+
+    def _send_failed(self, mac, now, e):
+        self.peer_failures[mac] = self.peer_failures.get(mac, 0) + 1
+        fails = self._peer_fails.get(mac, 0) + 1
+        self._peer_fails[mac] = fails
+        backoff = min(BACKOFF_MS << min(fails - 1, 8), BACKOFF_MAX_MS)
+        self._peer_resume[mac] = time.ticks_add(now, backoff)
+        if getattr(e, "errno", None) == 116:
+            print("ESP-NOW send timeout (ETIMEDOUT), backing off", backoff, "ms")
+        else:
+            print("ESP-NOW send error:", e)
+
+    def queue_stats(self):
+        """Send queue counters, e.g. for printing from the REPL."""
+        try:
+            # (tx_pkts, tx_responses, tx_failures, rx_packets, rx_dropped), failures are missed ACKs
+            tx_failures = self.e.stats()[2]
+        except AttributeError:
+            tx_failures = None
+        return {
+            "depth": self.queue_depth,
+            "size": self.queue_size,
+            "sent": self.frames_sent,
+            "queue_drops": self.queue_drops,
+            "replaced": self.queue_replaced,
+            "tx_failures": tx_failures,
+            "backoff_drops": self.backoff_drops,
+            "peer_failures": dict(self.peer_failures),
+            "backing_off": len(self._peer_resume),
+        }
 
     @staticmethod
     def mac_str_to_bytes(mac_str):
         """Convert MAC string (e.g. 'AA:BB:CC:DD:EE:FF') to bytes."""
-        return bytes(int(b, 16) for b in mac_str.split(':'))
\ No newline at end of file
+        return bytes(int(b, 16) for b in mac_str.split(':'))
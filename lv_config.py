@@ -4,7 +4,7 @@ LVGL Configuration for JC3248W535EN Display
 ===========================================
 
 Display: JC3248W535EN with AXS15231B controller
-Resolution: 320x480 pixels
+Resolution: 320x480 pixels, rotated by config.DISPLAY_ROTATION or set_rotation()
 Interface: QSPI (4-wire SPI)
 Touch: AXS15231 capacitive touch controller
 
@@ -17,6 +17,7 @@ from micropython import const
 import machine
 import lcd_bus
 import lvgl as lv
+import boottrace
 
 # =============================================================================
 # Hardware Initialization
@@ -29,9 +30,6 @@ except NameError:
     _lv_config_initialized = True
 
     # Initialize QSPI bus for display
-    import time
-    time.sleep(2)
-
     spi_bus = machine.SPI.Bus(
         host=1,  # SPI2_HOST
         sck=config.SCLK_PIN,
@@ -48,9 +46,18 @@ except NameError:
         quad=True        # Enable QSPI mode (4-wire)
     )
 
-    # Allocate frame buffers in SPIRAM for better performance
-    fb1 = display_bus.allocate_framebuffer(config.BUFFER_SIZE, lcd_bus.MEMORY_SPIRAM)
-    fb2 = display_bus.allocate_framebuffer(config.BUFFER_SIZE, lcd_bus.MEMORY_SPIRAM)
+    # Frame buffers by config.DISPLAY_BUFFERS, sized from the free memory
+    import qspi_panel
+    fb1, fb2, buffer_rows, buffer_memory, buffer_strategy = qspi_panel.allocate_buffers(
+        display_bus,
+        config.DISPLAY_WIDTH,
+        config.DISPLAY_HEIGHT,
+        2,  # RGB565
+        config.DISPLAY_BUFFERS,
+        max_rows=config.PARTIAL_ROWS,
+        min_rows=config.PARTIAL_MIN_ROWS,
+        reserve=config.INTERNAL_RAM_RESERVE,
+    )
 else:
     # Already initialized, skip hardware init
     pass
@@ -70,7 +77,11 @@ display = axs15231b.AXS15231B(
     backlight_pin=config.BACKLIGHT_PIN,
     color_space=lv.COLOR_FORMAT.RGB565,
     rgb565_byte_swap=True,           # Required for this display
-    backlight_on_state=axs15231b.STATE_PWM
+    backlight_on_state=axs15231b.STATE_PWM,
+    partial=buffer_rows < config.DISPLAY_HEIGHT,
+    partial_rows=buffer_rows,
+    buffer_memory=buffer_memory,  # sizes the flush chunks
+    row_window=config.DISPLAY_ROW_WINDOW,
 )
 
 # Initialize display
@@ -78,46 +89,73 @@ print(f"Initializing {config.DISPLAY_WIDTH}x{config.DISPLAY_HEIGHT} QSPI display
 display.set_power(True)
 display.set_backlight(80)  # 80% brightness
 display.init()
+boottrace.mark("panel")
 print("Display initialized successfully!")
+# Flush throughput is in display.flush_stats() once the UI has drawn, display.measure_flush() from the REPL
+print("Display buffers: {}, {} x {} KB ({} rows)".format(
+    buffer_strategy, 2 if fb2 else 1, len(fb1) // 1024, buffer_rows))
 
 # =============================================================================
-# Touch Controller Setup
+# Rotation
 # =============================================================================
 
-class TouchCal:
-    """Touch calibration data placeholder"""
-    def __init__(self):
-        # Calibration parameters (not needed for this touch controller)
-        self.alphaX = None
-        self.betaX = None
-        self.deltaX = None
-        self.alphaY = None
-        self.betaY = None
-        self.deltaY = None
-        self.mirrorX = False
-        self.mirrorY = False
-
-    @staticmethod
-    def save():
-        """Save calibration data (placeholder)"""
-        pass
+_ROTATIONS = {
+    0: lv.DISPLAY_ROTATION._0,  # NOQA
+    90: lv.DISPLAY_ROTATION._90,  # NOQA
+    180: lv.DISPLAY_ROTATION._180,  # NOQA
+    270: lv.DISPLAY_ROTATION._270,  # NOQA
+}
+
+WIDTH = config.DISPLAY_WIDTH
+HEIGHT = config.DISPLAY_HEIGHT
+
+
+def set_rotation(degrees):
+    """Rotate display and touch at runtime (0, 90, 180 or 270 degrees).
+
+    The panel gets the MADCTL value of its orientation table and LVGL swaps the
+    resolution, resizes the screens and redraws. The frame buffers stay as they
+    are: a full frame is the same size either way, and partial strips just hold
+    fewer, longer rows in landscape.
+    """
+    global WIDTH, HEIGHT
+    display.set_rotation(_ROTATIONS[degrees])
+    if degrees in (90, 270):
+        WIDTH, HEIGHT = config.DISPLAY_HEIGHT, config.DISPLAY_WIDTH
+    else:
+        WIDTH, HEIGHT = config.DISPLAY_WIDTH, config.DISPLAY_HEIGHT
+
+
+# =============================================================================
+# Touch Controller Setup
+# =============================================================================
 
 # Initialize I2C bus for touch controller
 import axs15231
 from i2c import I2C
 
 i2c_bus = I2C.Bus(host=1, sda=config.TOUCH_SDA_PIN, scl=config.TOUCH_SCL_PIN)
-touch_i2c = I2C.Device(i2c_bus, axs15231.I2C_ADDR, axs15231.BITS)
-
-# Create touch input device
-cal = TouchCal()
-touch = axs15231.AXS15231(touch_i2c, touch_cal=cal, debug=False)
-
-# Initialize touch controller
-indev = axs15231.AXS15231(touch_i2c, debug=False)
+# Counts the touch I2C traffic, touch_i2c.stats()
+touch_i2c = axs15231.CountingDevice(I2C.Device(i2c_bus, axs15231.I2C_ADDR, axs15231.BITS))
+
+# One touch input device: every instance registers with LVGL and reads the controller on its own
+indev = axs15231.AXS15231(
+    touch_i2c,
+    debug=False,
+    int_pin=config.TOUCH_INT_PIN,
+    idle_poll_ms=config.TOUCH_IDLE_POLL_MS,
+    read_period_ms=config.TOUCH_READ_PERIOD_MS,
+)
 indev.enable_input_priority()
+touch = indev
 
+boottrace.mark("touch")
 print(f"Touch controller calibrated: {indev.is_calibrated}")
+
+# Rotate after the touch driver took the native resolution, it follows the display's rotation from there
+if config.DISPLAY_ROTATION:
+    set_rotation(config.DISPLAY_ROTATION)
+    print(f"Display rotated {config.DISPLAY_ROTATION}°, {WIDTH}x{HEIGHT}")
 print("System ready!")
 
 # =============================================================================
@@ -128,7 +166,8 @@ After importing this module, you can use:
 
 - display: AXS15231B display driver instance
 - touch: AXS15231 touch controller instance  
-- WIDTH, HEIGHT: Display dimensions
+- WIDTH, HEIGHT: Display dimensions in the current rotation
+- set_rotation(degrees): rotate display and touch, e.g. set_rotation(90) for landscape
 
 Example:
     import lv_config
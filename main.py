@@ -1,64 +1,105 @@
+import time
+import boottrace
+
+boottrace.mark("main")
+
 import machine
 import config
-import time
-import lv_config
-import lvgl as lv
-from display import DisplayUI
-from espnow_manager import ESPNowMessenger
+import profiler
 from microGPS import MicropyGPS
+from scheduler import Scheduler
 
-time.sleep(2)  # Give time for USB/REPL to settle
-
-# Initialize GPS parser and UART
-gps = MicropyGPS()
+# GPS UART first: NMEA piles up in the RX buffer while the display comes up
 uart = machine.UART(
     config.GPS_UART_ID,
     baudrate=config.GPS_BAUDRATE,
     tx=config.GPS_TX_PIN,
     rx=config.GPS_RX_PIN,
+    rxbuf=config.GPS_RXBUF,
 )
 
-ui = DisplayUI()
-messenger = ESPNowMessenger()
+# Initialize GPS parser
+# Only the sentences and fields the speedometer (and track log) use are parsed, satellite bursts are skipped
+gps = MicropyGPS(
+    buffered=True,
+    sentences=("RMC", "VTG", "GGA"),
+    fields=MicropyGPS.FIELDS_TIME | MicropyGPS.FIELDS_POSITION | MicropyGPS.FIELDS_MOTION | MicropyGPS.FIELDS_QUALITY,
+)
 
-# Load peers from file and add to messenger
-import re
+# Reused receive buffer, the parser consumes whole chunks instead of single characters
+uart_buf = bytearray(256)
+uart_mv = memoryview(uart_buf)
+boottrace.mark("gps uart")
+
+import lv_config  # bus, panel and touch init
+import lvgl as lv
+from display import DisplayUI
 
+# ESP-NOW, telemetry and the track log come up in startup_task() after the first frame
+messenger = None
+publisher = None
+track_logger = None
 
-def is_valid_mac(mac):
-    # MAC address should be 6 pairs of hex digits separated by ':'
-    # Example: AA:BB:CC:DD:EE:FF
-    return bool(re.match(r"^([0-9A-Fa-f]{2}:){5}[0-9A-Fa-f]{2}$", mac))
 
+def peers_saved():
+    # Saving peers from the UI rebuilds the messenger's peer registry straight away
+    if messenger:
+        messenger.load_peers_from_file()
 
-def load_peers():
-    try:
-        with open("/peers.txt") as f:
-            macs = [line.strip() for line in f if line.strip()]
-            return [mac for mac in macs if is_valid_mac(mac)]
-    except OSError:
-        return []
 
+# Only the speed screen is built now, the GPS and peer screens on first use
+ui = DisplayUI(on_peers_saved=peers_saved, gestures=config.TOUCH_GESTURES)
+boottrace.mark("ui")
+lv.refr_now(None)
+boottrace.mark("first frame")
 
-for mac_str in load_peers():
-    try:
-        peer_mac = ESPNowMessenger.mac_str_to_bytes(mac_str)
-        messenger.add_peer(peer_mac)
-    except Exception as e:
-        print("Invalid MAC:", mac_str, e)
+profiler.enable(config.PROFILE)
+UART_SPAN = profiler.span("uart")
+GPS_SPAN = profiler.span("gps")
+UI_SPAN = profiler.span("ui")
+LVGL_SPAN = profiler.span("lvgl")
 
-last_update = 0
 last_valid_speed = 0.0
+first_speed = False
+gps_sentences = -1  # gps.clean_sentences when the UI was last refreshed
+ui_ticks = time.ticks_ms()
+debug_refreshed = ui_ticks
 
-try:
-    while True:
-        # 1. Read all available bytes from UART and feed to GPS parser
-        while uart.any():
-            b = uart.read(1)
-            if b:
-                gps.update(chr(b[0]))
-
-        # 2. Update display with GPS data (only when valid, otherwise keep previous)
+
+def uart_task():
+    # 1. Read all available bytes from UART and feed to GPS parser
+    if profiler.enabled:
+        profiler.check_gc()
+        t0 = time.ticks_us()
+    while uart.any():
+        n = uart.readinto(uart_buf)
+        if n:
+            if track_logger:
+                track_logger.capture(uart_mv[:n])
+            if profiler.enabled:
+                t1 = time.ticks_us()
+            gps.update_bytes(uart_mv[:n])
+            if profiler.enabled:
+                GPS_SPAN.add(time.ticks_diff(time.ticks_us(), t1))
+    if profiler.enabled:
+        UART_SPAN.add(time.ticks_diff(time.ticks_us(), t0))
+    # At 9600 baud the UART RX buffer holds far more than one poll interval
+    return config.UART_POLL_MS
+
+
+def ui_task():
+    global last_valid_speed, first_speed, gps_sentences, ui_ticks, debug_refreshed
+
+    # LVGL's tick advances by the time that actually passed, not by a fixed 10 ms
+    now = time.ticks_ms()
+    lv.tick_inc(time.ticks_diff(now, ui_ticks))
+    ui_ticks = now
+
+    # 2. Update display with GPS data, only when the parser took in new sentences
+    if gps.clean_sentences != gps_sentences:
+        if profiler.enabled:
+            t0 = time.ticks_us()
+        gps_sentences = gps.clean_sentences
         if gps.valid:
             last_valid_speed = gps.speed[0]
             speed_knots = last_valid_speed
@@ -67,7 +108,10 @@ try:
             ui.set_display_text("{:.1f}".format(speed_knots))
             ui.set_compass_text(str(compass))
             ui.update_chart(int(speed_knots * 10))
-            lv.task_handler()
+            if not first_speed:
+                first_speed = True
+                boottrace.mark("first speed")
+                boottrace.report()
             if ui.active_screen == 1:
                 try:
                     lat = (
@@ -82,38 +126,146 @@ try:
                     )
                     if gps.longitude[2] == "W":
                         lon = -lon
-                    ui.show_gps_screen(
+                    ui.update_gps_info(
                         lat,
                         lon,
                         satellites_in_use=getattr(gps, "satellites_in_use", None),
                         fix_stat=getattr(gps, "fix_stat", None),
                     )
                 except Exception:
-                    ui.show_gps_screen(None, None, None, None)
+                    ui.update_gps_info(None, None, None, None)
         else:
             ui.set_display_text("{:.1f}".format(last_valid_speed))
+        if profiler.enabled:
+            UI_SPAN.add(time.ticks_diff(time.ticks_us(), t0))
+
+    # Hidden debug screen (long press on the speed) shows the profiler table
+    if ui.active_screen == 3 and time.ticks_diff(now, debug_refreshed) >= 1000:
+        debug_refreshed = now
+        ui.update_debug_text("\n".join(profiler.lines()))
 
-        # 3. Send speed and compass to all peers every
-        now = time.ticks_ms()
-        try:
-            for mac_str in load_peers():
-                peer_mac = ESPNowMessenger.mac_str_to_bytes(mac_str)
-                messenger.send_to(
-                    peer_mac, "speedometer/speed", "{:.1f}".format(gps.speed[0])
-                )
-                messenger.send_to(
-                    peer_mac, "speedometer/compass", str(gps.compass_direction())
-                )
-        except OSError as e:
-            if getattr(e, "errno", None) == 116:
-                print("ESP-NOW send timeout (ETIMEDOUT)")
-            else:
-                print("ESP-NOW send error:", e)
-        last_update = now
-
-        lv.tick_inc(10)
-        lv.task_handler()
-        time.sleep_ms(10)
+    # Sleep for as long as LVGL says it has nothing to do (it returns the ms until its next timer),
+    # capped so input is still read in time
+    if profiler.enabled:
+        t0 = time.ticks_us()
+    hint = lv.timer_handler()
+    if profiler.enabled:
+        LVGL_SPAN.add(time.ticks_diff(time.ticks_us(), t0))
+    return min(max(hint, 1), config.UI_MAX_SLEEP_MS)
 
+
+def start_messenger():
+    global messenger, publisher
+    from espnow_manager import ESPNowMessenger
+    from telemetry import TelemetryPublisher
+
+    messenger = ESPNowMessenger(
+        broadcast=config.TELEMETRY_BROADCAST,
+        group=config.TELEMETRY_GROUP,
+        key=config.TELEMETRY_KEY,
+        queue_size=config.ESPNOW_QUEUE_SIZE,
+    )
+    # Peers only get a frame when speed/compass change, or on the heartbeat
+    publisher = TelemetryPublisher(
+        messenger,
+        heartbeat_ms=config.TELEMETRY_HEARTBEAT_MS,
+        min_interval_ms=config.TELEMETRY_MIN_INTERVAL_MS,
+        fmt=config.TELEMETRY_FORMAT,
+    )
+    scheduler.add("telemetry", telemetry_task, priority=1)
+
+
+def start_track_log():
+    # Track log on the microSD card
+    global track_logger
+    import os
+    from tracklog import TrackLogger
+
+    try:
+        sd = machine.SDCard(
+            slot=2,
+            sck=config.SD_SCK_PIN,
+            miso=config.SD_MISO_PIN,
+            mosi=config.SD_MOSI_PIN,
+            cs=config.SD_CS_PIN,
+        )
+        os.mount(sd, "/sd")
+        track_logger = TrackLogger(
+            config.TRACK_LOG_DIR,
+            interval_ms=config.TRACK_INTERVAL_MS,
+            raw_nmea=config.TRACK_RAW_NMEA,
+        )
+    except OSError as e:
+        print("Track log disabled, no SD card:", e)
+        return
+    scheduler.add("log", log_task, priority=0)
+
+
+startup_stage = 0
+
+
+def startup_task():
+    # Everything the first speed reading doesn't need, one stage per run so the
+    # UART and UI tasks get the CPU in between
+    global startup_stage
+    if startup_stage == 0:
+        start_messenger()
+        boottrace.mark("espnow")
+    elif startup_stage == 1:
+        if config.TRACK_LOG:
+            start_track_log()
+            boottrace.mark("track log")
+    else:
+        scheduler.remove(startup)
+        return 0
+    startup_stage += 1
+    return 0
+
+
+def telemetry_task():
+    # 3. Send speed and compass to peers when they changed or the heartbeat is due
+    messenger.refresh_peers()
+    publisher.publish_gps(gps)
+    # Queued frames go out a few per run, the loop never waits for the radio
+    messenger.pump(config.ESPNOW_PUMP_FRAMES)
+    return config.TELEMETRY_TASK_MS
+
+
+def log_task():
+    # Records and SD writes, the card is only written in whole blocks every few seconds
+    track_logger.task(gps)
+    return config.TRACK_TASK_MS
+
+
+def status_task():
+    # Low priority: only runs when nothing else is due
+    print("GPS: {} sentences, {} skipped, valid {}".format(gps.clean_sentences, gps.skipped_sentences, gps.valid))
+    if messenger:
+        print("ESP-NOW:", messenger.queue_stats())
+    print("Speed:", ui.stats.summary())
+    print("Display:", lv_config.display.flush_stats())
+    print("Touch:", lv_config.indev.stats(), lv_config.touch_i2c.stats())
+    if track_logger:
+        print("Track log:", track_logger.stats())
+    scheduler.print_stats()
+    if profiler.enabled:
+        profiler.report()
+    return config.STATUS_LOG_MS
+
+
+scheduler = Scheduler(max_idle_ms=config.UI_MAX_SLEEP_MS)
+scheduler.add("uart", uart_task, priority=3)
+scheduler.add("ui", ui_task, priority=2)
+startup = scheduler.add("startup", startup_task, priority=0)
+if config.STATUS_LOG_MS:
+    status = scheduler.add("status", status_task, priority=-1)
+    status.due = time.ticks_add(time.ticks_ms(), config.STATUS_LOG_MS)
+
+try:
+    scheduler.run()
 except Exception as e:
     print("Exception in main loop:", e)
+finally:
+    # Ctrl-C or a crash: don't lose the buffered track points
+    if track_logger:
+        track_logger.close()
@@ -8,9 +8,9 @@
 # Time Since First Fix
 # Distance/Time to Target
 # More Helper Functions
-# Dynamically limit sentences types to parse
 
 from math import floor, modf
+from array import array
 
 # Import utime or time for fix time handling
 try:
@@ -22,13 +22,156 @@ except ImportError:
     import time
 
 
+# ASCII hemisphere letters -> the strings the parsers store
+_HEMISPHERE_NAMES = {78: 'N', 83: 'S', 69: 'E', 87: 'W'}
+
+
+def _hex_digit(ascii_char):
+    """Value of a hexadecimal digit character, -1 for anything else"""
+    if 48 <= ascii_char <= 57:
+        return ascii_char - 48
+    ascii_char |= 0x20  # Lower case
+    if 97 <= ascii_char <= 102:
+        return ascii_char - 87
+    return -1
+
+
+def _crc_value(crc_1, crc_2):
+    """int(chr(crc_1) + chr(crc_2), 16) for the two CRC characters, None where int() raises"""
+    digit_1 = _hex_digit(crc_1)
+    digit_2 = _hex_digit(crc_2)
+    if digit_1 >= 0 and digit_2 >= 0:
+        return digit_1 * 16 + digit_2
+    # Signs and whitespace are rare enough to leave to int() itself
+    try:
+        return int(chr(crc_1) + chr(crc_2), 16)
+    except ValueError:
+        return None
+
+
+def _header_key(header, end):
+    """Small int naming the sentence header header[:end] (ASCII values): 6 bits per character for
+    headers of up to 5 characters out of 0-9 and A-Z, -1 for any other header"""
+    if end > 5:
+        return -1
+    key = 0
+    for i in range(end):
+        ascii_char = header[i]
+        if not 48 <= ascii_char <= 90:
+            return -1
+        key = key << 6 | ascii_char - 47
+    return key
+
+
+class SentenceFields(object):
+    """List-like view of the fields of the sentence held in the MicropyGPS sentence buffer.
+    Fields are sliced out of the buffer and decoded only when a sentence parser reads them.
+    The readers below decode numbers straight from the buffer and accept exactly what the
+    same calls on the field string accept"""
+
+    def __init__(self, buf, starts):
+        self._buf = buf
+        self._mv = memoryview(buf)
+        self._starts = starts
+        self.count = 0
+        self.length = 0
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError('list index out of range')
+        return str(self.view(index), 'ascii')
+
+    def _end(self, index):
+        """Offset just past the field, raises IndexError like a list for a missing field"""
+        if not 0 <= index < self.count:
+            raise IndexError('list index out of range')
+        # Every field but the last one is followed by its ',' or '*' separator
+        return self._starts[index + 1] - 1 if index + 1 < self.count else self.length
+
+    def strings(self):
+        """All fields as a list of strings, the gps_segments of unbuffered mode"""
+        return str(self._mv[:self.length], 'ascii').replace('*', ',').split(',')
+
+    def view(self, index):
+        """Return field as a memoryview into the sentence buffer without decoding it"""
+        return self._mv[self._starts[index]:self._end(index)]
+
+    def empty(self, index):
+        """not fields[index]"""
+        return self._end(index) == self._starts[index]
+
+    def is_char(self, index, ascii_char):
+        """fields[index] == chr(ascii_char)"""
+        start = self._starts[index]
+        return self._end(index) - start == 1 and self._buf[start] == ascii_char
+
+    def hemisphere(self, index):
+        """fields[index] if it is one of 'N', 'S', 'E', 'W', None otherwise"""
+        start = self._starts[index]
+        if self._end(index) - start != 1:
+            return None
+        return _HEMISPHERE_NAMES.get(self._buf[start])
+
+    def int_at(self, index, first=0, last=None):
+        """int(fields[index][first:last]). Plain digits are decoded from the buffer,
+        anything else (signs, spaces) goes through int() itself"""
+        start = self._starts[index]
+        end = self._end(index)
+        stop = end if last is None else min(start + last, end)
+        begin = min(start + first, stop)
+
+        buf = self._buf
+        value = 0
+        for i in range(begin, stop):
+            digit = buf[i] - 48
+            if not 0 <= digit <= 9:
+                return int(self[index][first:last])
+            value = value * 10 + digit
+        if begin == stop:
+            return int(self[index][first:last])  # Raises the ValueError of int('')
+        return value
+
+    def float_at(self, index, first=0):
+        """float(fields[index][first:]). Numbers made of up to 15 digits and a decimal point are
+        collected as one integer and scaled once, which rounds the same as float(). Anything else
+        (signs, spaces, exponents) goes through float() itself"""
+        start = self._starts[index]
+        end = self._end(index)
+        begin = min(start + first, end)
+
+        buf = self._buf
+        value = 0
+        scale = 1
+        digits = 0
+        point = False
+        for i in range(begin, end):
+            ascii_char = buf[i]
+            if ascii_char == 46 and not point:  # '.'
+                point = True
+                continue
+            digit = ascii_char - 48
+            if not 0 <= digit <= 9 or digits == 15:
+                return float(self[index][first:])
+            value = value * 10 + digit
+            digits += 1
+            if point:
+                scale *= 10
+        if not digits:
+            return float(self[index][first:])
+        return value / scale
+
+
 class MicropyGPS(object):
     """GPS NMEA Sentence Parser. Creates object that stores all relevant GPS data and statistics.
-    Parses sentences one character at a time using update(). """
+    Parses sentences one character at a time using update(), or a chunk at a time using update_bytes(). """
 
     # Max Number of Characters a valid sentence can be (based on GGA sentence)
     SENTENCE_LIMIT = 90
-    __HEMISPHERES = ('N', 'S', 'E', 'W')
     __NO_FIX = 1
     __FIX_2D = 2
     __FIX_3D = 3
@@ -38,7 +181,15 @@ class MicropyGPS(object):
                 'June', 'July', 'August', 'September', 'October',
                 'November', 'December')
 
-    def __init__(self, local_offset=0, location_formatting='ddm'):
+    # Field groups the sentence parsers decode, see set_sentence_filter()
+    FIELDS_TIME = 0x01  # UTC timestamp and date
+    FIELDS_POSITION = 0x02  # Latitude, longitude, altitude
+    FIELDS_MOTION = 0x04  # Speed and course
+    FIELDS_QUALITY = 0x08  # Satellites in use, satellites used, DOP values
+    FIELDS_SATELLITES = 0x10  # Satellites in view (GSV)
+    FIELDS_ALL = 0x1F
+
+    def __init__(self, local_offset=0, location_formatting='ddm', buffered=False, sentences=None, fields=None):
         """
         Setup GPS Object Status Flags, Internal Data Registers, etc
             local_offset (int): Timzone Difference to UTC
@@ -46,6 +197,10 @@ class MicropyGPS(object):
                                        Decimal Degree Minute (ddm) - 40° 26.767′ N
                                        Degrees Minutes Seconds (dms) - 40° 26′ 46″ N
                                        Decimal Degrees (dd) - 40.446° N
+            buffered (bool): Keep gps_segments as a SentenceFields view of the sentence buffer, decoding fields on
+                             access, instead of splitting every clean sentence into a list of strings
+            sentences (iterable): Sentence types to parse, see set_sentence_filter()
+            fields (int): Field groups to decode, see set_sentence_filter()
         """
 
         #####################
@@ -57,12 +212,29 @@ class MicropyGPS(object):
         self.crc_xor = 0
         self.char_count = 0
         self.fix_time = 0
+        self._skipping = False
+
+        # Every sentence is assembled in preallocated storage: raw sentence text after '$' including the
+        # ',' and '*' separators, plus the offset each field starts at. The parsers read their numbers from it
+        self._sentence_buf = bytearray(self.SENTENCE_LIMIT + 2)
+        self._field_starts = array('B', bytes(self.SENTENCE_LIMIT + 3))
+        self._fields = SentenceFields(self._sentence_buf, self._field_starts)
+        self._buffered = buffered
+        if buffered:
+            self.gps_segments = self._fields
+        self._char_buf = bytearray(1)  # update()'s character, fed to _assemble()
 
         #####################
         # Sentence Statistics
         self.crc_fails = 0
         self.clean_sentences = 0
         self.parsed_sentences = 0
+        self.skipped_sentences = 0
+        self.skipped_bytes = 0
+
+        #####################
+        # Sentence Selection (sentence_parsers, field_groups)
+        self.set_sentence_filter(sentences, fields)
 
         #####################
         # Logging Related
@@ -169,6 +341,31 @@ class MicropyGPS(object):
             return False
         return True
 
+    ########################################
+    # Sentence Selection Functions
+    ########################################
+    def set_sentence_filter(self, sentences=None, fields=None):
+        """
+        Limit parsing to a subset of sentence types and field groups
+            sentences (iterable): Sentence types with or without talker ID, e.g. ('RMC', 'VTG', 'GNGGA').
+                                  Other sentences are dropped right after their header is read, without
+                                  CRC accumulation or field splitting. None parses every supported sentence
+            fields (int): Bitmask of FIELDS_* groups the sentence parsers decode, None decodes all
+        """
+        if sentences is None:
+            self.sentence_parsers = self.supported_sentences
+        else:
+            self.sentence_parsers = {name: parser for name, parser in self.supported_sentences.items()
+                                     if name in sentences or name[2:] in sentences}
+        self._filtered = sentences is not None
+
+        # Parser names by _header_key(), so headers are looked up without building a string
+        self._header_names = {}
+        for name in self.sentence_parsers:
+            self._header_names[_header_key(name.encode(), len(name))] = name
+
+        self.field_groups = self.FIELDS_ALL if fields is None else fields
+
     ########################################
     # Sentence Parsers
     ########################################
@@ -177,83 +374,86 @@ class MicropyGPS(object):
         Updates UTC timestamp, latitude, longitude, Course, Speed, Date, and fix status
         """
 
-        # UTC Timestamp
-        try:
-            utc_string = self.gps_segments[1]
+        fields = self.field_groups
+        # Numbers are read through the field readers, which decode them without building strings
+        segments = self._fields
 
-            if utc_string:  # Possible timestamp found
-                hours = (int(utc_string[:2]) + self.local_offset) % 24
-                minutes = int(utc_string[2:4])
-                seconds = float(utc_string[4:])
-                self.timestamp = [hours, minutes, seconds]
-            else:  # No Time stamp yet
-                self.timestamp = [0, 0, 0.0]
-
-        except ValueError:  # Bad Timestamp value present
-            return False
-
-        # Date stamp
-        try:
-            date_string = self.gps_segments[9]
-
-            # Date string printer function assumes to be year >=2000,
-            # date_string() must be supplied with the correct century argument to display correctly
-            if date_string:  # Possible date stamp found
-                day = int(date_string[:2])
-                month = int(date_string[2:4])
-                year = int(date_string[4:6])
-                self.date = (day, month, year)
-            else:  # No Date stamp yet
-                self.date = (0, 0, 0)
-
-        except ValueError:  # Bad Date stamp value present
-            return False
-
-        # Check Receiver Data Valid Flag
-        if self.gps_segments[2] == 'A':  # Data from Receiver is Valid/Has Fix
-
-            # Longitude / Latitude
+        if fields & self.FIELDS_TIME:
+            # UTC Timestamp
             try:
-                # Latitude
-                l_string = self.gps_segments[3]
-                lat_degs = int(l_string[:2])
-                lat_mins = float(l_string[2:])
-                lat_hemi = self.gps_segments[4]
-
-                # Longitude
-                l_string = self.gps_segments[5]
-                lon_degs = int(l_string[:3])
-                lon_mins = float(l_string[3:])
-                lon_hemi = self.gps_segments[6]
-            except ValueError:
-                return False
-
-            if lat_hemi not in self.__HEMISPHERES:
+                if not segments.empty(1):  # Possible timestamp found
+                    hours = (segments.int_at(1, 0, 2) + self.local_offset) % 24
+                    minutes = segments.int_at(1, 2, 4)
+                    seconds = segments.float_at(1, 4)
+                    self.timestamp = [hours, minutes, seconds]
+                else:  # No Time stamp yet
+                    self.timestamp = [0, 0, 0.0]
+
+            except ValueError:  # Bad Timestamp value present
                 return False
 
-            if lon_hemi not in self.__HEMISPHERES:
-                return False
-
-            # Speed
+            # Date stamp
             try:
-                spd_knt = float(self.gps_segments[7])
-            except ValueError:
+                # Date string printer function assumes to be year >=2000,
+                # date_string() must be supplied with the correct century argument to display correctly
+                if not segments.empty(9):  # Possible date stamp found
+                    day = segments.int_at(9, 0, 2)
+                    month = segments.int_at(9, 2, 4)
+                    year = segments.int_at(9, 4, 6)
+                    self.date = (day, month, year)
+                else:  # No Date stamp yet
+                    self.date = (0, 0, 0)
+
+            except ValueError:  # Bad Date stamp value present
                 return False
 
-            # Course
-            try:
-                course = float(self.gps_segments[8]) if self.gps_segments[8] else 0.0
-            except ValueError:
-                return False
+        # Check Receiver Data Valid Flag
+        if segments.is_char(2, 65):  # 'A', Data from Receiver is Valid/Has Fix
+
+            # Longitude / Latitude
+            if fields & self.FIELDS_POSITION:
+                try:
+                    # Latitude
+                    lat_degs = segments.int_at(3, 0, 2)
+                    lat_mins = segments.float_at(3, 2)
+                    lat_hemi = segments.hemisphere(4)
+
+                    # Longitude
+                    lon_degs = segments.int_at(5, 0, 3)
+                    lon_mins = segments.float_at(5, 3)
+                    lon_hemi = segments.hemisphere(6)
+                except ValueError:
+                    return False
+
+                if lat_hemi is None:
+                    return False
+
+                if lon_hemi is None:
+                    return False
+
+            if fields & self.FIELDS_MOTION:
+                # Speed
+                try:
+                    spd_knt = segments.float_at(7)
+                except ValueError:
+                    return False
+
+                # Course
+                try:
+                    course = segments.float_at(8) if not segments.empty(8) else 0.0
+                except ValueError:
+                    return False
 
             # TODO - Add Magnetic Variation
 
             # Update Object Data
-            self._latitude = [lat_degs, lat_mins, lat_hemi]
-            self._longitude = [lon_degs, lon_mins, lon_hemi]
-            # Include mph and hm/h
-            self.speed = [spd_knt, spd_knt * 1.151, spd_knt * 1.852]
-            self.course = course
+            if fields & self.FIELDS_POSITION:
+                self._latitude = [lat_degs, lat_mins, lat_hemi]
+                self._longitude = [lon_degs, lon_mins, lon_hemi]
+            if fields & self.FIELDS_MOTION:
+                # Include mph and hm/h
+                self.speed = [spd_knt, spd_knt * 1.151, spd_knt * 1.852]
+                self.course = course
             self.valid = True
 
             # Update Last Fix Time
@@ -272,49 +472,51 @@ class MicropyGPS(object):
         """Parse Geographic Latitude and Longitude (GLL)Sentence. Updates UTC timestamp, latitude,
         longitude, and fix status"""
 
-        # UTC Timestamp
-        try:
-            utc_string = self.gps_segments[5]
-
-            if utc_string:  # Possible timestamp found
-                hours = (int(utc_string[:2]) + self.local_offset) % 24
-                minutes = int(utc_string[2:4])
-                seconds = float(utc_string[4:])
-                self.timestamp = [hours, minutes, seconds]
-            else:  # No Time stamp yet
-                self.timestamp = [0, 0, 0.0]
+        fields = self.field_groups
+        segments = self._fields
 
-        except ValueError:  # Bad Timestamp value present
-            return False
+        if fields & self.FIELDS_TIME:
+            # UTC Timestamp
+            try:
+                if not segments.empty(5):  # Possible timestamp found
+                    hours = (segments.int_at(5, 0, 2) + self.local_offset) % 24
+                    minutes = segments.int_at(5, 2, 4)
+                    seconds = segments.float_at(5, 4)
+                    self.timestamp = [hours, minutes, seconds]
+                else:  # No Time stamp yet
+                    self.timestamp = [0, 0, 0.0]
+
+            except ValueError:  # Bad Timestamp value present
+                return False
 
         # Check Receiver Data Valid Flag
-        if self.gps_segments[6] == 'A':  # Data from Receiver is Valid/Has Fix
+        if segments.is_char(6, 65):  # 'A', Data from Receiver is Valid/Has Fix
 
-            # Longitude / Latitude
-            try:
-                # Latitude
-                l_string = self.gps_segments[1]
-                lat_degs = int(l_string[:2])
-                lat_mins = float(l_string[2:])
-                lat_hemi = self.gps_segments[2]
+            if fields & self.FIELDS_POSITION:
+                # Longitude / Latitude
+                try:
+                    # Latitude
+                    lat_degs = segments.int_at(1, 0, 2)
+                    lat_mins = segments.float_at(1, 2)
+                    lat_hemi = segments.hemisphere(2)
 
-                # Longitude
-                l_string = self.gps_segments[3]
-                lon_degs = int(l_string[:3])
-                lon_mins = float(l_string[3:])
-                lon_hemi = self.gps_segments[4]
-            except ValueError:
-                return False
+                    # Longitude
+                    lon_degs = segments.int_at(3, 0, 3)
+                    lon_mins = segments.float_at(3, 3)
+                    lon_hemi = segments.hemisphere(4)
+                except ValueError:
+                    return False
 
-            if lat_hemi not in self.__HEMISPHERES:
-                return False
+                if lat_hemi is None:
+                    return False
 
-            if lon_hemi not in self.__HEMISPHERES:
-                return False
+                if lon_hemi is None:
+                    return False
+
+                # Update Object Data
+                self._latitude = [lat_degs, lat_mins, lat_hemi]
+                self._longitude = [lon_degs, lon_mins, lon_hemi]
 
-            # Update Object Data
-            self._latitude = [lat_degs, lat_mins, lat_hemi]
-            self._longitude = [lon_degs, lon_mins, lon_hemi]
             self.valid = True
 
             # Update Last Fix Time
@@ -329,9 +531,13 @@ class MicropyGPS(object):
 
     def gpvtg(self):
         """Parse Track Made Good and Ground Speed (VTG) Sentence. Updates speed and course"""
+        if not self.field_groups & self.FIELDS_MOTION:
+            return True
+
+        segments = self._fields
         try:
-            course = float(self.gps_segments[1]) if self.gps_segments[1] else 0.0
-            spd_knt = float(self.gps_segments[5]) if self.gps_segments[5] else 0.0
+            course = segments.float_at(1) if not segments.empty(1) else 0.0
+            spd_knt = segments.float_at(5) if not segments.empty(5) else 0.0
         except ValueError:
             return False
 
@@ -344,64 +550,65 @@ class MicropyGPS(object):
         """Parse Global Positioning System Fix Data (GGA) Sentence. Updates UTC timestamp, latitude, longitude,
         fix status, satellites in use, Horizontal Dilution of Precision (HDOP), altitude, geoid height and fix status"""
 
-        try:
-            # UTC Timestamp
-            utc_string = self.gps_segments[1]
+        fields = self.field_groups
+        segments = self._fields
 
-            # Skip timestamp if receiver doesn't have on yet
-            if utc_string:
-                hours = (int(utc_string[:2]) + self.local_offset) % 24
-                minutes = int(utc_string[2:4])
-                seconds = float(utc_string[4:])
-            else:
-                hours = 0
-                minutes = 0
-                seconds = 0.0
+        try:
+            if fields & self.FIELDS_TIME:
+                # UTC Timestamp, skip it if receiver doesn't have on yet
+                if not segments.empty(1):
+                    hours = (segments.int_at(1, 0, 2) + self.local_offset) % 24
+                    minutes = segments.int_at(1, 2, 4)
+                    seconds = segments.float_at(1, 4)
+                else:
+                    hours = 0
+                    minutes = 0
+                    seconds = 0.0
 
-            # Number of Satellites in Use
-            satellites_in_use = int(self.gps_segments[7])
+            if fields & self.FIELDS_QUALITY:
+                # Number of Satellites in Use
+                satellites_in_use = segments.int_at(7)
 
             # Get Fix Status
-            fix_stat = int(self.gps_segments[6])
+            fix_stat = segments.int_at(6)
 
         except (ValueError, IndexError):
             return False
 
-        try:
-            # Horizontal Dilution of Precision
-            hdop = float(self.gps_segments[8])
-        except (ValueError, IndexError):
-            hdop = 0.0
+        if fields & self.FIELDS_QUALITY:
+            try:
+                # Horizontal Dilution of Precision
+                hdop = segments.float_at(8)
+            except (ValueError, IndexError):
+                hdop = 0.0
 
         # Process Location and Speed Data if Fix is GOOD
-        if fix_stat:
+        if fix_stat and fields & self.FIELDS_POSITION:
 
             # Longitude / Latitude
             try:
                 # Latitude
-                l_string = self.gps_segments[2]
-                lat_degs = int(l_string[:2])
-                lat_mins = float(l_string[2:])
-                lat_hemi = self.gps_segments[3]
+                lat_degs = segments.int_at(2, 0, 2)
+                lat_mins = segments.float_at(2, 2)
+                lat_hemi = segments.hemisphere(3)
 
                 # Longitude
-                l_string = self.gps_segments[4]
-                lon_degs = int(l_string[0:3])
-                lon_mins = float(l_string[3:])
-                lon_hemi = self.gps_segments[5]
+                lon_degs = segments.int_at(4, 0, 3)
+                lon_mins = segments.float_at(4, 3)
+                lon_hemi = segments.hemisphere(5)
             except ValueError:
                 return False
 
-            if lat_hemi not in self.__HEMISPHERES:
+            if lat_hemi is None:
                 return False
 
-            if lon_hemi not in self.__HEMISPHERES:
+            if lon_hemi is None:
                 return False
 
             # Altitude / Height Above Geoid
             try:
-                altitude = float(self.gps_segments[9])
-                geoid_height = float(self.gps_segments[11])
+                altitude = segments.float_at(9)
+                geoid_height = segments.float_at(11)
             except ValueError:
                 altitude = 0
                 geoid_height = 0
@@ -413,9 +620,11 @@ class MicropyGPS(object):
             self.geoid_height = geoid_height
 
         # Update Object Data
-        self.timestamp = [hours, minutes, seconds]
-        self.satellites_in_use = satellites_in_use
-        self.hdop = hdop
+        if fields & self.FIELDS_TIME:
+            self.timestamp = [hours, minutes, seconds]
+        if fields & self.FIELDS_QUALITY:
+            self.satellites_in_use = satellites_in_use
+            self.hdop = hdop
         self.fix_stat = fix_stat
 
         # If Fix is GOOD, update fix timestamp
@@ -429,28 +638,36 @@ class MicropyGPS(object):
         fix calculation, Position Dilution of Precision (PDOP), Horizontal Dilution of Precision (HDOP), Vertical
         Dilution of Precision, and fix status"""
 
+        segments = self._fields
+
         # Fix Type (None,2D or 3D)
         try:
-            fix_type = int(self.gps_segments[2])
+            fix_type = segments.int_at(2)
         except ValueError:
             return False
 
+        # Satellites used and DOP values are only needed for the fix quality group
+        if not self.field_groups & self.FIELDS_QUALITY:
+            self.fix_type = fix_type
+            if fix_type > self.__NO_FIX:
+                self.new_fix_time()
+            return True
+
         # Read All (up to 12) Available PRN Satellite Numbers
         sats_used = []
         for sats in range(12):
-            sat_number_str = self.gps_segments[3 + sats]
-            if not sat_number_str:
+            if segments.empty(3 + sats):
                 break
 
             try:
-                sats_used.append(int(sat_number_str))
+                sats_used.append(segments.int_at(3 + sats))
             except ValueError:
                 return False
         # PDOP,HDOP,VDOP
         try:
-            pdop = float(self.gps_segments[15])
-            hdop = float(self.gps_segments[16])
-            vdop = float(self.gps_segments[17])
+            pdop = segments.float_at(15)
+            hdop = segments.float_at(16)
+            vdop = segments.float_at(17)
         except ValueError:
             return False
 
@@ -471,10 +688,14 @@ class MicropyGPS(object):
     def gpgsv(self):
         """Parse Satellites in View (GSV) sentence. Updates number of SV Sentences,the number of the last SV sentence
         parsed, and data on each satellite present in the sentence"""
+        if not self.field_groups & self.FIELDS_SATELLITES:
+            return True
+
+        segments = self._fields
         try:
-            num_sv_sentences = int(self.gps_segments[1])
-            current_sv_sentence = int(self.gps_segments[2])
-            sats_in_view = int(self.gps_segments[3])
+            num_sv_sentences = segments.int_at(1)
+            current_sv_sentence = segments.int_at(2)
+            sats_in_view = segments.int_at(3)
         except ValueError:
             return False
 
@@ -492,26 +713,26 @@ class MicropyGPS(object):
         # Try to recover data for up to 4 satellites in sentence
         for sats in range(4, sat_segment_limit, 4):
 
-            if not self.gps_segments[sats]:
+            if segments.empty(sats):
                 break
 
             try:
-                sat_id = int(self.gps_segments[sats])
+                sat_id = segments.int_at(sats)
             except (ValueError,IndexError):
                 return False
 
             try:  # elevation can be null (no value) when not tracking
-                elevation = int(self.gps_segments[sats+1])
+                elevation = segments.int_at(sats + 1)
             except (ValueError,IndexError):
                 elevation = None
 
             try:  # azimuth can be null (no value) when not tracking
-                azimuth = int(self.gps_segments[sats+2])
+                azimuth = segments.int_at(sats + 2)
             except (ValueError,IndexError):
                 azimuth = None
 
             try:  # SNR can be null (no value) when not tracking
-                snr = int(self.gps_segments[sats+3])
+                snr = segments.int_at(sats + 3)
             except (ValueError,IndexError):
                 snr = None
             # Add Satellite Data to Sentence Dict
@@ -537,84 +758,202 @@ class MicropyGPS(object):
 
     def new_sentence(self):
         """Adjust Object Flags in Preparation for a New Sentence"""
-        self.gps_segments = ['']
+        self._fields.count = 1
+        self._fields.length = 0
         self.active_segment = 0
         self.crc_xor = 0
+        self._skipping = False
         self.sentence_active = True
         self.process_crc = True
         self.char_count = 0
 
     def update(self, new_char):
         """Process a new input char and updates GPS object if necessary based on special characters ('$', ',', '*')
-        Function builds a list of received string that are validate by CRC prior to parsing by the  appropriate
-        sentence function. Returns sentence type on successful parse, None otherwise"""
-
-        valid_sentence = False
+        Characters are assembled into sentences that are validated by CRC prior to parsing by the appropriate
+        sentence function, see _assemble(). Returns sentence type on successful parse, None otherwise"""
 
         # Validate new_char is a printable char
         ascii_char = ord(new_char)
-
-        if 10 <= ascii_char <= 126:
-            self.char_count += 1
-
-            # Write Character to log file if enabled
-            if self.log_en:
-                self.write_log(new_char)
+        if not 10 <= ascii_char <= 126:
+            return None
+
+        # Write Character to log file if enabled
+        if self.log_en:
+            self.write_log(new_char)
+
+        self._char_buf[0] = ascii_char
+        return self._assemble(self._char_buf, None)
+
+    def update_bytes(self, buf):
+        """Process a chunk of raw NMEA bytes (bytes, bytearray or memoryview, e.g. filled by uart.readinto()).
+        Runs the assembler of update() over the byte values without converting the chunk, a sentence running into
+        the next chunk simply stays in the sentence buffer. Produces the same parsed data and sentence statistics as
+        calling update() for every byte. Returns a list of the sentence types successfully parsed from the chunk"""
+
+        parsed = []
+
+        # Logging writes every character as it arrives, keep the character path so the log stays identical
+        if self.log_en:
+            for byte in buf:
+                sentence_type = self.update(chr(byte))
+                if sentence_type:
+                    parsed.append(sentence_type)
+            return parsed
+
+        self._assemble(buf, parsed)
+        return parsed
+
+    # update_bytes() accepts memoryviews directly, feed() reads better next to uart.readinto()
+    feed = update_bytes
+
+    def _sentence_type(self, end):
+        """Name of the selected sentence parser for the header held in the sentence buffer up to end,
+        None if there is none"""
+        key = _header_key(self._sentence_buf, end)
+        return self._header_names.get(key) if key >= 0 else None
+
+    def _assemble(self, buf, parsed):
+        """Sentence assembler behind update() and update_bytes(): stores the printable bytes of buf in the
+        sentence buffer, marking where each field starts, checks the CRC and hands clean sentences to their
+        parser. Unbuffered mode splits the sentence into the gps_segments strings first. Sentence types parsed
+        are appended to parsed if given, the last one is returned"""
+        sentence_buf = self._sentence_buf
+        buf_size = len(sentence_buf)
+        starts = self._field_starts
+        fields = self._fields
+        filtered = self._filtered
+        limit = self.SENTENCE_LIMIT
+        last_type = None
+
+        # Sentence state in locals for the loop, stored back at the end and before a parser runs
+        active = self.sentence_active
+        skipping = self._skipping
+        segment = self.active_segment
+        crc_xor = self.crc_xor
+        process_crc = self.process_crc
+        char_count = self.char_count
+        length = fields.length
+        count = fields.count
+        skipped_bytes = 0
+
+        for ascii_char in buf:
+            # Most bytes are payload: not a delimiter, CRC input, and the limit check below keeps them in the buffer
+            if active and process_crc and 44 < ascii_char < 127:
+                char_count += 1
+                sentence_buf[length] = ascii_char
+                length += 1
+                crc_xor ^= ascii_char
+                if char_count > limit:
+                    active = False
+                continue
+
+            # Validate new_char is a printable char
+            if ascii_char < 10 or ascii_char > 126:
+                continue
+            char_count += 1
+
+            # Rest of a rejected sentence, counted up to the next '$'
+            if skipping and ascii_char != 36:
+                skipped_bytes += 1
+                continue
 
             # Check if a new string is starting ($)
-            if new_char == '$':
-                self.new_sentence()
-                return None
-
-            elif self.sentence_active:
-
-                # Check if sentence is ending (*)
-                if new_char == '*':
-                    self.process_crc = False
-                    self.active_segment += 1
-                    self.gps_segments.append('')
-                    return None
-
-                # Check if a section is ended (,), Create a new substring to feed
-                # characters to
-                elif new_char == ',':
-                    self.active_segment += 1
-                    self.gps_segments.append('')
-
-                # Store All Other printable character and check CRC when ready
+            if ascii_char == 36:
+                active = True
+                skipping = False
+                segment = 0
+                crc_xor = 0
+                process_crc = True
+                char_count = 0
+                length = 0
+                count = 1
+                continue
+
+            if not active:
+                continue
+
+            # A run of '*' skips the SENTENCE_LIMIT check below, stop before it overflows the buffer
+            if length == buf_size:
+                active = False
+                continue
+
+            # Separators are kept in the buffer so a field ends one byte before the next one starts
+            sentence_buf[length] = ascii_char
+            length += 1
+            valid_sentence = False
+
+            # Check if sentence is ending (*)
+            if ascii_char == 42:
+                process_crc = False
+                segment += 1
+                starts[count] = length
+                count += 1
+                continue
+
+            # Check if a section is ended (,), start the next field after it
+            if ascii_char == 44:
+                segment += 1
+                starts[count] = length
+                count += 1
+
+                # Drop sentences that were not selected as soon as their header is complete
+                if segment == 1 and filtered and self._sentence_type(length - 1) is None:
+                    active = False
+                    skipping = True
+                    self.skipped_sentences += 1
+                    skipped_bytes += char_count + 1  # Includes the '$'
+                    continue
+
+            # When CRC input is disabled, sentence is nearly complete
+            elif not process_crc and length - starts[segment] == 2:
+                final_crc = _crc_value(sentence_buf[length - 2], ascii_char)
+                if final_crc is None:
+                    pass  # CRC Value was deformed and could not have been correct
+                elif crc_xor == final_crc:
+                    valid_sentence = True
                 else:
-                    self.gps_segments[self.active_segment] += new_char
-
-                    # When CRC input is disabled, sentence is nearly complete
-                    if not self.process_crc and len(self.gps_segments[self.active_segment]) == 2:
-                        try:
-                            final_crc = int(self.gps_segments[self.active_segment], 16)
-                            if self.crc_xor == final_crc:
-                                valid_sentence = True
-                            else:
-                                self.crc_fails += 1
-                        except ValueError:
-                            pass  # CRC Value was deformed and could not have been correct
-
-                # Update CRC
-                if self.process_crc:
-                    self.crc_xor ^= ascii_char
-
-                # If a Valid Sentence Was received and it's a supported sentence, then parse it!!
-                if valid_sentence:
-                    self.clean_sentences += 1  # Increment clean sentences received
-                    self.sentence_active = False  # Clear Active Processing Flag
-
-                    if self.gps_segments[0] in self.supported_sentences and self.supported_sentences[self.gps_segments[0]](self):
-                        self.parsed_sentences += 1
-                        return self.gps_segments[0]
-
-                # Check that the sentence buffer isn't filling up with Garage waiting for the sentence to complete
-                if self.char_count > self.SENTENCE_LIMIT:
-                    self.sentence_active = False
-
-        # Tell Host no new sentence was parsed
-        return None
+                    self.crc_fails += 1
+
+            # Update CRC
+            if process_crc:
+                crc_xor ^= ascii_char
+
+            # If a Valid Sentence Was received and it's a supported sentence, then parse it!!
+            if valid_sentence:
+                self.clean_sentences += 1
+                active = False
+
+                # The parsers read the sentence state
+                fields.length = length
+                fields.count = count
+                self.active_segment = segment
+                self.crc_xor = crc_xor
+                self.process_crc = process_crc
+                self.char_count = char_count
+                if not self._buffered:
+                    self.gps_segments = fields.strings()
+
+                sentence_type = self._sentence_type(starts[1] - 1)
+                if sentence_type is not None and self.sentence_parsers[sentence_type](self):
+                    self.parsed_sentences += 1
+                    last_type = sentence_type
+                    if parsed is not None:
+                        parsed.append(sentence_type)
+
+            # Check that the sentence buffer isn't filling up with Garage waiting for the sentence to complete
+            if char_count > limit:
+                active = False
+
+        self.sentence_active = active
+        self._skipping = skipping
+        self.active_segment = segment
+        self.crc_xor = crc_xor
+        self.process_crc = process_crc
+        self.char_count = char_count
+        fields.length = length
+        fields.count = count
+        self.skipped_bytes += skipped_bytes
+        return last_type
 
     def new_fix_time(self):
         """Updates a high resolution counter with current time when fix is updated. Currently only triggered from
@@ -0,0 +1,154 @@
+"""
+Lightweight hot-path instrumentation.
+
+Spans are named timers with a fixed-size ring of the last WINDOW durations (us),
+so recording a sample never allocates. Instrumented code checks the module
+flag itself, which is the only cost while profiling is off:
+
+    if profiler.enabled:
+        t0 = time.ticks_us()
+    work()
+    if profiler.enabled:
+        SPAN.add(time.ticks_diff(time.ticks_us(), t0))
+
+Turn it on with config.PROFILE or profiler.enable() from the REPL, print the
+numbers with profiler.report(). A long press on the speed opens a debug screen
+with the same table.
+
+An automatic collection cannot be timed, it runs inside whatever allocation
+triggered it. check_gc(), called at the start of every UART poll, watches for
+them without changing when they happen: free heap going up between two polls
+means a collection ran in between, and how much later than the previous gap
+that poll came is its estimated pause, kept in the "gc" span. The report shows
+its max and p99. collect() forces a collection timed in the "collect" span, but
+only when called, e.g. from the REPL.
+"""
+
+import gc
+import time
+from array import array
+
+WINDOW = 64  # samples kept per span
+
+enabled = False
+spans = {}  # name -> Span, in registration order
+
+# Automatic garbage collections seen by check_gc()
+gc_collections = 0
+_mem_free = 0
+_last_check = 0  # ticks_us of the last check_gc()
+_poll_gap = 0  # us between the last two checks without a collection in between
+
+
+class Span:
+    def __init__(self, name, window=WINDOW):
+        self.name = name
+        self.window = window
+        self.samples = array("I", [0] * window)
+        self.index = 0
+        self.count = 0  # samples since the last reset
+        self.max_us = 0  # since the last reset, not just the window
+
+    def add(self, us):
+        self.samples[self.index] = us
+        self.index += 1
+        if self.index == self.window:
+            self.index = 0
+        self.count += 1
+        if us > self.max_us:
+            self.max_us = us
+
+    def reset(self):
+        self.index = 0
+        self.count = 0
+        self.max_us = 0
+
+    def summary(self):
+        """(samples, min, avg, p95, max) in us over the rolling window, None without samples."""
+        n = min(self.count, self.window)
+        if not n:
+            return None
+        window = sorted(self.samples[:n])
+        return n, window[0], sum(window) // n, window[min(n - 1, n * 95 // 100)], window[-1]
+
+    def percentile(self, percent):
+        """Duration in us below which percent of the window's samples fall, None without samples."""
+        n = min(self.count, self.window)
+        if not n:
+            return None
+        return sorted(self.samples[:n])[min(n - 1, n * percent // 100)]
+
+
+def span(name):
+    """Get or create the span for name. Create spans once at import time, not in the hot path."""
+    s = spans.get(name)
+    if s is None:
+        s = spans[name] = Span(name)
+    return s
+
+
+_GC_SPAN = span("gc")  # estimated pauses of automatic collections
+_COLLECT_SPAN = span("collect")  # collect() calls
+
+
+def enable(on=True):
+    global enabled, _mem_free, _last_check
+    enabled = on
+    _mem_free = 0
+    _last_check = 0
+
+
+def reset():
+    global gc_collections
+    gc_collections = 0
+    for s in spans.values():
+        s.reset()
+
+
+def check_gc():
+    """Count automatic collections: MicroPython only returns memory to the heap when the GC runs,
+    so free heap going up between two checks means a collection happened in between. The time between
+    those two checks beyond the last gap without a collection goes into the "gc" span as its pause.
+    Call it from a task that runs at a steady interval."""
+    global gc_collections, _mem_free, _last_check, _poll_gap
+    now = time.ticks_us()
+    free = gc.mem_free()
+    if _mem_free and _last_check:
+        gap = time.ticks_diff(now, _last_check)
+        if free > _mem_free:
+            gc_collections += 1
+            _GC_SPAN.add(max(gap - _poll_gap, 0))
+        else:
+            _poll_gap = gap
+    _mem_free = free
+    _last_check = now
+
+
+def collect():
+    """Run an explicit collection, timed in the "collect" span."""
+    global _mem_free
+    t0 = time.ticks_us()
+    gc.collect()
+    _COLLECT_SPAN.add(time.ticks_diff(time.ticks_us(), t0))
+    _mem_free = gc.mem_free()
+
+
+def lines():
+    out = ["{:8} {:>5} {:>6} {:>6} {:>6} {:>6} {:>7}".format("span", "n", "min", "avg", "p95", "max", "max all")]
+    for s in spans.values():
+        summary = s.summary()
+        if summary is None:
+            out.append("{:8} {:>5}".format(s.name, 0))
+        else:
+            out.append("{:8} {:5} {:6} {:6} {:6} {:6} {:7}".format(s.name, *summary, s.max_us))
+    out.append("gc collections: {}".format(gc_collections))
+    if _GC_SPAN.count:
+        out.append("gc pause (est.): max {} us, p99 {} us".format(_GC_SPAN.max_us, _GC_SPAN.percentile(99)))
+    return out
+
+
+def report():
+    if not enabled:
+        print("Profiler disabled, profiler.enable() to start")
+    for line in lines():
+        print(line)
@@ -0,0 +1,461 @@
+# Based on the work by straga (https://github.com/straga)
+# https://github.com/straga/micropython_lcd/blob/master/device/JC3248W535/driver/axs15231b/axs15231b.py
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+"""
+Common driver for quad-SPI panels (the AXS15231B so far).
+
+QSPIPanel has the flush engine (chunked RAMWR/RAMWRC writes, completion
+counting per flush, partial windows), the frame buffer allocation and a
+table-driven panel init. A panel module subclasses it with its orientation
+table, pixel formats and _INIT_TABLE.
+"""
+
+import display_driver_framework
+from micropython import const  # NOQA
+import time
+import gc
+
+import lcd_bus
+import lvgl as lv  # NOQA
+import profiler
+
+
+STATE_HIGH = display_driver_framework.STATE_HIGH
+STATE_LOW = display_driver_framework.STATE_LOW
+STATE_PWM = display_driver_framework.STATE_PWM
+
+BYTE_ORDER_RGB = display_driver_framework.BYTE_ORDER_RGB
+BYTE_ORDER_BGR = display_driver_framework.BYTE_ORDER_BGR
+
+_RASET = const(0x2B)
+_CASET = const(0x2A)
+_MADCTL = const(0x36)
+_COLMOD = const(0x3A)
+
+_RAMWR = const(0x2C)
+_RAMWRC = const(0x3C)
+
+_WRITE_CMD = const(0x02)
+_WRITE_COLOR = const(0x32)
+
+MADCTL_MH = const(0x04)  # Refresh 0=Left to Right, 1=Right to Left
+MADCTL_BGR = const(0x08)  # BGR color order
+MADCTL_ML = const(0x10)  # Refresh 0=Top to Bottom, 1=Bottom to Top
+
+MADCTL_MV = const(0x20)  # 0=Normal, 1=Row/column exchange
+MADCTL_MX = const(0x40)  # 0=Left to Right, 1=Right to Left
+MADCTL_MY = const(0x80)  # 0=Top to Bottom, 1=Bottom to Top
+
+# Longest single SPI DMA transaction on the ESP32-S3 (2^18 bits)
+_DMA_MAX_LEN = const(32768)
+# Chunk limit for frame buffers in PSRAM: DMA reads of PSRAM share the cache
+# with the CPU, shorter transactions keep one transfer from holding it for long
+_SPIRAM_CHUNK = const(16384)
+# DMA from PSRAM needs lengths in whole cache lines
+_CHUNK_ALIGN = const(64)
+
+_FLUSH_SPAN = profiler.span("flush")
+_FLUSH_BUS_SPAN = profiler.span("flushbus")  # flush call until the bus sent the last chunk
+
+_PSRAM_REGION = const(1048576)  # heap regions at least this big are PSRAM, internal RAM regions are smaller
+
+
+def flush_chunk_size(max_transfer, buffer_memory, bytes_per_pixel):
+    """Bytes per tx_color() transaction: as long as the bus allows, shorter for PSRAM
+    buffers, a multiple of the cache line and of the pixel size."""
+    limit = max_transfer
+    if buffer_memory & lcd_bus.MEMORY_SPIRAM:
+        limit = min(limit, _SPIRAM_CHUNK)
+    step = _CHUNK_ALIGN * bytes_per_pixel
+    return max(limit // step, 1) * step
+
+
+def internal_free():
+    """Free internal RAM in bytes, None when the heap can't be inspected (not on an ESP32)."""
+    try:
+        import esp32
+    except ImportError:
+        return None
+    return sum(free for total, free, _, _ in esp32.idf_heap_info(esp32.HEAP_DATA) if total < _PSRAM_REGION)
+
+
+def allocate_buffers(data_bus, width, height, bytes_per_pixel, strategy="auto", max_rows=48, min_rows=16,
+                     reserve=65536):
+    """Frame buffers for a buffer strategy:
+
+    - "double": two full frames in PSRAM
+    - "single": one full frame in PSRAM, LVGL waits for each flush before it renders on
+    - "partial": two strips in internal DMA RAM, as many rows (max_rows at most, a
+      multiple of 8) as fit while leaving reserve bytes of internal RAM free
+      (Wi-Fi and ESP-NOW need it)
+    - "full": double if both frames fit, else single
+    - "auto": partial if at least min_rows fit, else full
+
+    Returns (frame_buffer1, frame_buffer2, rows, memory flags, strategy used);
+    rows < height means the panel has to run in partial mode.
+    """
+    row_bytes = width * bytes_per_pixel
+    internal = lcd_bus.MEMORY_INTERNAL | lcd_bus.MEMORY_DMA
+
+    if strategy in ("auto", "partial"):
+        rows = max_rows
+        free = internal_free()
+        if free is not None:
+            rows = min(rows, (free - reserve) // (2 * row_bytes))
+        rows -= rows % 8
+        # The free total says nothing about fragmentation, step down until both strips fit
+        while rows >= min_rows:
+            fb1 = fb2 = None
+            try:
+                fb1 = data_bus.allocate_framebuffer(rows * row_bytes, internal)
+                fb2 = data_bus.allocate_framebuffer(rows * row_bytes, internal)
+                return fb1, fb2, rows, internal, "partial"
+            except MemoryError:
+                for fb in (fb1, fb2):
+                    if fb is not None:
+                        data_bus.free_framebuffer(fb)
+            rows -= 8
+        if strategy == "partial":
+            raise MemoryError(f'Unable to allocate {min_rows} partial rows in internal DMA RAM')
+
+    size = row_bytes * height
+    fb1 = data_bus.allocate_framebuffer(size, lcd_bus.MEMORY_SPIRAM)
+    if fb1 is None:
+        raise MemoryError(f'Unable to allocate memory for frame buffer ({size})')
+    fb2 = None
+    if strategy != "single":
+        try:
+            fb2 = data_bus.allocate_framebuffer(size, lcd_bus.MEMORY_SPIRAM)
+        except MemoryError:
+            if strategy == "double":
+                raise
+    return fb1, fb2, height, lcd_bus.MEMORY_SPIRAM, "double" if fb2 is not None else "single"
+
+
+class QSPIPanel(display_driver_framework.DisplayDriver):
+
+    _ORIENTATION_TABLE = (
+        0,
+        MADCTL_MV,
+        MADCTL_MX | MADCTL_MY,
+        MADCTL_MV | MADCTL_MX | MADCTL_MY
+    )
+
+    # COLMOD value per bytes per pixel
+    _PIXEL_FORMATS = {2: 0x55, 3: 0x66}
+
+    # Panel init after MADCTL and COLMOD: (command, parameter bytes or None, delay ms)
+    _INIT_TABLE = ()
+
+    # Panel starts a RAMWR at the RASET row, so partial flushes can send just their rows
+    _ROW_WINDOW = True
+
+    @staticmethod
+    def __quad_spi_cmd_modifier(cmd):
+        cmd <<= 8
+        cmd |= _WRITE_CMD << 24
+        return cmd
+
+    @staticmethod
+    def __quad_spi_color_cmd_modifier(cmd):
+        cmd <<= 8
+        cmd |= _WRITE_COLOR << 24
+        return cmd
+
+    @staticmethod
+    def __dummy_cmd_modifier(cmd):
+        return cmd
+
+    def __init__(
+            self,
+            data_bus,
+            display_width,
+            display_height,
+            frame_buffer1=None,
+            frame_buffer2=None,
+            reset_pin=None,
+            reset_state=STATE_HIGH,
+            power_pin=None,
+            power_on_state=STATE_HIGH,
+            backlight_pin=None,
+            backlight_on_state=STATE_HIGH,
+            offset_x=0,
+            offset_y=0,
+            color_byte_order=BYTE_ORDER_RGB,
+            color_space=lv.COLOR_FORMAT.RGB888,  # NOQA
+            rgb565_byte_swap=False,  # NOQA
+            partial=False,
+            partial_rows=48,
+            max_transfer=_DMA_MAX_LEN,
+            buffer_memory=None,
+            row_window=None,
+    ):
+        # partial=True: LVGL renders only the invalidated areas (widened to full rows) into
+        # strip buffers of up to partial_rows rows, and each flush sets a column and row window and
+        # sends just those rows. Otherwise every flush is a full frame from the top.
+        # row_window: whether the panel starts a RAMWR at the RASET row, see _round_area_cb().
+        # None takes the panel's _ROW_WINDOW.
+        # max_transfer is the longest transaction the SPI bus is set up for, buffer_memory the
+        # lcd_bus.MEMORY_* flags of buffers passed in (assumed PSRAM when not given).
+        self._partial = partial
+        self._row_window = self._ROW_WINDOW if row_window is None else row_window
+        num_lanes = data_bus.get_lane_count()
+
+        if isinstance(data_bus, lcd_bus.SPIBus) and num_lanes == 4:
+            self.__cmd_modifier = self.__quad_spi_cmd_modifier
+            self.__color_cmd_modifier = self.__quad_spi_color_cmd_modifier
+            _cmd_bits = 32
+
+            # we need to override the default handling for creating the frame
+            # buffer is using a quad spi bus. we don't want it to create
+            # partial buffers for the quad SPI display, unless partial mode asks for strips
+
+            if frame_buffer1 is None:
+                gc.collect()
+                frame_buffer1, frame_buffer2, _, buffer_memory, _ = allocate_buffers(
+                    data_bus,
+                    display_width,
+                    display_height,
+                    lv.color_format_get_size(color_space),
+                    "partial" if partial else "full",
+                    max_rows=partial_rows,
+                    min_rows=8,
+                )
+        else:
+            self.__cmd_modifier = self.__dummy_cmd_modifier
+            self.__color_cmd_modifier = self.__dummy_cmd_modifier
+            _cmd_bits = 8
+
+        # store these so we do not have to keep on converting them
+        self.__ramwr = self.__color_cmd_modifier(_RAMWR)
+        self.__ramwrc = self.__color_cmd_modifier(_RAMWRC)
+        self.__caset = self.__cmd_modifier(_CASET)
+        self.__raset = self.__cmd_modifier(_RASET)
+        self.__flush_ready_count = 0
+        self.__flush_chunks = 0  # chunks of the flush in progress
+        self.__flush_start = 0
+        # Last window sent, as (start << 16 | end). Unchanged windows (every full-frame flush)
+        # are not resent, that saves a blocking parameter transaction per flush.
+        self.__win_x = -1
+        self.__win_y = -1
+
+        if buffer_memory is None:
+            buffer_memory = lcd_bus.MEMORY_SPIRAM
+        self.buffer_memory = buffer_memory
+        self.chunk_size = flush_chunk_size(max_transfer, buffer_memory, lv.color_format_get_size(color_space))
+
+        # Counters
+        self.flushes = 0
+        self.flush_bytes = 0
+        self.last_flush_bytes = 0
+        self.flush_chunks = 0
+        self.window_skips = 0
+        self.flush_busy_us = 0  # flush calls until their last chunk was sent, in total
+        # Same for the last flush, set by _flush_ready_cb() and added to flush_busy_us on the next flush:
+        # the callback runs in the bus ISR, where a total grown past a small int could not be allocated
+        self.last_flush_us = 0
+        self.flushing = False
+
+        super().__init__(
+            data_bus,
+            display_width,
+            display_height,
+            frame_buffer1,
+            frame_buffer2,
+            reset_pin,
+            reset_state,
+            power_pin,
+            power_on_state,
+            backlight_pin,
+            backlight_on_state,
+            offset_x,
+            offset_y,
+            color_byte_order,
+            color_space,  # NOQA
+            # we don't need to sue RGB565 byte swap so we override it
+            rgb565_byte_swap,
+            _cmd_bits=_cmd_bits,
+            _param_bits=8,
+            _init_bus=True
+        )
+
+        if partial:
+            self._disp_drv.set_render_mode(lv.DISPLAY_RENDER_MODE.PARTIAL)
+            self._disp_drv.add_event_cb(self._round_area_cb, lv.EVENT.INVALIDATE_AREA, None)
+
+    def send_init_table(self):
+        """Send MADCTL and COLMOD, then the panel's init table. display_driver_framework's
+        init() imports the panel's _<module>_init.py, which calls this."""
+        param_buf = bytearray(1)
+
+        param_buf[0] = self._madctl(self._color_byte_order, self._ORIENTATION_TABLE)
+        self.set_params(_MADCTL, param_buf)
+
+        param_buf[0] = self._PIXEL_FORMATS[lv.color_format_get_size(self._color_space)]
+        self.set_params(_COLMOD, param_buf)
+
+        for cmd, params, delay_ms in self._INIT_TABLE:
+            self.set_params(cmd, params)
+            if delay_ms:
+                time.sleep_ms(delay_ms)
+
+    def _round_area_cb(self, e):
+        # Widen invalidated areas to full rows: a row band is one contiguous run of GRAM,
+        # written with RAMWR followed by RAMWRC continuations.
+        #
+        # The AXS15231B on QSPI is reported to ignore RASET for a RAMWR that starts below
+        # row 0 and to write from the top row instead, unless the write continues the
+        # previous one with RAMWRC (the vendor's esp_lcd driver sends RAMWRC for every
+        # strip that doesn't start at row 0). Not confirmed on our panel yet. On panels
+        # without a usable row window (_ROW_WINDOW / row_window False) an area that
+        # starts below row 0 is extended up to row 0, its bottom row stays: LVGL then
+        # sends it as strips from the top, the first with RAMWR at row 0 and every later
+        # one continuing it with RAMWRC. The rows above the change are the extra cost,
+        # nothing below it is sent. To check a panel, run with row_window=True
+        # (config.DISPLAY_ROW_WINDOW) and change something in the middle of the screen,
+        # e.g. the speed: it must not show up in the top rows.
+        area = lv.area_t.__cast__(e.get_param())
+        area.x1 = 0
+        area.x2 = self._disp_drv.get_horizontal_resolution() - 1
+        if not self._row_window:
+            area.y1 = 0
+
+    def flush_stats(self):
+        """Flush counters, e.g. for printing from the REPL."""
+        return {
+            "flushes": self.flushes,
+            "bytes": self.flush_bytes,
+            "avg_bytes": self.flush_bytes // self.flushes if self.flushes else 0,
+            "last_bytes": self.last_flush_bytes,
+            "chunk": self.chunk_size,
+            "chunks": self.flush_chunks,
+            "window_skips": self.window_skips,
+            "mb_s": self.flush_bytes / self.busy_us() if self.busy_us() else 0,
+        }
+
+    def busy_us(self):
+        """Total time from flush calls until their last chunk was sent, the last flush included."""
+        return self.flush_busy_us + self.last_flush_us
+
+    def measure_flush(self, timeout_ms=200):
+        """Redraw the whole screen now and return the flush throughput in MB/s (0 if nothing was flushed)."""
+        flush_bytes = self.flush_bytes
+        busy_us = self.busy_us()
+        lv.screen_active().invalidate()
+        lv.refr_now(self._disp_drv)
+        while self.flushing and timeout_ms > 0:
+            time.sleep_ms(1)
+            timeout_ms -= 1
+        busy_us = self.busy_us() - busy_us
+        return (self.flush_bytes - flush_bytes) / busy_us if busy_us else 0
+
+    def _flush_ready_cb(self, *_):
+        # a flush is sent in several chunks, flush ready is only called
+        # after the last chunk of the current flush has been sent.
+        self.__flush_ready_count += 1
+        # Runs in the bus ISR: only small ints here, nothing that could allocate
+        if self.__flush_ready_count == self.__flush_chunks:
+            us = time.ticks_diff(time.ticks_us(), self.__flush_start)
+            self.last_flush_us = us
+            self.__flush_ready_count = 0
+            self.flushing = False
+            self._disp_drv.flush_ready()
+            if profiler.enabled:
+                _FLUSH_BUS_SPAN.add(us)
+
+    def set_params(self, cmd, params=None):
+        # Any command (init, rotation) may change the window, send it again on the next flush
+        self.__win_x = -1
+        self.__win_y = -1
+        cmd = self.__cmd_modifier(cmd)
+        self._data_bus.tx_param(cmd, params)
+
+    def _set_memory_location(self, x1: int, y1: int, x2: int, y2: int):
+        return self._dummy_set_memory_location(x1, y1, x2, y2)
+
+    def _dummy_set_memory_location(self, x1: int, y1: int, x2: int, y2: int):
+        param_buf = self._param_buf  # NOQA
+
+        win_x = x1 << 16 | x2
+        if win_x != self.__win_x:
+            self.__win_x = win_x
+            param_buf[0] = (x1 >> 8) & 0xFF
+            param_buf[1] = x1 & 0xFF
+            param_buf[2] = (x2 >> 8) & 0xFF
+            param_buf[3] = x2 & 0xFF
+
+            self._data_bus.tx_param(self.__caset, self._param_mv)
+        else:
+            self.window_skips += 1
+
+        # Full frames send the row window too, once after init or a rotation changed the row count
+        win_y = y1 << 16 | y2
+        if win_y != self.__win_y:
+            self.__win_y = win_y
+            param_buf[0] = (y1 >> 8) & 0xFF
+            param_buf[1] = y1 & 0xFF
+            param_buf[2] = (y2 >> 8) & 0xFF
+            param_buf[3] = y2 & 0xFF
+
+            self._data_bus.tx_param(self.__raset, self._param_mv)
+
+    def _flush_cb(self, _, area, color_p):
+        t0 = time.ticks_us()
+        self.__flush_start = t0
+        self.flushing = True
+
+        # LVGL only flushes again after flush_ready(), so the previous flush is complete
+        self.flush_busy_us += self.last_flush_us
+        self.last_flush_us = 0
+
+        x1 = area.x1 + self._offset_x
+        x2 = area.x2 + self._offset_x
+
+        y1 = area.y1 + self._offset_y
+        y2 = area.y2 + self._offset_y
+
+        # Without a row window every area starts at row 0, so a strip below the top continues
+        # the previous one and the row range stays the whole screen, see _round_area_cb()
+        continued = False
+        if self._row_window:
+            self._set_memory_location(x1, y1, x2, y2)
+        else:
+            continued = area.y1 > 0
+            self._set_memory_location(x1, self._offset_y,
+                                      x2, self._offset_y + self._disp_drv.get_vertical_resolution() - 1)
+
+        width = x2 - x1 + 1
+        height = y2 - y1 + 1
+        size = width * height * lv.color_format_get_size(self._color_space)
+
+        data_view = color_p.__dereference__(size)
+
+        self.flushes += 1
+        self.flush_bytes += size
+        self.last_flush_bytes = size
+
+        # flush ready is signalled once every chunk of this flush has been sent
+        chunk_size = self.chunk_size
+        self.__flush_ready_count = 0
+        self.__flush_chunks = (size + chunk_size - 1) // chunk_size
+        self.flush_chunks += self.__flush_chunks
+        is_last = self._disp_drv.flush_is_last()
+
+        # Chunks are queued back to back, tx_color() only blocks while the bus queue is full,
+        # so the next chunk is waiting while the previous one is on the wire
+        remaining = size
+        offset = 0
+
+        while remaining > 0:
+            chunk_size = min(self.chunk_size, remaining)
+            chunk = data_view[offset:offset + chunk_size]
+            remaining -= chunk_size
+
+            cmd = self.__ramwr if offset == 0 and not continued else self.__ramwrc
+            self._data_bus.tx_color(cmd, chunk, x1, y1, x2, y2, self._rotation, is_last and not remaining)
+
+            offset += chunk_size
+
+        if profiler.enabled:
+            _FLUSH_SPAN.add(time.ticks_diff(time.ticks_us(), t0))
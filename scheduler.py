@@ -0,0 +1,115 @@
+import time
+
+
+class Task:
+    """A scheduled step function with its runtime statistics.
+
+    step() does one bounded piece of work and returns the number of ms until it
+    wants to run again (0 = as soon as possible).
+    """
+
+    def __init__(self, name, step, priority=0):
+        self.name = name
+        self.step = step
+        self.priority = priority
+        self.due = time.ticks_ms()
+
+        self.runs = 0
+        self.busy_us = 0
+        self.max_us = 0
+        self.max_late_ms = 0  # how long the task waited past its due time
+
+
+class Scheduler:
+    """Small cooperative scheduler for the main loop.
+
+    Of the tasks that are due, the one with the highest priority runs first, and
+    the due times are re-checked after every step, so a low-priority task only
+    gets the CPU when nothing more important is waiting. When nothing is due the
+    scheduler sleeps until the earliest due time (at most max_idle_ms).
+
+    run() is a plain blocking loop. run_async() does the same as a (u)asyncio
+    coroutine, so other asyncio tasks can share the CPU while it is idle.
+    """
+
+    def __init__(self, max_idle_ms=50):
+        self.tasks = []
+        self.max_idle_ms = max_idle_ms
+        self.running = False
+        self.idle_ms = 0
+        self._started = time.ticks_ms()
+
+    def add(self, name, step, priority=0):
+        task = Task(name, step, priority)
+        self.tasks.append(task)
+        # Stable sort: equal priorities keep the order they were added in
+        self.tasks.sort(key=lambda t: -t.priority)
+        return task
+
+    def remove(self, task):
+        """Stop running a task. Safe to call from a step, run_once() returns right after it."""
+        if task in self.tasks:
+            self.tasks.remove(task)
+
+    def run_once(self):
+        """Run the most important due task. Returns 0 if one ran, else the ms until the next one is due."""
+        now = time.ticks_ms()
+        wait = self.max_idle_ms
+        for task in self.tasks:
+            late = time.ticks_diff(now, task.due)
+            if late < 0:
+                if -late < wait:
+                    wait = -late
+                continue
+
+            start = time.ticks_us()
+            delay = task.step()
+            elapsed = time.ticks_diff(time.ticks_us(), start)
+            task.due = time.ticks_add(time.ticks_ms(), delay or 0)
+
+            task.runs += 1
+            task.busy_us += elapsed
+            if elapsed > task.max_us:
+                task.max_us = elapsed
+            if late > task.max_late_ms:
+                task.max_late_ms = late
+            return 0
+        return wait
+
+    def run(self):
+        self.running = True
+        while self.running:
+            wait = self.run_once()
+            if wait > 0:
+                self.idle_ms += wait
+                time.sleep_ms(wait)
+
+    async def run_async(self):
+        try:
+            import asyncio
+        except ImportError:
+            import uasyncio as asyncio
+
+        self.running = True
+        while self.running:
+            wait = self.run_once()
+            self.idle_ms += wait
+            # sleep(0) still yields to the other asyncio tasks
+            await asyncio.sleep(wait / 1000)
+
+    def stop(self):
+        self.running = False
+
+    def stats(self):
+        """Per-task (name, runs, busy ms, average us, max us, max late ms)."""
+        return [
+            (t.name, t.runs, t.busy_us // 1000, t.busy_us // t.runs if t.runs else 0, t.max_us, t.max_late_ms)
+            for t in self.tasks
+        ]
+
+    def print_stats(self):
+        uptime = time.ticks_diff(time.ticks_ms(), self._started)
+        print("Scheduler: up {} ms, idle {} ms".format(uptime, self.idle_ms))
+        for name, runs, busy_ms, avg_us, max_us, late_ms in self.stats():
+            print("  {:10} runs {:7}  busy {:6} ms  avg {:5} us  max {:6} us  late {:4} ms".format(
+                name, runs, busy_ms, avg_us, max_us, late_ms))
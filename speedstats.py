@@ -0,0 +1,188 @@
+"""
+Incremental speed statistics.
+
+Speeds come in as integer deci-knots (5.3 kn = 53) and are averaged into one
+sample per bucket_ms (1 s), whatever the GPS update rate. Buckets follow a
+fixed grid, a late update does not shift the ones after it, and every whole
+bucket without updates becomes a GAP sample that averages and maxima skip,
+so a window of N samples always spans N seconds. Samples go into one
+array('h') ring sized for the longest window. Every window keeps a running
+sum, so its average is O(1) per sample, and a monotonic deque of sample
+numbers (array('I')), so its maximum is amortised O(1) as well. Nothing is
+allocated per sample.
+"""
+
+import time
+from array import array
+
+WINDOWS = (10, 60, 600)  # seconds (samples): 10 s, 1 min, 10 min
+GAP = -1  # sample of a bucket without GPS updates
+
+
+class SpeedStats:
+    def __init__(self, windows=WINDOWS, bucket_ms=1000):
+        self.windows = windows
+        self.bucket_ms = bucket_ms
+        self.size = max(windows)
+        self.samples = array("h", bytes(2 * self.size))
+        self.count = 0  # samples ever added, the next sample's number
+
+        n = len(windows)
+        self.sums = array("i", bytes(4 * n))
+        self.valid = array("H", bytes(2 * n))  # samples in each window that are not GAP
+        # Per window: deque of sample numbers with decreasing speeds, front is the maximum
+        self._dq = [array("I", bytes(4 * w)) for w in windows]
+        self._dq_head = array("H", bytes(2 * n))
+        self._dq_len = array("H", bytes(2 * n))
+
+        self.session_max = 0  # highest single sample
+        self.best_sum = 0  # best running sum of the first window (best 10 s)
+
+        self._bucket_sum = 0
+        self._bucket_count = 0
+        self._bucket_start = None
+
+    def add(self, speed, now=None):
+        """Feed a speed in deci-knots. Returns the number of samples it completed (0 while
+        the bucket is still open): the bucket that ended and a GAP per empty bucket after it."""
+        if now is None:
+            now = time.ticks_ms()
+        added = 0
+        if self._bucket_start is None:
+            # Half a bucket early: updates at the bucket rate land mid-bucket, so jitter of
+            # up to half a bucket never moves one across a boundary
+            self._bucket_start = time.ticks_add(now, -(self.bucket_ms // 2))
+        else:
+            buckets = time.ticks_diff(now, self._bucket_start) // self.bucket_ms
+            if buckets > 0:
+                if self._bucket_count:
+                    self.add_sample(self._bucket_sum // self._bucket_count)
+                    added += 1
+                # Nearly a window full of gaps is as far as a long silence needs to go, and
+                # every sample of this call stays in the ring for sample()
+                for _ in range(min(buckets - 1, self.size - 1)):
+                    self.add_sample(GAP)
+                    added += 1
+                self._bucket_sum = 0
+                self._bucket_count = 0
+                # Step the grid by whole buckets, not to the (late) update
+                self._bucket_start = time.ticks_add(self._bucket_start, buckets * self.bucket_ms)
+        self._bucket_sum += speed
+        self._bucket_count += 1
+        return added
+
+    def add_sample(self, value):
+        """Add one complete sample (deci-knots, or GAP)."""
+        n = self.count
+        size = self.size
+        samples = self.samples
+        for i, w in enumerate(self.windows):
+            # Drop the sample leaving this window, before its slot is overwritten
+            if n >= w:
+                old = samples[(n - w) % size]
+                if old != GAP:
+                    self.sums[i] -= old
+                    self.valid[i] -= 1
+            if value != GAP:
+                self.sums[i] += value
+                self.valid[i] += 1
+
+            dq = self._dq[i]
+            head = self._dq_head[i]
+            length = self._dq_len[i]
+            if length and dq[head] <= n - w:
+                head = (head + 1) % w
+                length -= 1
+            while length and samples[dq[(head + length - 1) % w] % size] <= value:
+                length -= 1
+            dq[(head + length) % w] = n
+            self._dq_head[i] = head
+            self._dq_len[i] = length + 1
+
+        samples[n % size] = value
+        self.count = n + 1
+
+        if value > self.session_max:
+            self.session_max = value
+        if self.valid[0] == self.windows[0] and self.sums[0] > self.best_sum:
+            self.best_sum = self.sums[0]
+
+    def filled(self, i):
+        """Samples currently in window i, gaps included."""
+        return min(self.count, self.windows[i])
+
+    def average(self, i):
+        """Average of window i in deci-knots (float) over its samples that are not gaps, 0 without any."""
+        n = self.valid[i]
+        return self.sums[i] / n if n else 0
+
+    def maximum(self, i):
+        """Maximum of window i in deci-knots, 0 without samples."""
+        if not self._dq_len[i]:
+            return 0
+        return max(self.samples[self._dq[i][self._dq_head[i]] % self.size], 0)
+
+    def best(self):
+        """Best average over the first window (best 10 s) in deci-knots."""
+        return self.best_sum / self.windows[0]
+
+    def latest(self):
+        return self.samples[(self.count - 1) % self.size] if self.count else 0
+
+    def sample(self, n):
+        """Sample number n, one of the last `size` (e.g. the ones the last add() completed)."""
+        return self.samples[n % self.size]
+
+    def summary(self):
+        """Knots, for printing from the REPL."""
+        out = {}
+        for i, w in enumerate(self.windows):
+            out["avg_{}s".format(w)] = self.average(i) / 10
+            out["max_{}s".format(w)] = self.maximum(i) / 10
+        out["session_max"] = self.session_max / 10
+        out["best_{}s".format(self.windows[0])] = self.best() / 10
+        return out
+
+
+class SpeedHistory:
+    """Chart history at several resolutions, so switching the chart's time window is instant.
+
+    Level l keeps the last `points` averages of steps[l] one-second samples each
+    (with points=300 and steps (1, 6, 24): 5 min, 30 min and 2 h). Each level is
+    an array('h') ring written in place, the slot of point k is k % points.
+    Gaps are left out of the averages, a point with only gaps is GAP.
+    """
+
+    def __init__(self, points=300, steps=(1, 6, 24)):
+        self.points = points
+        self.steps = steps
+        n = len(steps)
+        self.levels = [array("h", bytes(2 * points)) for _ in steps]
+        self.counts = array("I", bytes(4 * n))  # points written per level
+        self._sums = array("i", bytes(4 * n))
+        self._fill = array("H", bytes(2 * n))
+        self._valid = array("H", bytes(2 * n))
+
+    def add(self, value):
+        """Add a one-second sample (or GAP). Returns a bitmask of the levels that got a new point."""
+        changed = 0
+        for level, step in enumerate(self.steps):
+            if value != GAP:
+                self._sums[level] += value
+                self._valid[level] += 1
+            self._fill[level] += 1
+            if self._fill[level] == step:
+                slot = self.counts[level] % self.points
+                valid = self._valid[level]
+                self.levels[level][slot] = self._sums[level] // valid if valid else GAP
+                self.counts[level] += 1
+                self._sums[level] = 0
+                self._fill[level] = 0
+                self._valid[level] = 0
+                changed |= 1 << level
+        return changed
+
+    def last_slot(self, level):
+        """Slot of the newest point of a level, -1 if it has none yet."""
+        count = self.counts[level]
+        return (count - 1) % self.points if count else -1
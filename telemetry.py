@@ -0,0 +1,189 @@
+import struct
+import time
+
+# Binary telemetry frame, version 1 (little endian, 20 bytes):
+#   magic u8, version u8, sequence u16,
+#   speed u16 (knots * 100), course u16 (degrees * 100), compass sector u8 (0 = N ... 15 = NNW),
+#   fix status u8, satellites in use u8, flags u8,
+#   latitude i32 (degrees * 1e7), longitude i32 (degrees * 1e7)
+FRAME_MAGIC = 0xA5
+FRAME_VERSION = 1
+FRAME_FORMAT = "<BBHHHBBBBii"
+FRAME_SIZE = struct.calcsize(FRAME_FORMAT)
+
+FLAG_VALID = 0x01
+
+TEXT = "text"
+BINARY = "binary"
+
+
+def compass_sector(course):
+    """Index of the 16-point compass direction for a course in degrees, 0 = N, 4 = E, ..."""
+    return int((course + 11.25) // 22.5) % 16
+
+
+def signed_degrees(ddm):
+    """Convert MicropyGPS [degrees, minutes, hemisphere] to signed decimal degrees."""
+    value = ddm[0] + ddm[1] / 60
+    return -value if ddm[2] in ("S", "W") else value
+
+
+def encode_frame(buf, sequence, speed, course, latitude, longitude, fix_stat, satellites, valid):
+    """Pack one telemetry frame into buf (at least FRAME_SIZE bytes) without allocating."""
+    struct.pack_into(
+        FRAME_FORMAT,
+        buf,
+        0,
+        FRAME_MAGIC,
+        FRAME_VERSION,
+        sequence & 0xFFFF,
+        min(int(speed * 100 + 0.5), 0xFFFF),
+        int(course * 100 + 0.5) % 36000,
+        compass_sector(course),
+        fix_stat & 0xFF,
+        satellites & 0xFF,
+        FLAG_VALID if valid else 0,
+        int(round(latitude * 10000000)),
+        int(round(longitude * 10000000)),
+    )
+    return buf
+
+
+def decode_frame(data):
+    """Unpack a telemetry frame into a dict. Raises ValueError for anything that is not a v1 frame."""
+    if len(data) < FRAME_SIZE:
+        raise ValueError("frame too short")
+    (magic, version, sequence, speed, course, sector, fix_stat, satellites, flags,
+     latitude, longitude) = struct.unpack_from(FRAME_FORMAT, data, 0)
+    if magic != FRAME_MAGIC or version != FRAME_VERSION:
+        raise ValueError("not a telemetry frame")
+    return {
+        "sequence": sequence,
+        "speed": speed / 100,
+        "course": course / 100,
+        "sector": sector,
+        "fix_stat": fix_stat,
+        "satellites": satellites,
+        "valid": bool(flags & FLAG_VALID),
+        "latitude": latitude / 10000000,
+        "longitude": longitude / 10000000,
+    }
+
+
+class TelemetryPublisher:
+    """Rate-limited, change-driven publisher on top of ESPNowMessenger.
+
+    Telemetry goes to messenger.destinations, so in broadcast mode the broadcast
+    address is treated as a single peer. A peer is only sent the telemetry when the values differ from what that peer
+    last received, or when its heartbeat interval has passed. Frames to the same
+    peer are never closer together than min_interval_ms, so a peer that keeps
+    timing out cannot stall the main loop on every iteration.
+
+    With the messenger's send queue a peer only counts as having the values
+    once pump() sent its last waiting frame (messenger.on_sent), so a frame
+    that never left does not hold back the next update until the heartbeat.
+
+    fmt selects the wire format: TEXT sends one "topic:value" frame per topic
+    (what existing receivers understand), BINARY sends a single packed frame
+    carrying every field, built once per update in a reused buffer.
+    """
+
+    def __init__(self, messenger, heartbeat_ms=5000, min_interval_ms=200, fmt=TEXT):
+        self.messenger = messenger
+        self.heartbeat_ms = heartbeat_ms
+        self.min_interval_ms = min_interval_ms
+        self.fmt = fmt
+        self._peer_values = {}  # mac -> values tuple the peer last received
+        self._peer_sent = {}  # mac -> ticks_ms of the last send attempt
+        self._peer_queued = {}  # mac -> values waiting in the messenger's send queue
+        messenger.on_sent = self._frame_sent
+
+        self._frame = bytearray(FRAME_SIZE)
+        self.sequence = 0
+
+        # Counters (frames, one per topic in text format)
+        self.frames_sent = 0
+        self.frames_suppressed = 0
+        self.send_errors = 0
+
+    def publish_gps(self, gps):
+        """Publish the current state of a MicropyGPS parser in the configured format."""
+        if self.fmt == BINARY:
+            return self.publish((
+                gps.speed[0],
+                gps.course,
+                signed_degrees(gps._latitude),
+                signed_degrees(gps._longitude),
+                gps.fix_stat,
+                gps.satellites_in_use,
+                gps.valid,
+            ))
+        return self.publish((
+            ("speedometer/speed", "{:.1f}".format(gps.speed[0])),
+            ("speedometer/compass", gps.compass_direction()),
+        ))
+
+    def publish(self, values):
+        """Offer the current telemetry to every registered peer. In text format values is a tuple of
+        (topic, value) pairs, in binary format the arguments of encode_frame() after the sequence number.
+        Returns the number of frames sent or queued."""
+        now = time.ticks_ms()
+        binary = self.fmt == BINARY
+        frames = 1 if binary else len(values)
+        encoded = False
+        sent = 0
+        sent_now = 0
+        for mac in self.messenger.destinations:
+            last = self._peer_sent.get(mac)
+            if last is not None:
+                elapsed = time.ticks_diff(now, last)
+                if elapsed < self.min_interval_ms or (
+                    elapsed < self.heartbeat_ms and self._peer_values.get(mac) == values
+                ):
+                    self.frames_suppressed += frames
+                    continue
+
+            # Count the attempt even if it fails, so a failing peer waits out the minimum interval
+            self._peer_sent[mac] = now
+            queued = False
+            try:
+                if binary:
+                    # One frame (and sequence number) per update, shared by every peer
+                    if not encoded:
+                        self.sequence = (self.sequence + 1) & 0xFFFF
+                        encode_frame(self._frame, self.sequence, *values)
+                        encoded = True
+                    if self.messenger.send_raw(mac, self._frame):
+                        sent_now += 1
+                    else:
+                        queued = True
+                    sent += 1
+                else:
+                    for topic, value in values:
+                        if self.messenger.send_to(mac, topic, value):
+                            sent_now += 1
+                        else:
+                            queued = True
+                        sent += 1
+            except OSError as e:
+                self.send_errors += 1
+                if getattr(e, "errno", None) == 116:
+                    print("ESP-NOW send timeout (ETIMEDOUT)")
+                else:
+                    print("ESP-NOW send error:", e)
+                continue
+            if queued:
+                self._peer_queued[mac] = values
+            else:
+                self._peer_values[mac] = values
+
+        self.frames_sent += sent_now
+        return sent
+
+    def _frame_sent(self, mac):
+        # pump() sent a queued frame, the peer has the values once none is left for it
+        self.frames_sent += 1
+        if not self.messenger.pending(mac):
+            values = self._peer_queued.pop(mac, None)
+            if values is not None:
+                self._peer_values[mac] = values
@@ -0,0 +1,90 @@
+"""
+Boot-time and free-heap comparison of the application modules as source (.py)
+and as precompiled bytecode (.mpy), on the unix MicroPython port.
+
+Compiles the modules with tools/build_mpy.py, then imports them in a fresh
+micropython process per run (tools/boot_probe.py), once from the source tree
+and once from the .mpy directory, and reports per module the median import
+time, the heap allocated during the import (the compiler's working memory
+included) and the heap the module keeps, plus the free heap after importing
+everything. Hardware modules come from tools/fakes.
+
+Usage:
+    python tools/bench_boot.py [--micropython micropython] [--mpy-cross mpy-cross] [--runs 5] [-O 1]
+
+The unix port has to be the same MicroPython version as mpy-cross. The times
+are for the host CPU: expect the device to be slower by a large factor, but the
+ratio and the heap numbers carry over.
+
+Unverified: neither this script nor boot_probe.py has been run yet, no unix port
+was at hand, so there are no before/after numbers. Only the build_mpy.py step is
+checked (mpy-cross 1.29: 145 KB of source to 39 KB of bytecode).
+"""
+
+import argparse
+import os
+import subprocess
+import tempfile
+
+import build_mpy
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+FAKES_DIR = os.path.join(TOOLS_DIR, 'fakes')
+PROBE = os.path.join(TOOLS_DIR, 'boot_probe.py')
+
+# The modules main.py imports before the first frame, then the ones that come up after it
+MODULES = ('boottrace', 'profiler', 'scheduler', 'microGPS', 'speedstats', 'display', 'qspi_panel',
+           'axs15231b', 'telemetry', 'espnow_manager', 'tracklog')
+
+
+def probe(micropython, module_dir, runs):
+    """{module: (us, allocated, kept)} medians over runs, and the median free heap."""
+    samples = {}
+    free = []
+    for _ in range(runs):
+        try:
+            out = subprocess.run([micropython, PROBE, module_dir, FAKES_DIR] + list(MODULES),
+                                 check=True, capture_output=True, text=True).stdout
+        except FileNotFoundError:
+            raise SystemExit('{} not found, build the unix port (ports/unix) or pass --micropython'.format(micropython))
+        for line in out.splitlines():
+            parts = line.split()
+            if parts[0] == 'free':
+                free.append(int(parts[1]))
+            else:
+                samples.setdefault(parts[0], []).append(tuple(int(p) for p in parts[1:]))
+
+    def median(values):
+        return sorted(values)[len(values) // 2]
+
+    result = {name: tuple(median([s[i] for s in values]) for i in range(3)) for name, values in samples.items()}
+    return result, median(free)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--micropython', default='micropython', help='unix port executable')
+    parser.add_argument('--mpy-cross', help='path to the mpy-cross executable')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('-O', dest='opt', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as mpy_dir:
+        build_mpy.build(mpy_dir, args.opt, args.mpy_cross, MODULES)
+        source, source_free = probe(args.micropython, build_mpy.ROOT_DIR, args.runs)
+        compiled, compiled_free = probe(args.micropython, mpy_dir, args.runs)
+
+    print(f"{'module':16} {'py us':>8} {'mpy us':>8} {'py alloc':>9} {'mpy alloc':>9} {'py kept':>8} {'mpy kept':>8}")
+    totals = [0] * 6
+    for name in MODULES:
+        row = source[name] + compiled[name]
+        py_us, py_alloc, py_kept, mpy_us, mpy_alloc, mpy_kept = row
+        print(f"{name:16} {py_us:8} {mpy_us:8} {py_alloc:9} {mpy_alloc:9} {py_kept:8} {mpy_kept:8}")
+        totals = [t + v for t, v in zip(totals, (py_us, mpy_us, py_alloc, mpy_alloc, py_kept, mpy_kept))]
+    print(f"{'total':16} {totals[0]:8} {totals[1]:8} {totals[2]:9} {totals[3]:9} {totals[4]:8} {totals[5]:8}")
+    print(f"free heap after all imports: source {source_free}, mpy {compiled_free}"
+          f" ({compiled_free - source_free:+d} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Redraw cost of the main loop's UI updates, against the stub lvgl in tools/fakes.
+
+Simulates a 100 Hz main loop fed by a 1 Hz GPS for a minute, on the speed
+screen and on the GPS screen, the way main.py drives DisplayUI before and after
+the screen/data split:
+
+- rebuild: show_gps_screen() every iteration (a screen_load each time)
+- refresh: update_gps_info() when the parser took in new sentences
+
+and reports invalidated area, frames LVGL would render, set_text calls and the
+modelled flush time per second at the configured QSPI clock, for full-frame
+flushes (full frame buffers) and for partial mode (strip buffers, see
+DISPLAY_BUFFERS), which only sends the invalidated areas. Partial bytes are a
+lower bound: the driver widens areas to full rows, and up to row 0 where the
+panel has no row window (the AXS15231B default, see DISPLAY_ROW_WINDOW).
+
+Usage:
+    python tools/bench_display.py [--seconds 60] [--loop-hz 100]
+"""
+
+import argparse
+
+import host
+
+host.install()
+
+import lvgl as lv  # NOQA  (tools/fakes/lvgl.py)
+from display import DisplayUI  # NOQA
+
+QSPI_HZ = 40000000
+BYTES_PER_PX = 2
+FRAME_PX = 320 * 480
+
+
+def flush_ms(px):
+    # 4 data lines, one byte per two clocks
+    return px * BYTES_PER_PX * 2 / QSPI_HZ * 1000
+
+
+def run(strategy, screen, seconds, loop_hz):
+    lv.reset_stats()
+    ui = DisplayUI()
+    if screen == 'gps':
+        ui.show_gps_screen()
+    lv.task_handler()
+    lv.reset_stats()
+
+    sentences = 0
+    refreshed = -1
+    for i in range(seconds * loop_hz):
+        if i % loop_hz == 0:
+            sentences += 3  # RMC, VTG, GGA
+        fix = i // loop_hz
+        speed = 5 + (fix % 7) / 10
+        lat, lon = 43.2965 + fix / 100000, 5.3698
+        ui.set_display_text("{:.1f}".format(speed))
+        ui.set_compass_text("{:.0f}°".format(90 + fix % 3))
+        ui.update_chart(int(speed * 10))
+        lv.task_handler()
+        if ui.active_screen == 1:
+            if strategy == 'rebuild':
+                ui.show_gps_screen(lat, lon, satellites_in_use=8, fix_stat=1)
+            elif sentences != refreshed:
+                refreshed = sentences
+                ui.update_gps_info(lat, lon, satellites_in_use=8, fix_stat=1)
+        lv.task_handler()
+    return dict(lv.stats), ui
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=int, default=60)
+    parser.add_argument('--loop-hz', type=int, default=100)
+    args = parser.parse_args()
+
+    print(f"{'screen':7} {'strategy':8} {'kpx/s':>9} {'frames/s':>9} {'loads/s':>8} {'set_text/s':>10}"
+          f" {'skipped/s':>9} {'full KB/fr':>10} {'full ms/s':>9} {'part KB/fr':>10} {'part ms/s':>9}")
+    for screen in ('speed', 'gps'):
+        for strategy in ('rebuild', 'refresh'):
+            stats, ui = run(strategy, screen, args.seconds, args.loop_hz)
+            per_s = 1 / args.seconds
+            print(f"{screen:7} {strategy:8} {stats['invalidated_px'] * per_s / 1000:9.1f}"
+                  f" {stats['frames'] * per_s:9.1f} {stats['screen_loads'] * per_s:8.1f}"
+                  f" {stats['set_text'] * per_s:10.1f} {ui.labels_skipped * per_s:9.1f}"
+                  f" {FRAME_PX * BYTES_PER_PX / 1024:10.1f} {flush_ms(FRAME_PX * stats['frames']) * per_s:9.1f}"
+                  f" {stats['flushed_px'] * BYTES_PER_PX / 1024 / max(stats['frames'], 1):10.1f}"
+                  f" {flush_ms(stats['flushed_px']) * per_s:9.1f}")
+
+
+if __name__ == "__main__":
+    main()
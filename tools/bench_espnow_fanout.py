@@ -0,0 +1,124 @@
+"""
+ESP-NOW fan-out benchmark on the host, using the fake espnow module in tools/fakes.
+
+Publishes the same GPS updates through TelemetryPublisher to 1..N peers in
+unicast mode, through the non-blocking send queue, and in broadcast mode (plain,
+group frame, group frame with auth tag) and reports frames on air, modelled
+radio time per update, how long the main loop was blocked on the radio per
+update (sync unicast waits for every ACK, out-of-range peers wait for the
+timeout) and host CPU time per update. Also checks that every receiver in range
+got the telemetry: all of it, and in queued mode at least the latest frames
+(a frame still waiting may be replaced by a newer one for the same peer), with
+the publisher counting only frames that actually left.
+
+Usage:
+    python tools/bench_espnow_fanout.py [--updates 500] [--peers 1 2 4 8] [--offline 1]
+"""
+
+import argparse
+import time
+
+import host
+
+host.install()
+
+import espnow  # NOQA  (tools/fakes/espnow.py)
+import espnow_manager  # NOQA
+from telemetry import TelemetryPublisher, BINARY, TEXT  # NOQA
+
+KEY = b'sailscreen'
+GROUP = 7
+
+# name -> (ESPNowMessenger options)
+MODES = (
+    ('unicast', {}),
+    ('unicast queued', {'queue_size': 8}),
+    ('broadcast', {'broadcast': True}),
+    ('broadcast group', {'broadcast': True, 'group': GROUP}),
+    ('broadcast group+tag', {'broadcast': True, 'group': GROUP, 'key': KEY}),
+)
+
+
+class FakeGPS:
+    def __init__(self):
+        self.speed = [0.0, 0.0, 0.0]
+        self.course = 0.0
+        self._latitude = [43, 17.79, 'N']
+        self._longitude = [5, 22.19, 'E']
+        self.fix_stat = 1
+        self.satellites_in_use = 8
+        self.valid = True
+
+    def step(self, i):
+        self.speed[0] = 5 + (i % 20) / 10
+        self.course = (i * 3) % 360
+        self._latitude[1] = 17.79 + i / 100000
+
+    def compass_direction(self):
+        return 'N'
+
+
+def macs(count):
+    return [bytes((0x24, 0x0a, 0xc4, 0x10, 0x00, i + 1)) for i in range(count)]
+
+
+def run(mode_options, fmt, peers, offline, updates):
+    in_range = macs(peers)[:peers - offline] if offline < peers else []
+    espnow.reset(in_range)
+    espnow_manager.load_peers = lambda: [':'.join(f'{b:02X}' for b in mac) for mac in macs(peers)]
+    messenger = espnow_manager.ESPNowMessenger(**mode_options)
+    # Every update is a change, heartbeat/min interval out of the way
+    publisher = TelemetryPublisher(messenger, heartbeat_ms=0, min_interval_ms=-1, fmt=fmt)
+    gps = FakeGPS()
+
+    start = time.perf_counter()
+    for i in range(updates):
+        gps.step(i)
+        publisher.publish_gps(gps)
+        # 10 Hz fixes, 100 Hz main loop: ten pump() calls per update
+        for _ in range(10):
+            messenger.pump()
+    elapsed = time.perf_counter() - start
+    while messenger.pump():
+        pass
+    if messenger.queue_size:
+        assert publisher.frames_sent == messenger.frames_sent, (publisher.frames_sent, messenger.frames_sent)
+
+    group = mode_options.get('group')
+    for mac in in_range:
+        frames = espnow.receivers[mac]
+        if group is not None:
+            frames = [espnow_manager.open_group_frame(frame, group, mode_options.get('key')) for frame in frames]
+        expected = updates * (1 if fmt == BINARY else 2)
+        if mode_options.get('queue_size'):
+            assert 0 < len(frames) <= expected, (mac, len(frames), expected)
+            last = espnow.receivers[in_range[0]][-1]
+            assert espnow.receivers[mac][-1] == last, (mac, 'missed the latest frame')
+        else:
+            assert len(frames) == expected and None not in frames, (mac, len(frames), expected)
+    return messenger, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--updates', type=int, default=500)
+    parser.add_argument('--peers', type=int, nargs='*', default=[1, 2, 4, 8])
+    parser.add_argument('--offline', type=int, default=0, help='peers out of range (unicast waits for the timeout)')
+    args = parser.parse_args()
+
+    for fmt in (TEXT, BINARY):
+        print(f"format {fmt}, {args.updates} updates, {args.offline} peer(s) offline")
+        print(f"  {'mode':22} {'peers':>5} {'frames/upd':>10} {'B/upd':>7} {'radio ms/upd':>12}"
+              f" {'blocked ms/upd':>14} {'cpu us/upd':>10}  queue drops/backoff drops")
+        for peers in args.peers:
+            for name, options in MODES:
+                messenger, elapsed = run(options, fmt, peers, min(args.offline, peers), args.updates)
+                e = messenger.e
+                drops = f"{messenger.queue_drops}/{messenger.backoff_drops}" if messenger.queue_size else '-'
+                print(f"  {name:22} {peers:5} {e.frames / args.updates:10.1f} {e.bytes / args.updates:7.1f}"
+                      f" {e.radio_us / args.updates / 1000:12.2f} {e.blocked_us / args.updates / 1000:14.2f}"
+                      f" {elapsed / args.updates * 1e6:10.1f}  {drops}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Flush throughput of the quad-SPI panel drivers (qspi_panel.py) on the host,
+against the modelled lcd_bus in tools/fakes.
+
+Runs the driver's real _flush_cb() for full frames (the default mode), for a
+partial-mode update of 100 rows (the speed digits, sent as PARTIAL_ROWS strips)
+and for the same update on a panel without a row window (strips: rows 0 to the
+last changed row in PARTIAL_ROWS strips, each continuing the last with RAMWRC,
+see qspi_panel._round_area_cb) with different chunk sizes and bus queue depths:
+
+- fixed 10 KB: the old fixed chunk size
+- PSRAM: chunks sized for frame buffers in PSRAM
+- internal: chunks sized for internal DMA RAM, up to the longest DMA transaction
+
+and reports, in modelled bus time, throughput in MB/s, the latency from the
+flush call to flush_ready(), how long the flush call itself kept the CPU
+(waiting for the bus queue or a parameter transaction) and transactions per
+flush. It also checks each flush starts with RAMWR, or RAMWRC where a strip
+continues the previous one. Queue depth 1 is a bus that can't accept the next
+chunk while one is in flight, so every chunk pays the full setup time.
+
+Usage:
+    python tools/bench_flush.py [--panel axs15231b] [--flushes 50] [--depths 1 10] [--freq 40000000]
+"""
+
+import argparse
+
+import host
+
+host.install()
+
+import lcd_bus  # NOQA  (tools/fakes/lcd_bus.py)
+import lvgl as lv  # NOQA  (tools/fakes/lvgl.py)
+import axs15231b  # NOQA
+
+PANELS = {
+    'axs15231b': axs15231b.AXS15231B,
+}
+
+WIDTH = 320
+HEIGHT = 480
+PARTIAL_ROWS = 48
+DIRTY_ROWS = (100, 199)
+
+RAMWR = 0x2C
+RAMWRC = 0x3C
+
+# name -> driver options
+CHUNKING = (
+    ('fixed 10 KB', {'max_transfer': 10 * 1024, 'buffer_memory': lcd_bus.MEMORY_INTERNAL}),
+    ('PSRAM', {'buffer_memory': lcd_bus.MEMORY_SPIRAM}),
+    ('internal', {'buffer_memory': lcd_bus.MEMORY_INTERNAL | lcd_bus.MEMORY_DMA}),
+)
+
+
+class _ColorPointer:
+    def __init__(self, buf):
+        self.mv = memoryview(buf)
+
+    def __dereference__(self, size):
+        return self.mv[:size]
+
+
+def areas(mode):
+    if mode == 'full':
+        return [lv.area_t(0, 0, WIDTH - 1, HEIGHT - 1)]
+    # Without a row window the driver extends the dirty rows up to row 0
+    first, last = DIRTY_ROWS if mode == 'partial' else (0, DIRTY_ROWS[1])
+    out = []
+    y = first
+    while y <= last:
+        y2 = min(y + PARTIAL_ROWS - 1, last)
+        out.append(lv.area_t(0, y, WIDTH - 1, y2))
+        y = y2 + 1
+    return out
+
+
+def run(panel, mode, options, depth, freq, flushes):
+    bus = lcd_bus.SPIBus(freq=freq, quad=True, queue_depth=depth)
+    partial = mode != 'full'
+    fb = bytearray(WIDTH * (PARTIAL_ROWS if partial else HEIGHT) * 2)
+    display = panel(bus, WIDTH, HEIGHT, frame_buffer1=fb, color_space=lv.COLOR_FORMAT.RGB565,
+                  partial=partial, partial_rows=PARTIAL_ROWS, row_window=mode != 'strips', **options)
+    color = _ColorPointer(fb)
+    drv = display._disp_drv
+    bus.reset()
+
+    # Command of every color transaction, without the quad SPI framing
+    commands = []
+    tx_color = bus.tx_color
+
+    def record(cmd, *args):
+        commands.append(cmd >> 8 & 0xFF)
+        tx_color(cmd, *args)
+
+    bus.tx_color = record
+
+    latency = cpu = 0
+    n = 0
+    for _ in range(flushes):
+        update = areas(mode)
+        for i, area in enumerate(update):
+            drv.last = i == len(update) - 1
+            ready = drv.ready
+            start = bus.now
+            del commands[:]
+            display._flush_cb(None, area, color)
+            first = RAMWRC if mode == 'strips' and area.y1 else RAMWR
+            assert commands == [first] + [RAMWRC] * (len(commands) - 1), 'wrong write command'
+            cpu += bus.now - start
+            # LVGL waits for flush_ready() before it flushes the next area
+            bus.wait_idle()
+            assert drv.ready == ready + 1, 'flush_ready() not called exactly once'
+            latency += bus.done_at - start
+            n += 1
+    return {
+        'chunk': display.chunk_size,
+        'mb_s': bus.bytes / bus.now,  # bytes per us = MB/s
+        'latency_us': latency / n,
+        'cpu_us': cpu / n,
+        'tx': (bus.color_tx + bus.param_tx) / n,
+        'kb': bus.bytes / n / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--panel', choices=sorted(PANELS), default='axs15231b')
+    parser.add_argument('--flushes', type=int, default=50)
+    parser.add_argument('--depths', type=int, nargs='+', default=[1, 10])
+    parser.add_argument('--freq', type=int, default=40000000)
+    args = parser.parse_args()
+
+    wire = args.freq * 4 / 8 / 1000000
+    print(f"{args.panel}, QSPI {args.freq / 1000000:.0f} MHz, wire rate {wire:.1f} MB/s")
+    print(f"{'mode':7} {'chunking':12} {'chunk':>6} {'depth':>5} {'KB/flush':>8} {'MB/s':>6} {'latency us':>10}"
+          f" {'cpu us':>7} {'tx/flush':>8}")
+    for mode in ('full', 'partial', 'strips'):
+        for name, options in CHUNKING:
+            for depth in args.depths:
+                r = run(PANELS[args.panel], mode, options, depth, args.freq, args.flushes)
+                print(f"{mode:7} {name:12} {r['chunk']:6} {depth:5} {r['kb']:8.1f} {r['mb_s']:6.2f}"
+                      f" {r['latency_us']:10.0f} {r['cpu_us']:7.0f} {r['tx']:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
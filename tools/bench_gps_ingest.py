@@ -0,0 +1,172 @@
+"""
+Compare MicropyGPS.update() (one character per call, as main.py used to do) with
+MicropyGPS.update_bytes() (whole UART chunks) on CPython.
+
+Usage:
+    python tools/bench_gps_ingest.py [recorded.nmea ...] [--chunk 256] [--fuzz 200]
+
+Without arguments a synthetic 10 Hz multi-constellation log is used.
+
+Before that, --fuzz cases feed a short synthetic log with random line noise,
+broken checksums and cut sentences, in random chunk sizes, through update()
+and update_bytes() with and without sentence filters, buffered and not, and
+check both paths end with the same state, sentence counters and parsed types.
+
+Memory churn is reported as the tracemalloc peak above the baseline while a
+sentence is being assembled, averaged per sentence, with the sentence parsers
+stubbed out so only the assembly itself is measured.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from microGPS import MicropyGPS  # NOQA
+import nmea_synth  # NOQA
+
+# Attributes that must match between the two ingestion paths
+STATE_FIELDS = ('crc_fails', 'clean_sentences', 'parsed_sentences', 'timestamp', 'date', '_latitude',
+                '_longitude', 'speed', 'course', 'altitude', 'geoid_height', 'satellites_in_view',
+                'satellites_in_use', 'satellites_used', 'satellite_data', 'hdop', 'pdop', 'vdop', 'valid',
+                'fix_stat', 'fix_type')
+
+# Checked by the fuzz cases as well, they depend on where filtered sentences and noise are skipped
+COUNTER_FIELDS = ('skipped_sentences', 'skipped_bytes', 'char_count')
+
+# Sentence filters the fuzz cases pick from
+FILTERS = (None, ('RMC',), ('GGA', 'GSA'), ('GNRMC', 'VTG', 'GSV'))
+
+
+def state_of(gps):
+    return {name: getattr(gps, name) for name in STATE_FIELDS}
+
+
+class AssemblyOnlyGPS(MicropyGPS):
+    """Parser with every sentence handler replaced by a no-op, leaving only sentence assembly"""
+    supported_sentences = {name: (lambda gps: True) for name in MicropyGPS.supported_sentences}
+
+
+def run_chars(data, buffered=False):
+    gps = MicropyGPS(buffered=buffered)
+    update = gps.update
+    start = time.perf_counter()
+    for byte in data:
+        update(chr(byte))
+    return gps, time.perf_counter() - start
+
+
+def run_bytes(data, chunk, buffered=False):
+    gps = MicropyGPS(buffered=buffered)
+    rx_buf = bytearray(chunk)
+    rx_mv = memoryview(rx_buf)
+    start = time.perf_counter()
+    for offset in range(0, len(data), chunk):
+        # Emulate uart.readinto(): copy into the reused buffer and hand over a view
+        part = data[offset:offset + chunk]
+        rx_buf[:len(part)] = part
+        gps.update_bytes(rx_mv[:len(part)])
+    return gps, time.perf_counter() - start
+
+
+def fuzz(cases, seed=0):
+    """Compare update() and update_bytes() on noisy input, returns the failed case or None"""
+    rng = random.Random(seed)
+    base = nmea_synth.stream(5, 10, 'GN')
+    for case in range(cases):
+        data = nmea_synth.noise(base, rng.choice((0.001, 0.01, 0.1)), seed=case)
+        if rng.random() < 0.5:
+            data = nmea_synth.corrupt_crc(data, rng.randrange(3, 10), seed=case)
+        if rng.random() < 0.5:
+            data = nmea_synth.truncate(data, rng.randrange(3, 10), seed=case)
+        sentences = rng.choice(FILTERS)
+        buffered = rng.random() < 0.5
+
+        gps_chars = MicropyGPS(buffered=buffered)
+        gps_bytes = MicropyGPS(buffered=buffered)
+        gps_chars.set_sentence_filter(sentences)
+        gps_bytes.set_sentence_filter(sentences)
+
+        types_chars = []
+        for byte in data:
+            sentence_type = gps_chars.update(chr(byte))
+            if sentence_type:
+                types_chars.append(sentence_type)
+        types_bytes = []
+        offset = 0
+        while offset < len(data):
+            chunk = rng.randrange(1, 300)
+            types_bytes += gps_bytes.update_bytes(memoryview(data)[offset:offset + chunk])
+            offset += chunk
+
+        fields = STATE_FIELDS + COUNTER_FIELDS
+        if ([getattr(gps_chars, name) for name in fields] != [getattr(gps_bytes, name) for name in fields]
+                or types_chars != types_bytes):
+            return case, sentences, buffered
+    return None
+
+
+def alloc_per_sentence(data, chunk, buffered):
+    """Average tracemalloc peak (bytes) above baseline per assembled sentence"""
+    gps = AssemblyOnlyGPS(buffered=buffered)
+    parts = [data[offset:offset + chunk] for offset in range(0, len(data), chunk)]
+    total = 0
+    tracemalloc.start()
+    for part in parts:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        if chunk == 1:
+            gps.update(chr(part[0]))
+        else:
+            gps.update_bytes(part)
+        total += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return total / max(gps.clean_sentences, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('logs', nargs='*', help='recorded NMEA log files')
+    parser.add_argument('--chunk', type=int, default=256, help='bytes per uart.readinto() call')
+    parser.add_argument('--fuzz', type=int, default=200, help='random noisy inputs to compare the two paths on')
+    args = parser.parse_args()
+
+    failed = fuzz(args.fuzz)
+    if failed:
+        print("fuzz case {} (filter {}, buffered {}): update() and update_bytes() differ".format(*failed))
+        return 1
+    print(f"fuzz: {args.fuzz} noisy inputs, update() and update_bytes() agree")
+
+    if args.logs:
+        sources = [(path, open(path, 'rb').read()) for path in args.logs]
+    else:
+        sources = [('synthetic GN 10 Hz, 120 s', nmea_synth.stream(120, 10, 'GN'))]
+
+    for name, data in sources:
+        gps_chars, t_chars = run_chars(data)
+        sentences = gps_chars.clean_sentences
+        print(f"{name}: {len(data)} bytes, {sentences} sentences, {gps_chars.crc_fails} CRC fails")
+
+        for buffered in (False, True):
+            label = 'buffered' if buffered else 'strings'
+            gps_buf_chars, t_buf_chars = run_chars(data, buffered)
+            gps_bytes, t_bytes = run_bytes(data, args.chunk, buffered)
+
+            if not state_of(gps_chars) == state_of(gps_buf_chars) == state_of(gps_bytes):
+                print(f"{name}: parsed state differs between update() and update_bytes() ({label})")
+                return 1
+
+            print(f"  update()       {label:8} {sentences / t_buf_chars:10.0f} sentences/s"
+                  f"  {alloc_per_sentence(data, 1, buffered):8.1f} B/sentence peak")
+            print(f"  update_bytes() {label:8} {sentences / t_bytes:10.0f} sentences/s"
+                  f"  {alloc_per_sentence(data, args.chunk, buffered):8.1f} B/sentence peak"
+                  f"  ({t_chars / t_bytes:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Replay-driven benchmark and regression suite for MicropyGPS.
+
+Replays synthetic streams (1 Hz / 10 Hz, GP/GN/GL talkers, corrupt CRCs,
+truncated sentences, numbers spelled with spaces, signs or exponents) and any
+recorded logs given on the command line through every ingestion mode of the
+parser and reports:
+
+- sentences/s and bytes/s
+- per-sentence latency percentiles (each sentence fed as its own chunk)
+- tracemalloc peak bytes per sentence
+- whether the final parsed state matches the golden values
+
+Usage:
+    python tools/bench_gps_parser.py [recorded.nmea ...] [--chunk 256] [--update-golden]
+
+Golden values for the synthetic streams live in tools/data/nmea_golden.json.
+Exit status is non-zero when any mode disagrees with the golden state, so the
+suite can gate parser performance changes without hardware.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from microGPS import MicropyGPS  # NOQA
+from bench_gps_ingest import STATE_FIELDS  # NOQA
+import nmea_synth  # NOQA
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'nmea_golden.json')
+
+COUNTER_FIELDS = ('clean_sentences', 'parsed_sentences', 'skipped_sentences', 'skipped_bytes')
+
+# name -> (constructor options, ingestion path)
+MODES = (
+    ('update()', {}, 'chars'),
+    ('update_bytes()', {}, 'bytes'),
+    ('update_bytes() buffered', {'buffered': True}, 'bytes'),
+    ('update_bytes() buffered RMC/VTG/GGA', {
+        'buffered': True,
+        'sentences': ('RMC', 'VTG', 'GGA'),
+        'fields': MicropyGPS.FIELDS_POSITION | MicropyGPS.FIELDS_MOTION | MicropyGPS.FIELDS_QUALITY,
+    }, 'bytes'),
+)
+
+
+def synthetic_streams():
+    gp_1hz = nmea_synth.stream(300, 1, 'GP')
+    gn_10hz = nmea_synth.stream(60, 10, 'GN')
+    return (
+        ('GP 1 Hz', gp_1hz),
+        ('GN 10 Hz', gn_10hz),
+        ('GL 10 Hz', nmea_synth.stream(60, 10, 'GL')),
+        ('GN 10 Hz corrupt CRC', nmea_synth.corrupt_crc(gn_10hz)),
+        ('GP 1 Hz truncated', nmea_synth.truncate(gp_1hz)),
+        ('GN 10 Hz respelled numbers', nmea_synth.quirks(gn_10hz)),
+    )
+
+
+def split_sentences(data):
+    """Split a stream at every '$' so each chunk holds at most one sentence"""
+    chunks = []
+    pos = 0
+    while pos < len(data):
+        end = data.find(b'$', pos + 1)
+        if end < 0:
+            end = len(data)
+        chunks.append(data[pos:end])
+        pos = end
+    return chunks
+
+
+def feed(gps, path, chunks):
+    if path == 'chars':
+        update = gps.update
+        for chunk in chunks:
+            for byte in chunk:
+                update(chr(byte))
+    else:
+        update_bytes = gps.update_bytes
+        for chunk in chunks:
+            update_bytes(chunk)
+
+
+def final_state(gps, options):
+    """Parsed state as JSON-compatible values, fields a filtered parser does not decode are left out"""
+    names = STATE_FIELDS if not options.get('sentences') else \
+        ('_latitude', '_longitude', 'speed', 'course', 'valid', 'fix_stat', 'satellites_in_use', 'hdop')
+    state = {name: getattr(gps, name) for name in names}
+    return json.loads(json.dumps(state))
+
+
+def throughput(data, options, path, chunk):
+    chunks = [data[offset:offset + chunk] for offset in range(0, len(data), chunk)]
+    gps = MicropyGPS(**options)
+    start = time.perf_counter()
+    feed(gps, path, chunks)
+    return gps, time.perf_counter() - start
+
+
+def latencies(sentences, options, path):
+    gps = MicropyGPS(**options)
+    samples = []
+    for chunk in sentences:
+        start = time.perf_counter_ns()
+        feed(gps, path, (chunk,))
+        samples.append(time.perf_counter_ns() - start)
+    samples.sort()
+    return [samples[min(len(samples) - 1, int(len(samples) * q))] / 1000 for q in (0.5, 0.95, 0.99)]
+
+
+def alloc_per_sentence(sentences, options, path):
+    gps = MicropyGPS(**options)
+    total = 0
+    tracemalloc.start()
+    for chunk in sentences:
+        baseline = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        feed(gps, path, (chunk,))
+        total += tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    return total / max(len(sentences), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('logs', nargs='*', help='recorded NMEA log files')
+    parser.add_argument('--chunk', type=int, default=256, help='bytes per uart.readinto() call')
+    parser.add_argument('--update-golden', action='store_true', help='record the current results as golden values')
+    args = parser.parse_args()
+
+    sources = list(synthetic_streams())
+    sources.extend((os.path.basename(path), open(path, 'rb').read()) for path in args.logs)
+
+    golden = {}
+    if os.path.exists(GOLDEN_PATH) and not args.update_golden:
+        with open(GOLDEN_PATH) as f:
+            golden = json.load(f)
+
+    failures = 0
+    for name, data in sources:
+        sentences = split_sentences(data)
+        print(f"{name}: {len(data)} bytes, {len(sentences)} sentences")
+        print(f"  {'mode':38} {'sent/s':>9} {'kB/s':>8} {'p50 us':>7} {'p95 us':>7} {'p99 us':>7} {'B/sent':>7}  state")
+
+        for mode, options, path in MODES:
+            gps, elapsed = throughput(data, options, path, args.chunk)
+            p50, p95, p99 = latencies(sentences, options, path)
+            alloc = alloc_per_sentence(sentences, options, path)
+
+            key = f"{name} / {mode}"
+            state = final_state(gps, options)
+            state.update({counter: getattr(gps, counter) for counter in COUNTER_FIELDS})
+            if args.update_golden:
+                golden[key] = state
+                verdict = 'recorded'
+            elif key not in golden:
+                verdict = 'no golden'
+            elif golden[key] == state:
+                verdict = 'ok'
+            else:
+                verdict = 'MISMATCH'
+                failures += 1
+
+            handled = gps.clean_sentences + gps.skipped_sentences
+            print(f"  {mode:38} {handled / elapsed:9.0f} {len(data) / elapsed / 1000:8.1f}"
+                  f" {p50:7.1f} {p95:7.1f} {p99:7.1f} {alloc:7.1f}  {verdict}")
+
+    if args.update_golden:
+        os.makedirs(os.path.dirname(GOLDEN_PATH), exist_ok=True)
+        with open(GOLDEN_PATH, 'w') as f:
+            json.dump(golden, f, indent=1, sort_keys=True)
+        print(f"golden values written to {GOLDEN_PATH}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
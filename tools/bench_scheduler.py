@@ -0,0 +1,132 @@
+"""
+Main loop on the host: the old fixed 10 ms loop against the task scheduler.
+
+Runs the GPS ingestion and UI refresh parts of main.py in real time against a
+fake UART that delivers a synthetic 1 Hz NMEA stream at 9600 baud and the stub
+lvgl in tools/fakes, and reports loop wakeups per second, CPU busy share, how
+far LVGL's tick drifted from wall-clock time, and the scheduler's per-task
+statistics.
+
+Usage:
+    python tools/bench_scheduler.py [--seconds 5]
+"""
+
+import argparse
+import time
+
+import host
+
+host.install()
+
+import lvgl as lv  # NOQA  (tools/fakes/lvgl.py)
+import nmea_synth  # NOQA
+from display import DisplayUI  # NOQA
+from microGPS import MicropyGPS  # NOQA
+from scheduler import Scheduler  # NOQA
+
+BAUD_BYTES_PER_S = 960
+UART_POLL_MS = 20
+UI_MAX_SLEEP_MS = 30
+
+
+class FakeUART:
+    """Bytes become available at the UART's line rate."""
+
+    def __init__(self, data):
+        self.data = data
+        self.pos = 0
+        self.start = time.monotonic()
+
+    def _arrived(self):
+        return min(len(self.data), int((time.monotonic() - self.start) * BAUD_BYTES_PER_S))
+
+    def any(self):
+        return self._arrived() - self.pos
+
+    def readinto(self, buf):
+        n = min(len(buf), self._arrived() - self.pos)
+        buf[:n] = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+
+class App:
+    def __init__(self, seconds):
+        self.gps = MicropyGPS(buffered=True, sentences=('RMC', 'VTG', 'GGA'))
+        self.uart = FakeUART(nmea_synth.stream(seconds + 2, 1, 'GP', gsv=True))
+        self.buf = bytearray(256)
+        self.mv = memoryview(self.buf)
+        lv.reset_stats()
+        self.ui = DisplayUI()
+        self.sentences = -1
+        self.ticks = time.ticks_ms()
+        self.wakeups = 0
+
+    def drain(self):
+        while self.uart.any():
+            n = self.uart.readinto(self.buf)
+            if n:
+                self.gps.update_bytes(self.mv[:n])
+
+    def refresh(self):
+        gps = self.gps
+        if gps.valid:
+            self.ui.set_display_text("{:.1f}".format(gps.speed[0]))
+            self.ui.set_compass_text("{:.0f}°".format(gps.course))
+            self.ui.update_chart(int(gps.speed[0] * 10))
+
+    def legacy(self, seconds):
+        end = time.monotonic() + seconds
+        while time.monotonic() < end:
+            self.wakeups += 1
+            self.drain()
+            self.refresh()
+            lv.task_handler()
+            lv.tick_inc(10)
+            lv.task_handler()
+            time.sleep_ms(10)
+
+    def uart_task(self):
+        self.wakeups += 1
+        self.drain()
+        return UART_POLL_MS
+
+    def ui_task(self):
+        self.wakeups += 1
+        now = time.ticks_ms()
+        lv.tick_inc(time.ticks_diff(now, self.ticks))
+        self.ticks = now
+        if self.gps.clean_sentences != self.sentences:
+            self.sentences = self.gps.clean_sentences
+            self.refresh()
+        return min(max(lv.timer_handler(), 1), UI_MAX_SLEEP_MS)
+
+    def scheduled(self, seconds):
+        scheduler = Scheduler(max_idle_ms=UI_MAX_SLEEP_MS)
+        scheduler.add('uart', self.uart_task, priority=2)
+        scheduler.add('ui', self.ui_task, priority=1)
+        scheduler.add('stop', lambda: scheduler.stop() or 0, priority=0).due = time.ticks_add(
+            time.ticks_ms(), seconds * 1000)
+        scheduler.run()
+        return scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=int, default=5)
+    args = parser.parse_args()
+
+    for name in ('legacy', 'scheduled'):
+        app = App(args.seconds)
+        start, cpu = time.monotonic(), time.process_time()
+        scheduler = getattr(app, name)(args.seconds)
+        wall, cpu = time.monotonic() - start, time.process_time() - cpu
+        drift = lv.stats['tick_ms'] - wall * 1000
+        print(f"{name:9}: {app.wakeups / wall:6.1f} wakeups/s, cpu {cpu / wall * 100:5.1f}%,"
+              f" lvgl tick drift {drift:+7.1f} ms, {app.gps.clean_sentences} sentences, {lv.stats['frames']} frames")
+        if scheduler:
+            scheduler.print_stats()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Touch polling cost of the AXS15231 driver on the host, with a scripted fake
+controller on the I2C bus.
+
+LVGL reads the input device every read period (33 ms). The script taps the
+panel (150 ms) every 5 s and drags it for 2 s every 20 s, on an otherwise idle
+screen. For every read strategy the report shows LVGL polls/s, I2C transactions
+and bytes per second (counted on the bus by axs15231.CountingDevice), the delay
+from touch-down to the driver reporting PRESSED, and taps that were missed:
+
+- two devices: two input devices on the same controller, both reading on
+  every poll (lv_config's old setup)
+- every poll: read the controller on every LVGL poll
+- idle N ms: while not pressed, read at most every N ms
+- interrupt: while not pressed, only read after the INT line fired
+
+Usage:
+    python tools/bench_touch.py [--seconds 120] [--period 33]
+"""
+
+import argparse
+import time
+
+import host
+
+host.install()
+
+import axs15231  # NOQA
+
+TAP_EVERY_MS = 5000
+TAP_MS = 150
+DRAG_EVERY_MS = 20000
+DRAG_MS = 2000
+
+_clock = [0]
+
+
+class FakeController:
+    """Scripted panel: reports a contact while touched and one lift-up report (event 1) after it."""
+
+    def __init__(self):
+        self.touched = False
+        self.lift_pending = False
+        self.on_report = None  # called when the controller pulls INT low
+        self.x = 160
+        self.y = 240
+
+    def set_touched(self, touched, now):
+        if touched != self.touched:
+            self.touched = touched
+            self.lift_pending = not touched
+            if self.on_report:
+                self.on_report(None)
+        if touched:
+            self.x = 100 + now % 120
+
+    def write(self, buf):
+        pass
+
+    def read(self, nbytes=None, buf=None):
+        buf[:] = bytes(len(buf))
+        if self.touched or self.lift_pending:
+            event = 2 if self.touched else 1
+            self.lift_pending = False
+            buf[1] = 1
+            buf[2] = (event << 6) | (self.x >> 8)
+            buf[3] = self.x & 0xFF
+            buf[4] = self.y >> 8
+            buf[5] = self.y & 0xFF
+
+
+def touched_at(ms):
+    if ms % DRAG_EVERY_MS < DRAG_MS and ms >= DRAG_EVERY_MS:
+        return True, ms - ms % DRAG_EVERY_MS
+    if TAP_EVERY_MS // 2 <= ms % TAP_EVERY_MS < TAP_EVERY_MS // 2 + TAP_MS:
+        return True, ms - ms % TAP_EVERY_MS + TAP_EVERY_MS // 2
+    return False, None
+
+
+def run(strategy, seconds, period):
+    _clock[0] = 0
+    controller = FakeController()
+    bus = axs15231.CountingDevice(controller)
+    devices = []
+    if strategy == 'two devices':
+        devices.append(axs15231.AXS15231(bus, idle_poll_ms=0))
+        devices.append(axs15231.AXS15231(bus, idle_poll_ms=0))
+    elif strategy == 'every poll':
+        devices.append(axs15231.AXS15231(bus, idle_poll_ms=0))
+    elif strategy == 'interrupt':
+        devices.append(axs15231.AXS15231(bus))
+        devices[0]._int_pin = True  # as if wired, the fake controller calls the IRQ handler
+        controller.on_report = devices[0]._on_int
+    else:
+        devices.append(axs15231.AXS15231(bus, idle_poll_ms=int(strategy.split()[1])))
+    touch = devices[0]
+
+    presses = {}  # touch-down time -> delay until the driver reported PRESSED, None if it never did
+    current = None
+    for ms in range(0, seconds * 1000, period):
+        _clock[0] = ms
+        # The panel changes state between polls
+        for t in range(max(ms - period + 1, 0), ms + 1):
+            touched, down = touched_at(t)
+            controller.set_touched(touched, t)
+            if touched and down not in presses:
+                presses[down] = None
+                current = down
+        # Both input devices of the old setup poll the controller, LVGL acts on each
+        state, _, _ = touch._get_coords()
+        for device in devices[1:]:
+            device._get_coords()
+        if state == touch.PRESSED and current is not None and presses[current] is None:
+            presses[current] = ms - current
+
+    delays = [d for d in presses.values() if d is not None]
+    return {
+        'polls_s': sum(device.polls for device in devices) / seconds,
+        'transactions_s': bus.transactions / seconds,
+        'bytes_s': bus.bytes / seconds,
+        'delay_ms': sum(delays) / len(delays) if delays else 0,
+        'max_delay_ms': max(delays) if delays else 0,
+        'missed': sum(1 for d in presses.values() if d is None),
+        'touches': len(presses),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--seconds', type=int, default=120)
+    parser.add_argument('--period', type=int, default=33, help='LVGL input read period in ms')
+    args = parser.parse_args()
+
+    time.ticks_ms = lambda: _clock[0]
+    print(f"{'strategy':11} {'polls/s':>8} {'I2C tx/s':>8} {'I2C B/s':>8} {'delay ms':>8} {'max ms':>7} {'missed':>7}")
+    for strategy in ('two devices', 'every poll', 'idle 50', 'idle 100', 'interrupt'):
+        r = run(strategy, args.seconds, args.period)
+        print(f"{strategy:11} {r['polls_s']:8.1f} {r['transactions_s']:8.1f} {r['bytes_s']:8.0f} {r['delay_ms']:8.1f}"
+              f" {r['max_delay_ms']:7} {r['missed']:4}/{r['touches']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+"""
+Import cost probe, run by tools/bench_boot.py under the unix MicroPython port.
+
+    micropython tools/boot_probe.py <module dir> <fakes dir> <module> ...
+
+Imports the modules in order from <module dir> (.py or .mpy) and prints one
+line per module: name, import time (us), bytes allocated during the import
+(compiler and garbage included) and bytes still allocated after a collection.
+The fake hardware modules are imported first so they are not counted.
+
+Unverified: not run under MicroPython yet, see tools/bench_boot.py.
+"""
+
+import gc
+import sys
+import time
+
+FAKES = ('lvgl', 'espnow', 'network', 'lcd_bus', 'display_driver_framework')
+
+module_dir, fakes_dir = sys.argv[1], sys.argv[2]
+sys.path[:0] = [module_dir, fakes_dir]
+for name in FAKES:
+    __import__(name)
+
+for name in sys.argv[3:]:
+    gc.collect()
+    before = gc.mem_alloc()
+    t0 = time.ticks_us()
+    __import__(name)
+    us = time.ticks_diff(time.ticks_us(), t0)
+    allocated = gc.mem_alloc() - before
+    gc.collect()
+    kept = gc.mem_alloc() - before
+    print(name, us, allocated, kept)
+gc.collect()
+print("free", gc.mem_free())
@@ -0,0 +1,116 @@
+"""
+Precompile the application modules to .mpy bytecode, or write a frozen manifest
+for building them into the lvgl_micropython firmware.
+
+The device otherwise compiles every module from source on each boot, which
+takes time and, while it runs, heap for the parser and compiler. Bytecode
+has no docstrings: the MicroPython compiler drops them. With -O1 and above,
+asserts and `if __debug__:` blocks go as well. Tuples of literal constants,
+like microGPS's direction and month tables, are stored as constants in the
+bytecode. When frozen they stay in flash and are not copied to the heap.
+
+main.py and config.py stay as source: main.py is the entry point the firmware
+looks for, and config.py is the file that gets edited per boat.
+
+Usage:
+    python tools/build_mpy.py [--out build/mpy] [-O 1] [--mpy-cross mpy-cross]
+    python tools/build_mpy.py --manifest build/manifest.py
+
+mpy-cross must match the firmware's MicroPython version (pip install
+mpy-cross==<version>, or the one built with the firmware). Copy the result
+with `mpremote cp build/mpy/*.mpy :` and remove the .py files of those modules
+from the device, MicroPython imports a .py before an .mpy of the same name.
+
+For a frozen build pass the manifest to the firmware build, e.g.
+`python make.py esp32 ... FROZEN_MANIFEST=<path>/build/manifest.py`.
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = (
+    'microGPS',
+    'scheduler',
+    'profiler',
+    'boottrace',
+    'speedstats',
+    'telemetry',
+    'tracklog',
+    'espnow_manager',
+    'display',
+    'qspi_panel',
+    'axs15231b',
+    '_axs15231b_init',
+    'axs15231',
+    'lv_config',
+)
+
+
+def mpy_cross_command(path=None):
+    """Command line prefix that runs mpy-cross: the given path, the executable on PATH or the pip package."""
+    if path:
+        return [path]
+    exe = shutil.which('mpy-cross')
+    if exe:
+        return [exe]
+    try:
+        import mpy_cross  # NOQA
+    except ImportError:
+        raise SystemExit('mpy-cross not found: pip install mpy-cross==<firmware MicroPython version>')
+    return [sys.executable, '-m', 'mpy_cross']
+
+
+def build(out_dir, opt=1, mpy_cross=None, modules=MODULES):
+    """Compile modules into out_dir. Returns [(module, source bytes, mpy bytes)]."""
+    cmd = mpy_cross_command(mpy_cross)
+    os.makedirs(out_dir, exist_ok=True)
+    sizes = []
+    for name in modules:
+        src = os.path.join(ROOT_DIR, name + '.py')
+        dst = os.path.join(out_dir, name + '.mpy')
+        # -s: name shown in tracebacks instead of the build machine's path
+        subprocess.run(cmd + ['-O{}'.format(opt), '-s', name + '.py', '-o', dst, src], check=True)
+        sizes.append((name, os.path.getsize(src), os.path.getsize(dst)))
+    return sizes
+
+
+def write_manifest(path, opt=1, modules=MODULES):
+    lines = [
+        '# Generated by tools/build_mpy.py, freezes the application modules into the firmware',
+        'include("$(PORT_DIR)/boards/manifest.py")',
+    ]
+    for name in modules:
+        lines.append('module("{}.py", base_path={!r}, opt={})'.format(name, ROOT_DIR, opt))
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write('\n'.join(lines) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--out', default=os.path.join(ROOT_DIR, 'build', 'mpy'))
+    parser.add_argument('-O', dest='opt', type=int, default=1, help='mpy-cross optimisation level')
+    parser.add_argument('--mpy-cross', help='path to the mpy-cross executable')
+    parser.add_argument('--manifest', help='write a frozen manifest to this path instead of compiling')
+    args = parser.parse_args()
+
+    if args.manifest:
+        write_manifest(args.manifest, args.opt)
+        print('Wrote', args.manifest)
+        return
+
+    sizes = build(args.out, args.opt, args.mpy_cross)
+    print(f"{'module':16} {'source':>8} {'mpy':>8}")
+    for name, src, mpy in sizes:
+        print(f"{name:16} {src:8} {mpy:8}")
+    print(f"{'total':16} {sum(s[1] for s in sizes):8} {sum(s[2] for s in sizes):8}")
+    print('Written to', args.out)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Checks speedstats.SpeedStats against a brute-force recomputation over random
+speed series, checks the one-second buckets against a jittered 1 Hz GPS feed
+and the chart windows of DisplayUI against their labels, and times add_sample()
+against re-summing a list per sample.
+
+Usage:
+    python tools/check_speedstats.py
+"""
+
+import random
+import time
+
+import host
+
+host.install()
+
+from speedstats import GAP, SpeedHistory, SpeedStats  # NOQA
+
+
+def check(seed, length):
+    rng = random.Random(seed)
+    stats = SpeedStats()
+    history = []
+    best = 0
+    for _ in range(length):
+        value = max(0, min(300, (history[-1] if history else 50) + rng.randint(-8, 8)))
+        if rng.random() < 0.01:
+            value = rng.randint(0, 300)
+        stats.add_sample(value)
+        history.append(value)
+        for i, w in enumerate(stats.windows):
+            window = history[-w:]
+            assert stats.maximum(i) == max(window), (seed, len(history), w)
+            assert abs(stats.average(i) - sum(window) / len(window)) < 1e-9, (seed, len(history), w)
+        if len(history) >= stats.windows[0]:
+            best = max(best, sum(history[-stats.windows[0]:]))
+    assert stats.session_max == max(history)
+    assert stats.best() == best / stats.windows[0]
+
+
+def check_buckets():
+    stats = SpeedStats(bucket_ms=1000)
+    # 10 Hz updates: each second becomes one sample, the average of its updates
+    for tenth in range(35):
+        stats.add(50 + tenth % 10, now=tenth * 100)
+    assert stats.count == 3 and stats.latest() == 54, (stats.count, stats.latest())
+
+
+def check_jitter(seed, seconds=300, silence=(100, 105)):
+    """1 Hz updates up to 400 ms late, none for a few seconds: one sample per second of the
+    span, a GAP for every second without an update, and the history's points cover that span."""
+    rng = random.Random(seed)
+    stats = SpeedStats(bucket_ms=1000)
+    history = SpeedHistory(points=300, steps=(1, 6))
+    for k in range(seconds + 1):
+        if silence[0] < k < silence[1]:
+            continue
+        added = stats.add(50, now=k * 1000 + rng.randint(0, 400))
+        for n in range(stats.count - added, stats.count):
+            history.add(stats.sample(n))
+    # The update of second `seconds` opened the last bucket
+    assert stats.count == seconds, (seed, stats.count)
+    gaps = sum(1 for n in range(stats.count - stats.size, stats.count) if n >= 0 and stats.sample(n) == GAP)
+    assert gaps == silence[1] - silence[0] - 1, (seed, gaps)
+    assert stats.average(2) == 50 and stats.valid[2] == seconds - gaps
+    assert history.counts[0] == seconds and history.counts[1] == seconds // 6, tuple(history.counts)
+
+
+def label_seconds(label):
+    number, unit = label.split()
+    return int(number) * {'min': 60, 'h': 3600}[unit]
+
+
+def check_chart_spans(seed):
+    """Each chart window's points hold as much GPS time as its label says, on a jittered 1 Hz feed."""
+    import lvgl  # NOQA  (tools/fakes/lvgl.py)
+    from display import DisplayUI
+
+    clock = [0]
+    ticks_ms = time.ticks_ms
+    time.ticks_ms = lambda: clock[0]
+    try:
+        ui = DisplayUI()
+        rng = random.Random(seed)
+        seconds = 2 * 3600 + 600
+        for k in range(seconds + 1):
+            clock[0] = k * 1000 + rng.randint(0, 400)
+            ui.update_chart(50)
+    finally:
+        time.ticks_ms = ticks_ms
+    for level, (label, step) in enumerate(ui.CHART_WINDOWS):
+        assert ui.CHART_POINTS * step == label_seconds(label), (label, step)
+        # seconds samples in total, one point per step of them
+        assert ui.history.counts[level] == seconds // step, (seed, label, ui.history.counts[level])
+
+
+def timing(length=5000):
+    stats = SpeedStats()
+    start = time.perf_counter()
+    for i in range(length):
+        stats.add_sample(i % 97)
+    incremental = time.perf_counter() - start
+
+    history = []
+    start = time.perf_counter()
+    for i in range(length):
+        history.append(i % 97)
+        for w in stats.windows:
+            window = history[-w:]
+            sum(window) / len(window), max(window)
+    naive = time.perf_counter() - start
+    return incremental / length * 1e6, naive / length * 1e6
+
+
+def main():
+    for seed in range(5):
+        check(seed, 1500)
+    check_buckets()
+    for seed in range(5):
+        check_jitter(seed)
+    check_chart_spans(0)
+    incremental, naive = timing()
+    print(f"ok: {incremental:.1f} us/sample incremental, {naive:.1f} us/sample re-summing lists")
+
+
+if __name__ == "__main__":
+    main()
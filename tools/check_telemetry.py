@@ -0,0 +1,67 @@
+"""
+Round-trip checks for the binary ESP-NOW telemetry frame (telemetry.py).
+
+Usage:
+    python tools/check_telemetry.py
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import telemetry  # NOQA
+
+CASES = (
+    # sequence, speed, course, latitude, longitude, fix, satellites, valid
+    (1, 0.0, 0.0, 0.0, 0.0, 0, 0, False),
+    (2, 5.21, 95.6, 43.2965123, 5.3698456, 1, 8, True),
+    (65535, 655.35, 359.99, -33.8688197, 151.2092955, 2, 12, True),
+    (70000, 12.3, 348.75, 89.9999999, -179.9999999, 1, 255, True),
+)
+
+
+def check_round_trip():
+    buf = bytearray(telemetry.FRAME_SIZE)
+    for sequence, speed, course, lat, lon, fix, sats, valid in CASES:
+        frame = telemetry.decode_frame(telemetry.encode_frame(buf, sequence, speed, course, lat, lon, fix, sats, valid))
+        assert frame["sequence"] == sequence & 0xFFFF, frame
+        assert abs(frame["speed"] - speed) < 0.006, frame
+        assert abs(frame["course"] - course) < 0.006, frame
+        assert frame["sector"] == telemetry.compass_sector(course), frame
+        assert abs(frame["latitude"] - lat) < 1e-7, frame
+        assert abs(frame["longitude"] - lon) < 1e-7, frame
+        assert (frame["fix_stat"], frame["satellites"], frame["valid"]) == (fix, sats, valid), frame
+
+
+def check_compass_sector():
+    # Same 16-point mapping as MicropyGPS.compass_direction()
+    from microGPS import MicropyGPS
+    directions = ('N', 'NNE', 'NE', 'ENE', 'E', 'ESE', 'SE', 'SSE', 'S', 'SSW', 'SW', 'WSW', 'W',
+                  'WNW', 'NW', 'NNW')
+    gps = MicropyGPS()
+    for tenth in range(3600):
+        gps.course = tenth / 10
+        assert directions[telemetry.compass_sector(gps.course)] == gps.compass_direction(), gps.course
+
+
+def check_rejects():
+    buf = telemetry.encode_frame(bytearray(telemetry.FRAME_SIZE), 1, 1.0, 1.0, 1.0, 1.0, 1, 1, True)
+    for bad in (bytes(buf[:-1]), b'\x00' + bytes(buf[1:]), b'speedometer/speed:5.2'):
+        try:
+            telemetry.decode_frame(bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"accepted {bad!r}")
+
+
+def main():
+    check_round_trip()
+    check_compass_sector()
+    check_rejects()
+    text = len("speedometer/speed:5.2") + len("speedometer/compass:ENE")
+    print(f"ok: binary frame {telemetry.FRAME_SIZE} bytes in 1 frame, text {text} bytes in 2 frames")
+
+
+if __name__ == "__main__":
+    main()
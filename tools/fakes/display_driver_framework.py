@@ -0,0 +1,74 @@
+"""
+Host stand-in for display_driver_framework: the DisplayDriver attributes and the
+lv.display_t calls the panel drivers use, so their flush path can run on CPython.
+"""
+
+import lvgl as lv
+
+STATE_HIGH = 1
+STATE_LOW = 0
+STATE_PWM = -1
+
+BYTE_ORDER_RGB = 0x00
+BYTE_ORDER_BGR = 0x08
+
+
+class _Display:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.render_mode = None
+        self.event_cbs = []
+        self.ready = 0  # flush_ready() calls
+        self.last = True  # what flush_is_last() answers
+
+    def set_render_mode(self, mode):
+        self.render_mode = mode
+
+    def add_event_cb(self, cb, code, user_data):
+        self.event_cbs.append((cb, code))
+
+    def send_event(self, code, param):
+        for cb, cb_code in self.event_cbs:
+            if cb_code == code:
+                cb(lv.event_t(code, param))
+
+    def get_horizontal_resolution(self):
+        return self.width
+
+    def get_vertical_resolution(self):
+        return self.height
+
+    def flush_ready(self):
+        self.ready += 1
+
+    def flush_is_last(self):
+        return self.last
+
+
+class DisplayDriver:
+    def __init__(self, data_bus, display_width, display_height, frame_buffer1=None, frame_buffer2=None,
+                 reset_pin=None, reset_state=STATE_HIGH, power_pin=None, power_on_state=STATE_HIGH,
+                 backlight_pin=None, backlight_on_state=STATE_HIGH, offset_x=0, offset_y=0,
+                 color_byte_order=BYTE_ORDER_RGB, color_space=lv.COLOR_FORMAT.RGB888, rgb565_byte_swap=False,
+                 _cmd_bits=8, _param_bits=8, _init_bus=True):
+        self._data_bus = data_bus
+        self.display_width = display_width
+        self.display_height = display_height
+        self._frame_buffer1 = frame_buffer1
+        self._frame_buffer2 = frame_buffer2
+        self._offset_x = offset_x
+        self._offset_y = offset_y
+        self._color_byte_order = color_byte_order
+        self._color_space = color_space
+        self._rotation = 0
+        self._param_buf = bytearray(4)
+        self._param_mv = memoryview(self._param_buf)
+        self._disp_drv = _Display(display_width, display_height)
+        if _init_bus:
+            data_bus.init(display_width, display_height, lv.color_format_get_size(color_space) * 8,
+                          len(frame_buffer1) if frame_buffer1 else 0, rgb565_byte_swap, _cmd_bits, _param_bits)
+        data_bus.register_callback(self._flush_ready_cb)
+
+    def _flush_ready_cb(self, *_):
+        self._disp_drv.flush_ready()
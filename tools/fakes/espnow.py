@@ -0,0 +1,118 @@
+"""
+Host stand-in for the MicroPython espnow module.
+
+Frames are not sent anywhere. Each send() is recorded and charged a modelled
+radio time: a unicast occupies the channel for the frame and then waits for the
+peer's ACK (or the retry timeout when the peer is out of range), a broadcast only
+occupies the channel for the frame. blocked_us is the part of that the caller
+waits for: with sync=False nothing, until the driver's transmit buffers for an
+out-of-range peer are full and send() raises ETIMEDOUT. Receivers in range are
+listed in `receivers` and get every unicast addressed to them and every broadcast.
+"""
+
+BROADCAST = b'\xff' * 6
+MAX_DATA_LEN = 250
+
+# Modelled radio cost at the 1 Mbit/s ESP-NOW rate
+FRAME_OVERHEAD_US = 250  # preamble, MAC header, vendor action frame header
+US_PER_BYTE = 8
+ACK_US = 150  # SIFS + ACK frame
+TIMEOUT_US = 20000  # unacknowledged unicast, retries exhausted
+TX_BUFFERS = 4  # unacknowledged frames the driver holds per peer before send() fails
+
+# MAC (bytes) -> list of frames received, for the peers that are in range
+receivers = {}
+
+
+def reset(macs=()):
+    receivers.clear()
+    for mac in macs:
+        receivers[bytes(mac)] = []
+
+
+class ESPNow:
+    def __init__(self):
+        self._active = False
+        self._peers = set()
+        self.frames = 0
+        self.bytes = 0
+        self.radio_us = 0
+        self.blocked_us = 0
+        self.failures = 0
+        self._unacked = {}
+
+    def active(self, value=None):
+        if value is None:
+            return self._active
+        self._active = bool(value)
+        return self._active
+
+    def add_peer(self, mac, *args, **kwargs):
+        mac = bytes(mac)
+        if mac in self._peers:
+            raise OSError(-12395, 'ESP_ERR_ESPNOW_EXIST')
+        self._peers.add(mac)
+
+    def del_peer(self, mac):
+        mac = bytes(mac)
+        if mac not in self._peers:
+            raise OSError(-12393, 'ESP_ERR_ESPNOW_NOT_FOUND')
+        self._peers.discard(mac)
+
+    def get_peers(self):
+        return tuple((mac, None, 0, 0, False) for mac in self._peers)
+
+    def send(self, mac, msg=None, sync=True):
+        if msg is None:
+            mac, msg = None, mac
+        if not self._active:
+            raise OSError(-12396, 'ESP_ERR_ESPNOW_NOT_INIT')
+        if len(msg) > MAX_DATA_LEN:
+            raise ValueError('ESP-Now message too long')
+        targets = self._peers if mac is None else (bytes(mac),)
+        delivered = True
+        for target in targets:
+            if target not in self._peers:
+                raise OSError(-12393, 'ESP_ERR_ESPNOW_NOT_FOUND')
+            if target != BROADCAST and target not in receivers and not sync:
+                unacked = self._unacked.get(target, 0) + 1
+                if unacked > TX_BUFFERS:
+                    self._unacked[target] = 0
+                    self.failures += 1
+                    self.blocked_us += TIMEOUT_US // TX_BUFFERS
+                    raise OSError(116, 'ETIMEDOUT')
+                self._unacked[target] = unacked
+            self.frames += 1
+            self.bytes += len(msg)
+            airtime = FRAME_OVERHEAD_US + US_PER_BYTE * len(msg)
+            self.radio_us += airtime
+            if sync:
+                self.blocked_us += airtime
+            if target == BROADCAST:
+                for frames in receivers.values():
+                    frames.append(bytes(msg))
+            elif target in receivers:
+                receivers[target].append(bytes(msg))
+                self.radio_us += ACK_US
+                if sync:
+                    self.blocked_us += ACK_US
+            else:
+                self.failures += 1
+                delivered = False
+                self.radio_us += TIMEOUT_US
+                if sync:
+                    self.blocked_us += TIMEOUT_US
+        return delivered
+
+    def stats(self):
+        # (tx_pkts, tx_responses, tx_failures, rx_packets, rx_dropped)
+        return self.frames, self.frames - self.failures, self.failures, 0, 0
+
+    def any(self):
+        return False
+
+    def irecv(self, timeout_ms=None):
+        return None, None
+
+    def recv(self, timeout_ms=None):
+        return None, None
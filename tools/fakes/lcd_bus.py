@@ -0,0 +1,105 @@
+"""
+Host stand-in for the lcd_bus module (SPIBus only), with a modelled transfer clock.
+
+Nothing is sent. The bus keeps a simulated clock in us (`now`) and a queue of
+transactions, each occupying the wire for its bytes at the configured clock
+and lane count. tx_color() charges the caller a queuing cost and only blocks
+while queue_depth transactions are in flight, like the ESP-IDF panel IO queue.
+A transaction that finds the bus idle pays setup_us before it starts, one that
+was already queued only gap_us after the previous one. tx_param() waits for the
+queue to drain first, like esp_lcd_panel_io_tx_param(). The registered callback
+is called for every color transaction once the clock has passed its end.
+"""
+
+MEMORY_DMA = 0x0008
+MEMORY_SPIRAM = 0x0400
+MEMORY_INTERNAL = 0x0800
+
+INTERNAL_FREE = 200 * 1024  # modelled free internal DMA RAM for allocate_framebuffer()
+
+
+class SPIBus:
+    def __init__(self, spi_bus=None, dc=None, cs=None, freq=40000000, spi_mode=0, quad=False,
+                 queue_depth=10, queue_us=20, setup_us=15, gap_us=2, param_us=25):
+        self.freq = freq
+        self.lanes = 4 if quad else 1
+        self.queue_depth = queue_depth
+        self.queue_us = queue_us
+        self.setup_us = setup_us
+        self.gap_us = gap_us
+        self.param_us = param_us
+        self.internal_free = INTERNAL_FREE
+        self._callback = None
+        self.reset()
+
+    def reset(self):
+        self.now = 0.0
+        self._ends = []  # end times of the transactions in flight, oldest first
+        self.bus_end = 0.0
+        self.done_at = 0.0  # end time of the last finished transaction
+        self.color_tx = 0
+        self.param_tx = 0
+        self.bytes = 0
+        self.busy_us = 0.0
+        self.blocked_us = 0.0
+
+    def get_lane_count(self):
+        return self.lanes
+
+    def allocate_framebuffer(self, size, flags):
+        if flags & MEMORY_INTERNAL:
+            if size > self.internal_free:
+                raise MemoryError
+            self.internal_free -= size
+        return bytearray(size)
+
+    def free_framebuffer(self, buf):
+        return None
+
+    def init(self, *args, **kwargs):
+        pass
+
+    def register_callback(self, callback):
+        self._callback = callback
+
+    def wire_us(self, size):
+        return size * 8 / (self.freq * self.lanes) * 1000000
+
+    def poll(self):
+        """Call the callback for every transaction that has finished by now."""
+        while self._ends and self._ends[0] <= self.now:
+            self.done_at = self._ends.pop(0)
+            if self._callback is not None:
+                self._callback()
+
+    def _wait(self, until):
+        if until > self.now:
+            self.blocked_us += until - self.now
+            self.now = until
+        self.poll()
+
+    def wait_idle(self):
+        self._wait(self.bus_end)
+
+    def tx_param(self, cmd, params=None):
+        self.wait_idle()
+        self.now += self.param_us
+        self.bus_end = self.now
+        self.param_tx += 1
+
+    def tx_color(self, cmd, data, x1, y1, x2, y2, rotation, last_update):
+        self.now += self.queue_us
+        self.poll()
+        if len(self._ends) >= self.queue_depth:
+            self._wait(self._ends[0])
+        size = len(data)
+        if self.bus_end <= self.now:
+            start = self.now + self.setup_us
+        else:
+            start = self.bus_end + self.gap_us
+        wire = self.wire_us(size)
+        self.bus_end = start + wire
+        self._ends.append(self.bus_end)
+        self.color_tx += 1
+        self.bytes += size
+        self.busy_us += wire
@@ -0,0 +1,245 @@
+"""
+Host stand-in for the lvgl module, enough to build DisplayUI and measure redraw work.
+
+Nothing is drawn. Objects remember their size, text and font, and every call
+that would make LVGL redraw part of the active screen (set_text, chart updates,
+screen_load) adds that area to the pending invalidation. task_handler() turns
+the pending area into a "frame" and adds it to `stats`. Sizes of labels are
+estimated from their text and font, which is close enough to compare how much
+of the panel a loop iteration makes LVGL redraw and flush.
+"""
+
+HOR_RES = 320
+VER_RES = 480
+REFR_PERIOD = 33  # LV_DEF_REFR_PERIOD, the display refresh timer
+
+stats = {}
+
+
+def reset_stats():
+    stats.update(invalidations=0, invalidated_px=0, frames=0, flushed_px=0, screen_loads=0, set_text=0, tick_ms=0)
+
+
+reset_stats()
+_pending = [0]
+
+
+class _Names:
+    """Enum-like namespace, any attribute is its own name."""
+
+    def __init__(self, **values):
+        self.__dict__.update(values)
+
+    def __getattr__(self, name):
+        return name
+
+
+ALIGN = _Names()
+TEXT_ALIGN = _Names()
+OPA = _Names(COVER=255, TRANSP=0)
+SYMBOL = _Names(LEFT='<', RIGHT='>')
+EVENT = _Names()
+PALETTE = _Names()
+CHART_POINT_NONE = 0x7FFFFFFF
+COLOR_FORMAT = _Names(RGB565=0x12, RGB888=0x0F)
+DISPLAY_RENDER_MODE = _Names(PARTIAL=0, DIRECT=1, FULL=2)
+DISPLAY_ROTATION = _Names(_0=0, _90=1, _180=2, _270=3)
+
+
+def color_format_get_size(color_format):
+    return 2 if color_format == COLOR_FORMAT.RGB565 else 3
+
+
+class area_t:
+    def __init__(self, x1=0, y1=0, x2=0, y2=0):
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+
+    @staticmethod
+    def __cast__(param):
+        return param
+
+
+class event_t:
+    def __init__(self, code, param):
+        self.code = code
+        self.param = param
+
+    def get_code(self):
+        return self.code
+
+    def get_param(self):
+        return self.param
+
+
+class _Font:
+    def __init__(self, size):
+        self.size = size
+
+
+def __getattr__(name):
+    if name.startswith('font_montserrat_'):
+        return _Font(int(name[len('font_montserrat_'):]))
+    raise AttributeError(name)
+
+
+def color_hex(value):
+    return value
+
+
+def palette_main(palette):
+    return palette
+
+
+def _noop(*args, **kwargs):
+    return None
+
+
+class obj:
+    FLAG = _Names()
+
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.size = (HOR_RES, VER_RES) if parent is None else None
+        self.font = None
+        self.text = ''
+
+    def __getattr__(self, name):
+        # align(), set_style_bg_color(), add_event_cb(), ... do not change what is redrawn here
+        if name.startswith(('set_', 'add_', 'align', 'center', 'clean', 'remove_', 'invalidate')):
+            return _noop
+        raise AttributeError(name)
+
+    def set_size(self, width, height):
+        self.size = (width, height)
+
+    def get_width(self):
+        return self.size[0] if self.size is not None else 0
+
+    def get_height(self):
+        return self.size[1] if self.size is not None else 0
+
+    def set_style_text_font(self, font, selector=0):
+        self.font = font
+
+    def screen(self):
+        o = self
+        while o.parent is not None:
+            o = o.parent
+        return o
+
+    def font_size(self):
+        o = self
+        while o is not None:
+            if o.font is not None:
+                return o.font.size
+            o = o.parent
+        return 14
+
+    def area(self):
+        if self.size is not None:
+            return self.size[0] * self.size[1]
+        size = self.font_size()
+        return int(len(self.text) * size * 0.6) * int(size * 1.2)
+
+    def invalidate(self):
+        if self.screen() is not _active[0]:
+            return  # not on the active screen, LVGL skips it
+        stats['invalidations'] += 1
+        area = self.area()
+        stats['invalidated_px'] += area
+        _pending[0] += area
+
+    def set_text(self, text):
+        stats['set_text'] += 1
+        self.invalidate()  # old text area
+        self.text = text
+        self.invalidate()  # new text area
+
+    def get_text(self):
+        return self.text
+
+
+class label(obj):
+    pass
+
+
+class button(obj):
+    pass
+
+
+class textarea(obj):
+    def set_placeholder_text(self, text):
+        pass
+
+
+class keyboard(obj):
+    pass
+
+
+class chart(obj):
+    TYPE = _Names()
+    AXIS = _Names()
+    UPDATE_MODE = _Names()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.points = 10
+
+    def set_point_count(self, count):
+        self.points = count
+
+    def add_series(self, color, axis):
+        return object()
+
+    def _invalidate_point(self):
+        # LVGL invalidates the band around a point
+        if self.screen() is _active[0]:
+            area = (self.size[0] // max(self.points, 1) + 2) * self.size[1]
+            stats['invalidations'] += 1
+            stats['invalidated_px'] += area
+            _pending[0] += area
+
+    def set_next_value(self, series, value):
+        # Circular mode; in shift mode LVGL redraws the whole chart
+        self._invalidate_point()
+
+    def set_value_by_id(self, series, point_id, value):
+        self._invalidate_point()
+
+    def set_all_value(self, series, value):
+        self.invalidate()
+
+    def refresh(self):
+        self.invalidate()
+
+
+_active = [obj()]
+
+
+def screen_active():
+    return _active[0]
+
+
+def screen_load(scr):
+    stats['screen_loads'] += 1
+    _active[0] = scr
+    scr.invalidate()
+
+
+def tick_inc(ms):
+    stats['tick_ms'] += ms
+
+
+def task_handler():
+    if _pending[0]:
+        stats['frames'] += 1
+        stats['flushed_px'] += min(_pending[0], HOR_RES * VER_RES)
+        _pending[0] = 0
+    # ms until the next refresh timer run, like lv_timer_handler()
+    return REFR_PERIOD - stats['tick_ms'] % REFR_PERIOD
+
+
+timer_handler = task_handler
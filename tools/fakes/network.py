@@ -0,0 +1,21 @@
+"""Host stand-in for the MicroPython network module (only what espnow_manager.py uses)."""
+
+STA_IF = 0
+AP_IF = 1
+
+
+class WLAN:
+    def __init__(self, interface=STA_IF):
+        self.interface = interface
+        self._active = False
+
+    def active(self, value=None):
+        if value is None:
+            return self._active
+        self._active = bool(value)
+        return self._active
+
+    def config(self, *args, **kwargs):
+        if args == ('mac',):
+            return b'\x24\x0a\xc4\x00\x00\x01'
+        return None
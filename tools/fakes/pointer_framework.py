@@ -0,0 +1,17 @@
+"""Host stand-in for pointer_framework: the PointerDriver attributes the touch drivers use."""
+
+
+class PointerDriver:
+    PRESSED = 1
+    RELEASED = 0
+
+    def __init__(self, touch_cal=None, startup_rotation=0, debug=False):
+        self._cal = touch_cal
+        self._debug = debug
+
+    @property
+    def is_calibrated(self):
+        return True
+
+    def enable_input_priority(self):
+        pass
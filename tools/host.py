@@ -0,0 +1,46 @@
+"""
+Run device modules on CPython: puts tools/fakes (hardware module stand-ins) and
+the project root on sys.path, and adds the MicroPython time.ticks_* and
+sleep_ms/sleep_us functions. Import it and call install() before importing
+project modules.
+"""
+
+import os
+import sys
+import time
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(TOOLS_DIR)
+FAKES_DIR = os.path.join(TOOLS_DIR, 'fakes')
+
+_TICKS_PERIOD = 1 << 30
+
+
+def _ticks_ms():
+    return int(time.monotonic_ns() // 1000000) & (_TICKS_PERIOD - 1)
+
+
+def _ticks_us():
+    return int(time.monotonic_ns() // 1000) & (_TICKS_PERIOD - 1)
+
+
+def _ticks_add(ticks, delta):
+    return (ticks + delta) & (_TICKS_PERIOD - 1)
+
+
+def _ticks_diff(end, start):
+    return ((end - start + _TICKS_PERIOD // 2) & (_TICKS_PERIOD - 1)) - _TICKS_PERIOD // 2
+
+
+def install():
+    for path in (FAKES_DIR, ROOT_DIR):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+    if not hasattr(time, 'ticks_ms'):
+        time.ticks_ms = _ticks_ms
+        time.ticks_us = _ticks_us
+        time.ticks_cpu = _ticks_us
+        time.ticks_add = _ticks_add
+        time.ticks_diff = _ticks_diff
+        time.sleep_ms = lambda ms: time.sleep(ms / 1000)
+        time.sleep_us = lambda us: time.sleep(us / 1000000)
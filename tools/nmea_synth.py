@@ -0,0 +1,153 @@
+"""
+Synthetic NMEA streams for exercising MicropyGPS on a host machine.
+
+Sentences are generated along a simple track with valid checksums, shaped like
+the output of a NEO-6M (GP talker) or a multi-constellation receiver (GN/GL).
+"""
+
+import math
+import random
+
+
+def checksum(payload):
+    """XOR checksum of the text between '$' and '*'"""
+    crc = 0
+    for char in payload:
+        crc ^= ord(char)
+    return crc
+
+
+def sentence(payload):
+    """Wrap a payload into a complete NMEA sentence with CRC and line ending"""
+    return f"${payload}*{checksum(payload):02X}\r\n"
+
+
+def _ddm(value, degree_digits):
+    degrees = int(abs(value))
+    minutes = (abs(value) - degrees) * 60
+    return f"{degrees:0{degree_digits}d}{minutes:08.5f}"
+
+
+def epoch(talker, t, lat, lon, speed_knots, course, gsv=True):
+    """Return the sentences a receiver emits for one fix"""
+    hours = int(t // 3600) % 24
+    minutes = int(t // 60) % 60
+    seconds = t % 60
+    utc = f"{hours:02d}{minutes:02d}{seconds:05.2f}"
+    lat_s = _ddm(lat, 2)
+    lon_s = _ddm(lon, 3)
+    ns = 'N' if lat >= 0 else 'S'
+    ew = 'E' if lon >= 0 else 'W'
+
+    out = [
+        sentence(f"{talker}RMC,{utc},A,{lat_s},{ns},{lon_s},{ew},{speed_knots:.3f},{course:.2f},180926,,,A"),
+        sentence(f"{talker}VTG,{course:.2f},T,,M,{speed_knots:.3f},N,{speed_knots * 1.852:.3f},K,A"),
+        sentence(f"{talker}GGA,{utc},{lat_s},{ns},{lon_s},{ew},1,08,1.01,12.3,M,47.1,M,,"),
+        sentence(f"{talker}GSA,A,3,04,05,09,12,17,20,25,28,,,,,1.85,1.01,1.55"),
+    ]
+    if gsv:
+        sats = ((4, 45, 120, 38), (5, 12, 310, 22), (9, 67, 45, 41), (12, 30, 200, 33),
+                (17, 8, 95, 18), (20, 55, 270, 40), (25, 21, 15, 29), (28, 40, 160, 35))
+        prefix = 'GP' if talker == 'GN' else talker
+        for index in range(2):
+            fields = ','.join(f"{s[0]:02d},{s[1]:02d},{s[2]:03d},{s[3]:02d}" for s in sats[index * 4:index * 4 + 4])
+            out.append(sentence(f"{prefix}GSV,2,{index + 1},08,{fields}"))
+    out.append(sentence(f"{talker}GLL,{lat_s},{ns},{lon_s},{ew},{utc},A,A"))
+    return out
+
+
+def stream(seconds=60, rate_hz=1, talker='GP', gsv=True, start_lat=43.2965, start_lon=5.3698):
+    """Generate a continuous stream (as bytes) of a boat sailing a slow curve"""
+    lines = []
+    lat = start_lat
+    lon = start_lon
+    dt = 1.0 / rate_hz
+    for step in range(int(seconds * rate_hz)):
+        t = 12 * 3600 + step * dt
+        speed = 5.0 + 1.5 * math.sin(step * dt / 20)
+        course = (90 + step * dt * 2) % 360
+        distance = speed * 1852 / 3600 * dt
+        lat += distance * math.cos(math.radians(course)) / 111320
+        lon += distance * math.sin(math.radians(course)) / (111320 * math.cos(math.radians(lat)))
+        # Receivers at 10 Hz only send satellite data once per second
+        lines.extend(epoch(talker, t, lat, lon, speed, course, gsv and step % rate_hz == 0))
+    return ''.join(lines).encode()
+
+
+def corrupt_crc(data, every=7, seed=1):
+    """Flip a payload character in every n-th sentence so its checksum no longer matches"""
+    rng = random.Random(seed)
+    lines = data.split(b'\n')
+    for index in range(0, len(lines), every):
+        line = bytearray(lines[index])
+        if len(line) > 10:
+            pos = rng.randrange(7, line.index(b'*') if b'*' in line else len(line))
+            line[pos] = ord('0') if line[pos] != ord('0') else ord('1')
+            lines[index] = bytes(line)
+    return b'\n'.join(lines)
+
+
+def truncate(data, every=5, seed=2):
+    """Cut every n-th sentence short, as happens when the UART overflows or the receiver resets"""
+    rng = random.Random(seed)
+    lines = data.split(b'\n')
+    for index in range(0, len(lines), every):
+        line = lines[index]
+        if len(line) > 10:
+            lines[index] = line[:rng.randrange(2, len(line) - 3)]
+    return b'\n'.join(lines)
+
+
+def noise(data, rate=0.01, seed=4):
+    """Insert bytes update() ignores (NUL, control characters below LF, DEL and above) at random positions,
+    as line noise or a receiver switching baud rates produce"""
+    rng = random.Random(seed)
+    noisy = bytes(rng.choice((0, 1, 7, 9, 127, 128, 200, 255)) for _ in range(int(len(data) * rate) + 1))
+    out = bytearray()
+    last = 0
+    for pos in sorted(rng.randrange(len(data) + 1) for _ in range(len(noisy))):
+        out += data[last:pos]
+        out.append(noisy[len(out) % len(noisy)])
+        last = pos
+    out += data[last:]
+    return bytes(out)
+
+
+# Number spellings int() and float() accept besides the plain one
+QUIRKS = (
+    lambda field: '  ' + field,
+    lambda field: field + ' ',
+    lambda field: '+' + field,
+    lambda field: '-' + field,
+    lambda field: field[:2] + '  ' + field[2:],  # e.g. latitude degrees and minutes apart
+    lambda field: field + 'e0' if '.' in field else field,
+    lambda field: field[0] + '_' + field[1:] if field[:2].isdigit() else field,
+)
+
+
+def quirks(data, every=3, seed=3):
+    """Respell numbers in every n-th sentence the way int() and float() still accept them (spaces, signs,
+    exponents, digit separators) or not, with a valid checksum that is sometimes written in lower case"""
+    rng = random.Random(seed)
+    lines = data.split(b'\r\n')
+    for index in range(0, len(lines), every):
+        line = lines[index].decode()
+        if not line.startswith('$') or '*' not in line:
+            continue
+        fields = line[1:line.index('*')].split(',')
+        for pos in range(1, len(fields)):
+            try:
+                float(fields[pos])
+            except ValueError:
+                continue
+            if rng.random() < 0.4:
+                fields[pos] = rng.choice(QUIRKS)(fields[pos])
+        payload = ','.join(fields)
+        crc = f"{checksum(payload):02x}" if rng.random() < 0.5 else f"{checksum(payload):02X}"
+        lines[index] = f"${payload}*{crc}".encode()
+    return b'\r\n'.join(lines)
+
+
+if __name__ == "__main__":
+    import sys
+    sys.stdout.write(stream().decode())
@@ -0,0 +1,101 @@
+"""
+Convert SailScreen track logs (TRKnnnnn.BIN from the SD card) to CSV or GPX.
+
+Padding and damaged records (e.g. the tail of a file written when power was
+lost) are skipped. Raw NMEA capture files (NMEAnnnnn.BIN) are written back out
+as plain NMEA text with the block padding removed.
+
+Usage:
+    python tools/track_decode.py TRK00001.BIN [TRK00002.BIN ...] [--format csv|gpx] [-o track.csv]
+    python tools/track_decode.py --nmea NMEA00001.BIN [...] [-o capture.nmea]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+import tracklog  # NOQA
+
+# Seconds from 1970-01-01 to 2000-01-01
+EPOCH_2000 = 946684800
+
+CSV_FIELDS = ('time', 'latitude', 'longitude', 'sog', 'cog', 'hdop', 'fix_stat', 'satellites', 'valid', 'sequence')
+
+
+def read_records(paths):
+    """Decoded records of all files in order, and the number of damaged records skipped."""
+    records = []
+    damaged = 0
+    for path in paths:
+        with open(path, 'rb') as f:
+            data = f.read()
+        for offset in range(0, len(data) - tracklog.RECORD_SIZE + 1, tracklog.RECORD_SIZE):
+            record = tracklog.decode_record(data, offset)
+            if record is not None:
+                records.append(record)
+            elif any(data[offset:offset + tracklog.RECORD_SIZE]):
+                damaged += 1
+    return records, damaged
+
+
+def iso_time(seconds):
+    whole = int(seconds)
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(EPOCH_2000 + whole)) + \
+        '.{:02d}Z'.format(int(round((seconds - whole) * 100)) % 100)
+
+
+def write_csv(records, out):
+    out.write(','.join(CSV_FIELDS) + '\n')
+    for r in records:
+        values = dict(r, time=iso_time(r['time']) if r['time'] else '')
+        out.write(','.join(str(values[name]) for name in CSV_FIELDS) + '\n')
+
+
+def write_gpx(records, out):
+    out.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<gpx version="1.1" creator="SailScreen" xmlns="http://www.topografix.com/GPX/1/1">\n'
+              '<trk><name>SailScreen track</name><trkseg>\n')
+    for r in records:
+        if not r['valid']:
+            continue
+        out.write('<trkpt lat="{:.7f}" lon="{:.7f}">'.format(r['latitude'], r['longitude']))
+        if r['time']:
+            out.write('<time>{}</time>'.format(iso_time(r['time'])))
+        out.write('<sat>{}</sat><hdop>{:.2f}</hdop>'.format(r['satellites'], r['hdop']))
+        # SOG/COG have no GPX 1.1 element, keep them as extensions
+        out.write('<extensions><sog>{:.2f}</sog><cog>{:.2f}</cog></extensions>'.format(r['sog'], r['cog']))
+        out.write('</trkpt>\n')
+    out.write('</trkseg></trk>\n</gpx>\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--format', choices=('csv', 'gpx'), default='csv')
+    parser.add_argument('--nmea', action='store_true', help='files are raw NMEA captures')
+    parser.add_argument('-o', '--output', help='output file (default stdout)')
+    args = parser.parse_args()
+
+    if args.nmea:
+        data = b''.join(open(path, 'rb').read().replace(b'\x00', b'') for path in args.files)
+        if args.output:
+            with open(args.output, 'wb') as f:
+                f.write(data)
+        else:
+            sys.stdout.buffer.write(data)
+        return 0
+
+    records, damaged = read_records(args.files)
+    out = open(args.output, 'w') if args.output else sys.stdout
+    (write_gpx if args.format == 'gpx' else write_csv)(records, out)
+    if args.output:
+        out.close()
+    print(f"{len(records)} records, {damaged} damaged skipped", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
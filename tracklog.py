@@ -0,0 +1,325 @@
+"""
+Batched GPS track logging to microSD.
+
+Track points are fixed-size binary records packed into a preallocated RAM
+buffer. A low-priority scheduler task writes the buffer out in whole 512-byte
+blocks, so every write to the card is sector aligned and the hot path never
+touches the file system. Files are numbered (TRK00001.BIN, ...) and rotated
+by size. Raw NMEA can be captured the same way (NMEA00001.BIN, ...).
+
+Each stream keeps an index file with two slots that are written alternately,
+each with a sequence number and a check word. After a crash or power loss
+the newest intact slot tells which file to continue and how many bytes of it
+were completely written. If the file holds more than that (written after the
+last index update), it is left as it is and logging continues in a new file.
+
+tools/track_decode.py converts track files to CSV or GPX on a computer.
+"""
+
+import os
+import struct
+import time
+
+from telemetry import signed_degrees
+
+BLOCK_SIZE = 512
+
+# Track record (little endian, 32 bytes, 16 per block):
+#   magic u8, flags u8, sequence u16, time u32 (seconds since 2000-01-01 UTC),
+#   latitude i32, longitude i32 (degrees * 1e7),
+#   SOG u16 (knots * 100), COG u16 (degrees * 100), HDOP u16 (* 100),
+#   fix status u8, satellites u8, centiseconds u8, checksum u8 (sum of the bytes before it), padding
+RECORD_MAGIC = 0x54
+RECORD_FORMAT = "<BBHIiiHHHBBB"
+RECORD_SIZE = 32
+_CHECKSUM_OFFSET = struct.calcsize(RECORD_FORMAT)
+
+FLAG_VALID = 0x01
+
+_INDEX_FORMAT = "<IIII"  # sequence, file number, committed bytes, check
+_INDEX_SLOT = 16
+_INDEX_CHECK = 0x5A17C0DE
+
+
+def days_from_civil(year, month, day):
+    """Days since 1970-01-01 for a proleptic Gregorian date."""
+    year -= month <= 2
+    era = year // 400
+    yoe = year - era * 400
+    doy = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+    return era * 146097 + doe - 719468
+
+
+_DAYS_2000 = days_from_civil(2000, 1, 1)
+
+
+def gps_seconds(date, timestamp):
+    """Seconds since 2000-01-01 UTC from MicropyGPS date (day, month, yy) and timestamp [h, m, s]."""
+    day, month, year = date
+    if not day:
+        return 0
+    days = days_from_civil(2000 + year, month, day) - _DAYS_2000
+    return days * 86400 + timestamp[0] * 3600 + timestamp[1] * 60 + int(timestamp[2])
+
+
+def decode_record(data, offset=0):
+    """Unpack a track record into a dict, None for padding or a damaged record."""
+    if data[offset] != RECORD_MAGIC:
+        return None
+    if sum(data[offset:offset + _CHECKSUM_OFFSET]) & 0xFF != data[offset + _CHECKSUM_OFFSET]:
+        return None
+    (_, flags, sequence, seconds, latitude, longitude, sog, cog, hdop, fix_stat, satellites,
+     centis) = struct.unpack_from(RECORD_FORMAT, data, offset)
+    return {
+        "sequence": sequence,
+        "time": seconds + centis / 100,
+        "latitude": latitude / 10000000,
+        "longitude": longitude / 10000000,
+        "sog": sog / 100,
+        "cog": cog / 100,
+        "hdop": hdop / 100,
+        "fix_stat": fix_stat,
+        "satellites": satellites,
+        "valid": bool(flags & FLAG_VALID),
+    }
+
+
+class BlockWriter:
+    """Preallocated RAM buffer that goes to numbered files in whole blocks, with a crash-safe index."""
+
+    def __init__(self, directory, prefix, buffer_blocks=8, file_max_bytes=1048576):
+        self.directory = directory
+        self.prefix = prefix
+        self.file_max_bytes = file_max_bytes
+        self.buf = bytearray(BLOCK_SIZE * buffer_blocks)
+        self.mv = memoryview(self.buf)
+        self.pos = 0
+        self._file = None
+
+        # Counters
+        self.blocks_written = 0
+        self.dropped_bytes = 0
+        self.write_errors = 0
+
+        self.index_path = "{}/{}.IDX".format(directory, prefix)
+        self.seq, self.file_no, self.length = self._read_index()
+        # The index is only written after the data, but don't trust more than is on the card
+        size = self._file_size(self.path())
+        if size < self.length:
+            self.length = size - size % BLOCK_SIZE
+        elif size > self.length:
+            self._next_file()
+
+    def path(self, file_no=None):
+        return "{}/{}{:05d}.BIN".format(self.directory, self.prefix, self.file_no if file_no is None else file_no)
+
+    def _next_file(self):
+        # Never append to a file left over from an earlier session
+        self.file_no += 1
+        while self._file_size(self.path()):
+            self.file_no += 1
+        self.length = 0
+
+    @staticmethod
+    def _file_size(path):
+        try:
+            return os.stat(path)[6]
+        except OSError:
+            return 0
+
+    def _read_index(self):
+        best = (0, 1, 0)
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read(2 * _INDEX_SLOT)
+        except OSError:
+            return best
+        for offset in (0, _INDEX_SLOT):
+            if len(data) < offset + _INDEX_SLOT:
+                break
+            seq, file_no, length, check = struct.unpack_from(_INDEX_FORMAT, data, offset)
+            if check == seq ^ file_no ^ length ^ _INDEX_CHECK and seq >= best[0] and file_no:
+                best = (seq, file_no, length)
+        return best
+
+    def _write_index(self):
+        self.seq += 1
+        slot = bytearray(_INDEX_SLOT)
+        struct.pack_into(_INDEX_FORMAT, slot, 0, self.seq, self.file_no, self.length,
+                         self.seq ^ self.file_no ^ self.length ^ _INDEX_CHECK)
+        # Alternate slots, a torn write can only damage the slot that is not the newest
+        try:
+            f = open(self.index_path, "r+b")
+        except OSError:
+            f = open(self.index_path, "wb")
+            f.write(bytes(2 * _INDEX_SLOT))
+        with f:
+            f.seek((self.seq & 1) * _INDEX_SLOT)
+            f.write(slot)
+
+    def reserve(self, size):
+        """Offset of size free bytes in the buffer, or -1 (and counted as dropped) when it is full."""
+        if self.pos + size > len(self.buf):
+            self.dropped_bytes += size
+            return -1
+        offset = self.pos
+        self.pos += size
+        return offset
+
+    def append(self, data):
+        size = len(data)
+        offset = self.reserve(size)
+        if offset < 0:
+            return False
+        self.buf[offset:offset + size] = data
+        return True
+
+    def full_blocks(self):
+        return self.pos // BLOCK_SIZE
+
+    def flush(self, pad=False):
+        """Write all complete blocks (and with pad=True the last partial one, zero padded).
+        Returns the number of blocks written."""
+        if pad and self.pos % BLOCK_SIZE:
+            end = self.pos + BLOCK_SIZE - self.pos % BLOCK_SIZE
+            self.buf[self.pos:end] = bytes(end - self.pos)
+            self.pos = end
+        size = self.full_blocks() * BLOCK_SIZE
+        if not size:
+            return 0
+
+        try:
+            if self._file is None:
+                path = self.path()
+                try:
+                    self._file = open(path, "r+b")
+                except OSError:
+                    self._file = open(path, "wb")
+                self._file.seek(self.length)
+            self._file.write(self.mv[:size])
+            self._file.flush()
+        except OSError as e:
+            # Keep the data, the next flush retries
+            self.write_errors += 1
+            print("Track log write error:", e)
+            self.close_file()
+            return 0
+
+        self.length += size
+        self._write_index()
+        rest = self.pos - size
+        if rest:
+            self.buf[:rest] = self.mv[size:self.pos]
+        self.pos = rest
+        self.blocks_written += size // BLOCK_SIZE
+
+        if self.length >= self.file_max_bytes:
+            self.close_file()
+            self._next_file()
+            self._write_index()
+        return size // BLOCK_SIZE
+
+    def close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+
+
+class TrackLogger:
+    """Records a track point per GPS epoch (new UTC timestamp, at most one per interval_ms) and,
+    optionally, the raw NMEA stream. task() is the scheduler step that does the writing."""
+
+    def __init__(self, directory, interval_ms=1000, buffer_blocks=8, flush_blocks=4,
+                 flush_age_ms=60000, file_max_bytes=1048576, raw_nmea=False):
+        try:
+            os.mkdir(directory)
+        except OSError:
+            pass  # already there
+        self.interval_ms = interval_ms
+        self.flush_blocks = flush_blocks
+        self.flush_age_ms = flush_age_ms
+        self.track = BlockWriter(directory, "TRK", buffer_blocks, file_max_bytes)
+        self.nmea = BlockWriter(directory, "NMEA", buffer_blocks, file_max_bytes) if raw_nmea else None
+
+        self.sequence = 0
+        self.records = 0
+        self._timestamp = None
+        self._recorded = None
+        self._flushed = time.ticks_ms()
+
+    def capture(self, chunk):
+        """Buffer raw NMEA bytes (e.g. straight from uart.readinto())."""
+        if self.nmea is not None:
+            self.nmea.append(chunk)
+
+    def record(self, gps):
+        """Pack the current fix into the track buffer."""
+        offset = self.track.reserve(RECORD_SIZE)
+        if offset < 0:
+            return False
+        self.sequence = (self.sequence + 1) & 0xFFFF
+        buf = self.track.buf
+        struct.pack_into(
+            RECORD_FORMAT,
+            buf,
+            offset,
+            RECORD_MAGIC,
+            FLAG_VALID if gps.valid else 0,
+            self.sequence,
+            gps_seconds(gps.date, gps.timestamp),
+            int(round(signed_degrees(gps._latitude) * 10000000)),
+            int(round(signed_degrees(gps._longitude) * 10000000)),
+            min(int(gps.speed[0] * 100 + 0.5), 0xFFFF),
+            int(gps.course * 100 + 0.5) % 36000,
+            min(int(gps.hdop * 100 + 0.5), 0xFFFF),
+            gps.fix_stat & 0xFF,
+            gps.satellites_in_use & 0xFF,
+            int(gps.timestamp[2] * 100) % 100,
+        )
+        checksum = 0
+        for i in range(offset, offset + _CHECKSUM_OFFSET):
+            checksum += buf[i]
+        buf[offset + _CHECKSUM_OFFSET] = checksum & 0xFF
+        # Padding may hold an older record after a flush moved data down
+        for i in range(offset + _CHECKSUM_OFFSET + 1, offset + RECORD_SIZE):
+            buf[i] = 0
+        self.records += 1
+        return True
+
+    def task(self, gps):
+        """Scheduler step: record new fixes, write full blocks once enough piled up or they got old."""
+        now = time.ticks_ms()
+        # RMC, GGA and GLL of one epoch all carry the same timestamp, record each epoch once
+        if gps.valid and gps.timestamp != self._timestamp:
+            self._timestamp = gps.timestamp
+            if self._recorded is None or time.ticks_diff(now, self._recorded) >= self.interval_ms:
+                self._recorded = now
+                self.record(gps)
+
+        due = time.ticks_diff(now, self._flushed) >= self.flush_age_ms
+        for writer in (self.track, self.nmea):
+            if writer is not None and writer.full_blocks() and (due or writer.full_blocks() >= self.flush_blocks):
+                writer.flush()
+                self._flushed = now
+        if due:
+            self._flushed = now
+
+    def close(self):
+        """Write everything that is buffered (last block zero padded) and close the files."""
+        for writer in (self.track, self.nmea):
+            if writer is not None:
+                writer.flush(pad=True)
+                writer.close_file()
+
+    def stats(self):
+        return {
+            "records": self.records,
+            "track_blocks": self.track.blocks_written,
+            "track_file": self.track.path(),
+            "dropped_bytes": self.track.dropped_bytes + (self.nmea.dropped_bytes if self.nmea else 0),
+            "write_errors": self.track.write_errors + (self.nmea.write_errors if self.nmea else 0),
+        }